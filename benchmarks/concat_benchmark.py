@@ -0,0 +1,86 @@
+"""
+Concatenation benchmark
+=======================
+
+Compares the single-pass concatenation in DataManager.get_goblin_results_output_datatable against the previous
+approach of growing the result with pd.concat once per database, for 10, 100 and 1000 synthetic instance databases.
+
+Run from the repository root:
+
+    python benchmarks/concat_benchmark.py
+"""
+from goblin_fetcher.resource_manager.database_manager import DataManager
+import sqlalchemy as sqa
+import pandas as pd
+import numpy as np
+import tempfile
+import time
+import os
+import re
+
+TABLE = "climate_change_totals"
+ROWS_PER_INSTANCE = 101
+
+
+def create_instance_databases(directory, count):
+    """
+    Writes ``count`` synthetic instance databases containing a climate_change_totals style table.
+    """
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"instance_{i}.db")
+        data = pd.DataFrame(
+            rng.random((ROWS_PER_INSTANCE, 4)) * 1000,
+            columns=["CH4", "N2O", "CO2", "CO2e"],
+        )
+        data.index = pd.RangeIndex(-1, ROWS_PER_INSTANCE - 1, name="index")
+        engine = sqa.create_engine(f"sqlite:///{path}")
+        data.to_sql(TABLE, engine)
+        engine.dispose()
+        paths.append(path)
+
+    return paths
+
+
+def quadratic_concat(data_manager, table, index_col=None):
+    """
+    The previous implementation, which concatenated onto the result once per database.
+    """
+    concatenated_data = pd.DataFrame()
+    for path in data_manager.database_paths:
+        engine = data_manager.get_engine(path)
+        if engine is not None:
+            dataframe = pd.read_sql("SELECT * FROM '%s'" % table, engine, index_col)
+            dataframe = data_manager.prepare_scenarios_column(dataframe)
+            dataframe["db_instance"] = re.sub(r'\..*$', '', os.path.basename(path))
+            concatenated_data = pd.concat([concatenated_data, dataframe], ignore_index=True)
+
+    return concatenated_data
+
+
+def time_call(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'instances':>10} {'quadratic (s)':>15} {'single pass (s)':>17} {'speedup':>9}")
+    for count in (10, 100, 1000):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = create_instance_databases(directory, count)
+
+            with DataManager(paths, cache_bytes=None) as data_manager:
+                # Warm the engine pool so both approaches measure reads and concatenation only; the table cache is disabled
+                # so the single pass reads the databases again
+                data_manager.get_goblin_results_output_datatable(TABLE, index_col="index")
+
+                quadratic = time_call(quadratic_concat, data_manager, TABLE, index_col="index")
+                single_pass = time_call(data_manager.get_goblin_results_output_datatable, TABLE, index_col="index")
+
+        print(f"{count:>10} {quadratic:>15.3f} {single_pass:>17.3f} {quadratic / single_pass:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Read mode benchmark
+===================
+
+Compares the throughput of reading a table from synthetic instance databases opened read-write with SQLite's default
+pragmas against the read-only, immutable open mode with the tuned DEFAULT_PRAGMAS, for 10, 100 and 300 databases and the
+thread and process backends. The table cache is disabled so every pass reads the databases.
+
+Run from the repository root:
+
+    python benchmarks/read_mode_benchmark.py
+"""
+from goblin_fetcher.resource_manager.database_manager import DataManager
+import sqlalchemy as sqa
+import pandas as pd
+import numpy as np
+import tempfile
+import time
+import os
+
+TABLE = "land_use_time_series"
+ROWS_PER_INSTANCE = 5_000
+REPEATS = 3
+
+
+def create_instance_databases(directory, count):
+    """
+    Writes ``count`` synthetic instance databases containing a land use time series style table.
+    """
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"instance_{i}.db")
+        data = pd.DataFrame(rng.random((ROWS_PER_INSTANCE, 4)) * 1000, columns=["CH4", "N2O", "CO2", "CO2e"])
+        data["Scenarios"] = np.arange(ROWS_PER_INSTANCE) % 20
+        data["year"] = 2020 + np.arange(ROWS_PER_INSTANCE) % 31
+        engine = sqa.create_engine(f"sqlite:///{path}")
+        data.to_sql(TABLE, engine, index=False)
+        engine.dispose()
+        paths.append(path)
+
+    return paths
+
+
+def best_time(data_manager):
+    """
+    Returns the best of REPEATS reads of the table, after a first read that warms the engine pool.
+    """
+    data_manager.get_goblin_results_output_datatable(TABLE)
+
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        data_manager.get_goblin_results_output_datatable(TABLE)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+    print(f"{'instances':>10} {'backend':>8} {'read-write (s)':>15} {'read-only (s)':>14} {'rows/s':>12} {'speedup':>9}")
+    for count in (10, 100, 300):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = create_instance_databases(directory, count)
+
+            for backend in ("thread", "process"):
+                options = dict(max_workers=4, backend=backend, cache_bytes=None)
+
+                with DataManager(paths, read_only=False, pragmas=dict.fromkeys(("mmap_size", "cache_size", "temp_store")), **options) as data_manager:
+                    read_write = best_time(data_manager)
+
+                with DataManager(paths, **options) as data_manager:
+                    read_only = best_time(data_manager)
+
+                rows_per_second = count * ROWS_PER_INSTANCE / read_only
+                print(
+                    f"{count:>10} {backend:>8} {read_write:>15.3f} {read_only:>14.3f} {rows_per_second:>12,.0f} "
+                    f"{read_write / read_only:>8.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
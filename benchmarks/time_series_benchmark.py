@@ -0,0 +1,119 @@
+"""
+Time series benchmark
+=====================
+
+Times the TimeSeries builders on synthetic inputs of 1000 scenarios x 50 instances x 30 years.
+
+Run from the repository root:
+
+    python benchmarks/time_series_benchmark.py
+"""
+from goblin_fetcher.time_series import TimeSeries
+import pandas as pd
+import numpy as np
+import time
+
+SCENARIOS = 1000
+INSTANCES = 50
+BASELINE_YEAR = 2021
+TARGET_YEAR = 2050
+
+
+def synthetic_scenarios(scenarios):
+    return pd.DataFrame({"Scenarios": np.arange(scenarios)})
+
+
+def synthetic_landuse(scenarios, instances, rng):
+    """
+    Builds a climate_change_landuse style frame with the baseline (-1) at the baseline year and every scenario at the
+    target year.
+    """
+    land_uses = ["cropland", "grassland", "forest", "wetland", "total"]
+    scenario_index = np.arange(-1, scenarios)
+
+    frame = pd.DataFrame(
+        {
+            "land_use": np.tile(land_uses, instances * len(scenario_index)),
+            "Scenarios": np.tile(np.repeat(scenario_index, len(land_uses)), instances),
+            "db_instance": np.repeat([f"instance_{i}" for i in range(instances)], len(scenario_index) * len(land_uses)),
+        }
+    )
+    frame["year"] = np.where(frame["Scenarios"] == -1, BASELINE_YEAR, TARGET_YEAR)
+
+    for gas in ["CO2", "CH4", "N2O", "CO2e"]:
+        frame[gas] = rng.random(len(frame)) * 1000
+
+    return frame
+
+
+def synthetic_livestock(scenarios, instances, rng):
+    """
+    Builds a climate_change_livestock_aggregated style frame with one row per scenario, including the baseline (-1).
+    """
+    scenario_index = np.arange(-1, scenarios)
+    frame = pd.DataFrame(
+        {
+            "Scenarios": np.tile(scenario_index, instances),
+            "db_instance": np.repeat([f"instance_{i}" for i in range(instances)], len(scenario_index)),
+        }
+    )
+
+    for gas in ["CH4", "N2O", "CO2", "CO2e"]:
+        frame[gas] = rng.random(len(frame)) * 1000
+
+    return frame
+
+
+def synthetic_forest(scenarios, instances, rng):
+    """
+    Builds a forest_carbon_flux style frame with one row per scenario and year, including the baseline (-1).
+    """
+    scenario_index = np.arange(-1, scenarios)
+    years = np.arange(BASELINE_YEAR, TARGET_YEAR + 1)
+
+    frame = pd.DataFrame(
+        {
+            "Year": np.tile(years, instances * len(scenario_index)),
+            "Scenario": np.tile(np.repeat(scenario_index, len(years)), instances),
+            "db_instance": np.repeat([f"instance_{i}" for i in range(instances)], len(scenario_index) * len(years)),
+        }
+    )
+    frame["Total Ecosystem"] = (rng.random(len(frame)) - 0.5) * 1e6
+
+    return frame
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    scenario_df = synthetic_scenarios(SCENARIOS)
+    landuse_df = synthetic_landuse(SCENARIOS, INSTANCES, rng)
+    livestock_df = synthetic_livestock(SCENARIOS, INSTANCES, rng)
+    forest_df = synthetic_forest(SCENARIOS, INSTANCES, rng)
+
+    print(f"{SCENARIOS} scenarios x {INSTANCES} instances x {TARGET_YEAR - BASELINE_YEAR + 1} years")
+
+    builders = [
+        (TimeSeries.get_land_use_emissions_time_series, landuse_df),
+        (TimeSeries.get_livestock_emissions_time_series, livestock_df),
+        (TimeSeries.get_forest_carbon_time_series, forest_df),
+    ]
+
+    for builder, data in builders:
+        elapsed, result = time_call(builder, BASELINE_YEAR, TARGET_YEAR, scenario_df, data)
+        print(f"{builder.__name__:<45} {elapsed:>8.3f} s  {result.shape}")
+
+    elapsed, result = time_call(
+        TimeSeries.total_climate_change_emissions_time_series,
+        BASELINE_YEAR, TARGET_YEAR, scenario_df, livestock_df, landuse_df, forest_df,
+    )
+    print(f"{'total_climate_change_emissions_time_series':<45} {elapsed:>8.3f} s  {result.shape}")
+
+
+if __name__ == "__main__":
+    main()
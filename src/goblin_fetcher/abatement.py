@@ -5,6 +5,8 @@ Abatement Module
 This module contains the Abate class which is used to abate emissions from the livestock and land use sectors.
 """
 import pandas as pd
+import numpy as np
+import itertools
 
 class Abate:
     """
@@ -59,6 +61,120 @@ class Abate:
 
         return df
 
+    @staticmethod
+    def climate_abate_livestock_rates(df, rates, gwps=None):
+        """
+        Abates emissions from the livestock sector for many abatement rates and GWP variants at once.
+
+        Each rate and GWP combination gives the same values as climate_abate_livestock, but the abatement is broadcast
+        over all rates with NumPy and the input DataFrame is not modified.
+
+        Parameters:
+            df (DataFrame): A DataFrame containing emissions data.
+            rates (array-like): The rates at which emissions should be abated.
+            gwps (list of tuple): (CH4, N2O) GWP pairs to evaluate. Defaults to [(28, 265)].
+
+        Returns:
+            DataFrame: A long-form DataFrame of the abated emissions, indexed by rate, CH4 GWP, N2O GWP and the index of df.
+        """
+        rates = np.asarray(rates, dtype=float).ravel()
+        gwps = [(28, 265)] if gwps is None else [(28 if CH4 is None else CH4, 265 if N2O is None else N2O) for CH4, N2O in gwps]
+
+        # The baseline (-1) is left unabated
+        abated = (df.Scenarios != -1).to_numpy()
+
+        CH4 = df["CH4"].to_numpy(dtype=float)
+        N2O = df["N2O"].to_numpy(dtype=float)
+        CO2 = df["CO2"].to_numpy(dtype=float)
+
+        # [rate, row]
+        abated_CH4 = np.where(abated, CH4 - (CH4 * rates[:, None]), CH4)
+        abated_N2O = np.where(abated, N2O - (N2O * rates[:, None]), N2O)
+
+        # [rate, gwp, row]
+        abated_CO2e = np.stack(
+            [
+                np.where(abated, CO2 + (abated_CH4 * CH4_gwp) + (abated_N2O * N2O_gwp), df["CO2e"].to_numpy(dtype=float))
+                for CH4_gwp, N2O_gwp in gwps
+            ],
+            axis=1,
+        )
+
+        shape = (len(rates), len(gwps), len(df))
+        columns = {
+            "CH4": np.broadcast_to(abated_CH4[:, None, :], shape),
+            "N2O": np.broadcast_to(abated_N2O[:, None, :], shape),
+            "CO2e": abated_CO2e,
+        }
+
+        index = pd.MultiIndex.from_arrays(
+            [
+                np.repeat(rates, len(gwps) * len(df)),
+                np.tile(np.repeat([CH4_gwp for CH4_gwp, _ in gwps], len(df)), len(rates)),
+                np.tile(np.repeat([N2O_gwp for _, N2O_gwp in gwps], len(df)), len(rates)),
+                np.tile(df.index.to_numpy(), len(rates) * len(gwps)),
+            ],
+            names=["rate", "CH4_gwp", "N2O_gwp", df.index.name],
+        )
+
+        return Abate._long_form(df, columns, shape, index)
+
+    @staticmethod
+    def eutrophication_air_quality_abate_livestock_rates(df, rates):
+        """
+        Abates eutrophication or air quality emissions from the livestock sector for many abatement rates at once.
+
+        Each rate gives the same values as eutrophication_air_quality_abate_livestock, but the abatement is broadcast over
+        all rates with NumPy and the input DataFrame is not modified.
+
+        Parameters:
+            df (DataFrame): A DataFrame containing emissions data.
+            rates (array-like): The rates at which emissions should be abated.
+
+        Returns:
+            DataFrame: A long-form DataFrame of the abated emissions, indexed by rate and the index of df.
+        """
+        rates = np.asarray(rates, dtype=float).ravel()
+
+        # The baseline (-1) is left unabated
+        abated = (df.Scenarios != -1).to_numpy()
+
+        manure_management = df["manure_management"].to_numpy(dtype=float)
+        soils = df["soils"].to_numpy(dtype=float)
+
+        # [rate, row]
+        abated_manure_management = np.where(abated, manure_management - (manure_management * rates[:, None]), manure_management)
+        abated_soils = np.where(abated, soils - (soils * rates[:, None]), soils)
+        total = np.where(abated, abated_manure_management + abated_soils, df["Total"].to_numpy(dtype=float))
+
+        shape = (len(rates), len(df))
+        columns = {"manure_management": abated_manure_management, "soils": abated_soils, "Total": total}
+
+        index = pd.MultiIndex.from_arrays(
+            [np.repeat(rates, len(df)), np.tile(df.index.to_numpy(), len(rates))],
+            names=["rate", df.index.name],
+        )
+
+        return Abate._long_form(df, columns, shape, index)
+
+    @staticmethod
+    def _long_form(df, columns, shape, index):
+        """
+        Repeats df once per leading entry of shape, replacing the given columns with their abated values.
+        """
+        data = {}
+        for column in df.columns:
+            if column in columns:
+                data[column] = columns[column].reshape(-1)
+            elif isinstance(df[column].dtype, pd.CategoricalDtype):
+                # Repeat the codes, so categorical columns such as db_instance keep their dtype
+                codes = np.broadcast_to(df[column].cat.codes.to_numpy(), shape).reshape(-1)
+                data[column] = pd.Categorical.from_codes(codes, dtype=df[column].dtype)
+            else:
+                data[column] = np.broadcast_to(df[column].to_numpy(), shape).reshape(-1)
+
+        return pd.DataFrame(data, index=index)
+
     @staticmethod
     def climate_total_abated(baseline_year, target_year, scenario_df, livestock_df, landcover_df, rate, CH4=None, N2O=None):
         """
@@ -73,64 +189,47 @@ class Abate:
             rate (float): The rate at which emissions should be abated.
             CH4 (float): The GWP for CH4.
             N2O (float): The GWP for N2O.
+
+        Raises:
+            pandas.errors.MergeError: If an instance and scenario has more than one livestock row, or more than one
+                land use total for its year.
         """
         baseline_index = -1
         climate_change_livestock = Abate.climate_abate_livestock(livestock_df, rate, CH4, N2O)
 
-        total_climate_change_emissions_dataframe = climate_change_livestock.copy(deep=True)
-        land_use_dataframe = landcover_df.copy(deep=True)
+        total_climate_change_emissions_dataframe = climate_change_livestock
+        land_use_dataframe = landcover_df
 
         scenario_list = [baseline_index]
         scenario_list.extend(list(scenario_df["Scenarios"].unique()))
 
         gases = ["CH4", "N2O", "CO2", "CO2e"]
-
-        # Initialize a list to collect DataFrame rows
-        results = []
-
-        for instance in total_climate_change_emissions_dataframe.db_instance.unique():
-            for sc in scenario_list: 
-                
-                emissions_mask = (
-                    (total_climate_change_emissions_dataframe.Scenarios == sc) 
-                    & (total_climate_change_emissions_dataframe.db_instance == instance)
-                )
-
-                if sc >= 0:
-                    land_mask = (
-                        (land_use_dataframe.Scenarios == sc)
-                        & (land_use_dataframe.db_instance == instance)
-                        & (land_use_dataframe["land_use"] == "total")
-                        & (land_use_dataframe["year"] == target_year)
-                    )
-                else:
-                    land_mask = (
-                        (land_use_dataframe.Scenarios == sc)
-                        & (land_use_dataframe.db_instance == instance)
-                        & (land_use_dataframe["land_use"] == "total")
-                        & (land_use_dataframe["year"] == baseline_year)
-                    )
-
-                if not emissions_mask.any() or not land_mask.any():
-                    print("Warning: No data matched for masks.")
-                    continue
-
-                    # Collect rows to append later
-                result_row = total_climate_change_emissions_dataframe.loc[emissions_mask].copy()
-
-                for gas in gases:
-
-                    emission_value = total_climate_change_emissions_dataframe.loc[
-                        emissions_mask, gas
-                    ].item() + land_use_dataframe.loc[land_mask, gas].item()
-
-
-                    result_row[gas] = emission_value
-
-                results.append(result_row)
-
-        # Concatenate all collected rows into a single DataFrame
-        result_df = pd.concat(results, ignore_index=True)
-        return result_df
-
-
+        keys = ["db_instance", "Scenarios"]
+
+        # Land use totals at the target year for scenarios and at the baseline year for the baseline
+        land_totals = land_use_dataframe[
+            (land_use_dataframe["land_use"] == "total")
+            & (land_use_dataframe["year"] == np.where(land_use_dataframe.Scenarios >= 0, target_year, baseline_year))
+        ]
+
+        requested = pd.DataFrame(
+            list(itertools.product(total_climate_change_emissions_dataframe.db_instance.unique(), scenario_list)),
+            columns=keys,
+        )
+
+        # Inner merges keep the order of the requested keys: instances first, then the baseline followed by each scenario
+        # Each instance and scenario has one livestock row and one land use total, so duplicates fail the merge
+        result_df = requested.merge(total_climate_change_emissions_dataframe, on=keys, how="inner", validate="one_to_one")
+        result_df = result_df.merge(
+            land_totals[keys + gases], on=keys, how="inner", suffixes=("", "_land"), validate="one_to_one"
+        )
+
+        # Report unmatched combinations once rather than for every instance and scenario
+        unmatched = len(requested) - len(result_df[keys].drop_duplicates())
+        if unmatched:
+            print(f"Warning: No data matched for {unmatched} of {len(requested)} instance and scenario combinations.")
+
+        for gas in gases:
+            result_df[gas] = result_df[gas] + result_df[f"{gas}_land"]
+
+        return result_df[total_climate_change_emissions_dataframe.columns]
@@ -0,0 +1,416 @@
+"""
+Async Data Fetcher Module
+=========================
+This module contains the AsyncDataFetcher class, which exposes the DataFetcher table getters, time series and dump
+methods as coroutines for use inside asyncio services.
+
+The blocking SQLite reads run on a bounded thread pool owned by the AsyncDataFetcher, so the event loop stays free while
+tables are read and at most max_concurrency reads run at once. Cancelling a coroutine drops its read if it has not
+started yet; a read that is already running finishes in its thread and its result is discarded.
+"""
+from goblin_fetcher.goblin_fetcher import DataFetcher
+from goblin_fetcher.resource_manager.database_manager import DEFAULT_CHUNKSIZE
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+
+
+class AsyncDataFetcher:
+    """
+    A class that mirrors the DataFetcher getters as coroutines.
+
+    Every get_* method, the time series methods and dump_tables of DataFetcher are available with the same arguments and
+    return values, but must be awaited. The iter_* methods are async generators yielding the same chunks.
+
+    Every method runs as a single call on the thread pool, and iter_* methods read one chunk at a time, so the number of
+    reads run at once is bounded by max_concurrency alone.
+
+    Attributes
+    ----------
+    fetcher : DataFetcher
+        The DataFetcher that performs the reads.
+
+    max_concurrency : int
+        The maximum number of reads run at once across all requests.
+
+    Examples
+    --------
+        >>> async with AsyncDataFetcher(paths, max_concurrency=4) as fetcher:
+        ...     inputs, flux = await asyncio.gather(fetcher.get_scenario_inputs(), fetcher.get_forest_flux(years=[2050]))
+    """
+    def __init__(self, DATABASE_PATH, max_concurrency=4, **options):
+        """
+        Initializes the AsyncDataFetcher.
+
+        Parameters
+        ----------
+        DATABASE_PATH : str or list of str
+            The path to the external database, a list of paths to the instance databases, or the path to a warehouse.
+
+        max_concurrency : int, optional
+            The number of threads used for reads, which bounds the number of reads run at once. Defaults to 4.
+
+        **options
+            Further keyword arguments passed to DataFetcher, such as cache_bytes, attach or read_only.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}.")
+
+        self.fetcher = DataFetcher(DATABASE_PATH, **options)
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="goblin_fetcher")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Waits for running reads to finish, then shuts down the thread pool and closes the pooled database connections.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, partial(self._executor.shutdown, cancel_futures=True))
+        self.fetcher.close()
+
+    async def _run(self, func, *args, **kwargs):
+        """
+        Runs a blocking call on the thread pool and awaits its result.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def get_tables(self, tables):
+        """
+        Awaits DataFetcher.get_tables on the thread pool, with the same arguments, so each database is opened once.
+        """
+        return await self._run(self.fetcher.get_tables, tables)
+
+    async def _iterate(self, method, *args, **kwargs):
+        chunks = await self._run(method, *args, **kwargs)
+        done = object()
+
+        try:
+            while True:
+                chunk = await self._run(next, chunks, done)
+                if chunk is done:
+                    break
+                yield chunk
+        finally:
+            await self._run(chunks.close)
+
+    async def clear_cache(self):
+        """
+        Awaits DataFetcher.clear_cache on the thread pool.
+        """
+        return await self._run(self.fetcher.clear_cache)
+
+    async def add_databases(self, paths):
+        """
+        Awaits DataFetcher.add_databases on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.add_databases, paths)
+
+    async def remove_databases(self, paths):
+        """
+        Awaits DataFetcher.remove_databases on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.remove_databases, paths)
+
+    async def get_scenario_inputs(self, **filters):
+        """
+        Awaits DataFetcher.get_scenario_inputs on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_scenario_inputs, **filters)
+
+    async def get_stocking_rate_per_ha(self, **filters):
+        """
+        Awaits DataFetcher.get_stocking_rate_per_ha on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_stocking_rate_per_ha, **filters)
+
+    async def get_grassland_spared_area_by_soil_group(self, **filters):
+        """
+        Awaits DataFetcher.get_grassland_spared_area_by_soil_group on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_grassland_spared_area_by_soil_group, **filters)
+
+    async def get_crop_farm_input_applied(self, **filters):
+        """
+        Awaits DataFetcher.get_crop_farm_input_applied on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_crop_farm_input_applied, **filters)
+
+    async def get_crop_national_inputs(self, **filters):
+        """
+        Awaits DataFetcher.get_crop_national_inputs on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_crop_national_inputs, **filters)
+
+    async def get_transition_matrix(self, **filters):
+        """
+        Awaits DataFetcher.get_transition_matrix on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_transition_matrix, **filters)
+
+    async def get_baseline_livestock_data(self, **filters):
+        """
+        Awaits DataFetcher.get_baseline_livestock_data on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_baseline_livestock_data, **filters)
+
+    async def get_scenario_livestock_data(self, **filters):
+        """
+        Awaits DataFetcher.get_scenario_livestock_data on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_scenario_livestock_data, **filters)
+
+    async def get_livestock_output_summary(self, **filters):
+        """
+        Awaits DataFetcher.get_livestock_output_summary on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_livestock_output_summary, **filters)
+
+    async def get_grassland_scenario_farm_inputs(self, **filters):
+        """
+        Awaits DataFetcher.get_grassland_scenario_farm_inputs on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_grassland_scenario_farm_inputs, **filters)
+
+    async def get_grassland_baseline_farm_inputs(self, **filters):
+        """
+        Awaits DataFetcher.get_grassland_baseline_farm_inputs on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_grassland_baseline_farm_inputs, **filters)
+
+    async def get_total_grassland_area(self, **filters):
+        """
+        Awaits DataFetcher.get_total_grassland_area on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_total_grassland_area, **filters)
+
+    async def get_total_spared_area(self, **filters):
+        """
+        Awaits DataFetcher.get_total_spared_area on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_total_spared_area, **filters)
+
+    async def get_climate_change_animal_emissions_by_category(self, **filters):
+        """
+        Awaits DataFetcher.get_climate_change_animal_emissions_by_category on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_change_animal_emissions_by_category, **filters)
+
+    async def get_climate_change_crop_emissions_by_category(self, **filters):
+        """
+        Awaits DataFetcher.get_climate_change_crop_emissions_by_category on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_change_crop_emissions_by_category, **filters)
+
+    async def get_climate_change_crop_emissions_aggregated(self, **filters):
+        """
+        Awaits DataFetcher.get_climate_change_crop_emissions_aggregated on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_change_crop_emissions_aggregated, **filters)
+
+    async def get_climate_change_animal_emissions_aggregated(self, **filters):
+        """
+        Awaits DataFetcher.get_climate_change_animal_emissions_aggregated on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_change_animal_emissions_aggregated, **filters)
+
+    async def get_abated_climate_change_animal_emissions_aggregated(self, rate, CH4=None, N2O=None):
+        """
+        Awaits DataFetcher.get_abated_climate_change_animal_emissions_aggregated on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_abated_climate_change_animal_emissions_aggregated, rate, CH4, N2O)
+
+    async def get_abated_climate_change_animal_emissions_sweep(self, rates, gwps=None):
+        """
+        Awaits DataFetcher.get_abated_climate_change_animal_emissions_sweep on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_abated_climate_change_animal_emissions_sweep, rates, gwps)
+
+    async def get_animal_emissions_by_category_co2e(self, **filters):
+        """
+        Awaits DataFetcher.get_animal_emissions_by_category_co2e on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_animal_emissions_by_category_co2e, **filters)
+
+    async def get_crop_emissions_by_category_co2e(self, **filters):
+        """
+        Awaits DataFetcher.get_crop_emissions_by_category_co2e on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_crop_emissions_by_category_co2e, **filters)
+
+    async def get_climate_change_emission_totals(self, **filters):
+        """
+        Awaits DataFetcher.get_climate_change_emission_totals on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_change_emission_totals, **filters)
+
+    async def get_abated_climate_change_emissions_totals(self, baseline_year, target_year, rate, CH4=None, N2O=None):
+        """
+        Awaits DataFetcher.get_abated_climate_change_emissions_totals on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_abated_climate_change_emissions_totals, baseline_year, target_year, rate, CH4, N2O)
+
+    async def get_eutrophication_emission_totals(self, **filters):
+        """
+        Awaits DataFetcher.get_eutrophication_emission_totals on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_eutrophication_emission_totals, **filters)
+
+    async def get_abated_eutrophication_emission_totals(self, rate):
+        """
+        Awaits DataFetcher.get_abated_eutrophication_emission_totals on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_abated_eutrophication_emission_totals, rate)
+
+    async def get_abated_eutrophication_emission_totals_sweep(self, rates):
+        """
+        Awaits DataFetcher.get_abated_eutrophication_emission_totals_sweep on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_abated_eutrophication_emission_totals_sweep, rates)
+
+    async def get_air_quality_emission_totals(self, **filters):
+        """
+        Awaits DataFetcher.get_air_quality_emission_totals on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_air_quality_emission_totals, **filters)
+
+    async def get_eutrophication_animal_emissions_by_category(self, **filters):
+        """
+        Awaits DataFetcher.get_eutrophication_animal_emissions_by_category on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_eutrophication_animal_emissions_by_category, **filters)
+
+    async def get_eutrophication_crop_emissions_by_category(self, **filters):
+        """
+        Awaits DataFetcher.get_eutrophication_crop_emissions_by_category on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_eutrophication_crop_emissions_by_category, **filters)
+
+    async def get_air_quality_animal_emissions_by_category(self, **filters):
+        """
+        Awaits DataFetcher.get_air_quality_animal_emissions_by_category on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_air_quality_animal_emissions_by_category, **filters)
+
+    async def get_air_quality_crop_emissions_by_category(self, **filters):
+        """
+        Awaits DataFetcher.get_air_quality_crop_emissions_by_category on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_air_quality_crop_emissions_by_category, **filters)
+
+    async def get_landuse_emissions_totals(self, **filters):
+        """
+        Awaits DataFetcher.get_landuse_emissions_totals on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_landuse_emissions_totals, **filters)
+
+    async def get_forest_flux(self, **filters):
+        """
+        Awaits DataFetcher.get_forest_flux on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_forest_flux, **filters)
+
+    async def get_forest_aggregate(self, **filters):
+        """
+        Awaits DataFetcher.get_forest_aggregate on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_forest_aggregate, **filters)
+
+    async def get_total_afforested(self, **filters):
+        """
+        Awaits DataFetcher.get_total_afforested on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_total_afforested, **filters)
+
+    async def get_landuse_areas(self, **filters):
+        """
+        Awaits DataFetcher.get_landuse_areas on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_landuse_areas, **filters)
+
+    async def dump_tables(
+        self,
+        data_path,
+        format="csv",
+        tables=None,
+        max_workers=None,
+        stream=False,
+        chunksize=DEFAULT_CHUNKSIZE,
+        single_pass=True,
+    ):
+        """
+        Awaits DataFetcher.dump_tables on the thread pool, with the same arguments.
+        """
+        return await self._run(
+            self.fetcher.dump_tables, data_path, format, tables, max_workers, stream, chunksize, single_pass
+        )
+
+    async def get_climate_landuse_totals_time_series(self, baseline_year, target_year, n_jobs=None):
+        """
+        Awaits DataFetcher.get_climate_landuse_totals_time_series on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_landuse_totals_time_series, baseline_year, target_year, n_jobs)
+
+    async def get_climate_livestock_totals_time_series(self, baseline_year, target_year, n_jobs=None):
+        """
+        Awaits DataFetcher.get_climate_livestock_totals_time_series on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_livestock_totals_time_series, baseline_year, target_year, n_jobs)
+
+    async def get_climate_forest_totals_time_series(self, baseline_year, target_year, n_jobs=None):
+        """
+        Awaits DataFetcher.get_climate_forest_totals_time_series on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_forest_totals_time_series, baseline_year, target_year, n_jobs)
+
+    async def get_climate_totals_time_series(self, baseline_year, target_year, n_jobs=None):
+        """
+        Awaits DataFetcher.get_climate_totals_time_series on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_climate_totals_time_series, baseline_year, target_year, n_jobs)
+
+    async def get_abated_climate_totals_time_series(self, baseline_year, target_year, rate, CH4=None, N2O=None, n_jobs=None):
+        """
+        Awaits DataFetcher.get_abated_climate_totals_time_series on the thread pool, with the same arguments.
+        """
+        return await self._run(self.fetcher.get_abated_climate_totals_time_series, baseline_year, target_year, rate, CH4, N2O, n_jobs)
+
+    def iter_climate_change_animal_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Yields the chunks of DataFetcher.iter_climate_change_animal_emissions_by_category as an async generator.
+        """
+        return self._iterate(self.fetcher.iter_climate_change_animal_emissions_by_category, chunksize, **filters)
+
+    def iter_climate_change_crop_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Yields the chunks of DataFetcher.iter_climate_change_crop_emissions_by_category as an async generator.
+        """
+        return self._iterate(self.fetcher.iter_climate_change_crop_emissions_by_category, chunksize, **filters)
+
+    def iter_eutrophication_animal_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Yields the chunks of DataFetcher.iter_eutrophication_animal_emissions_by_category as an async generator.
+        """
+        return self._iterate(self.fetcher.iter_eutrophication_animal_emissions_by_category, chunksize, **filters)
+
+    def iter_eutrophication_crop_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Yields the chunks of DataFetcher.iter_eutrophication_crop_emissions_by_category as an async generator.
+        """
+        return self._iterate(self.fetcher.iter_eutrophication_crop_emissions_by_category, chunksize, **filters)
+
+    def iter_air_quality_animal_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Yields the chunks of DataFetcher.iter_air_quality_animal_emissions_by_category as an async generator.
+        """
+        return self._iterate(self.fetcher.iter_air_quality_animal_emissions_by_category, chunksize, **filters)
+
+    def iter_air_quality_crop_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Yields the chunks of DataFetcher.iter_air_quality_crop_emissions_by_category as an async generator.
+        """
+        return self._iterate(self.fetcher.iter_air_quality_crop_emissions_by_category, chunksize, **filters)
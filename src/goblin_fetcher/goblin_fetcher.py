@@ -40,11 +40,13 @@ Methods
     - get_climate_change_crop_emissions_aggregated(): Fetches aggregated climate change emissions data for crops.
     - get_climate_change_animal_emissions_aggregated(): Retrieves aggregated climate change emissions data for livestock.
     - get_abated_climate_change_animal_emissions_aggregated(): Fetches aggregated climate change emissions data for livestock after applying abatement rates.
+    - get_abated_climate_change_animal_emissions_sweep(): Fetches aggregated livestock emissions for a sweep of abatement rates.
     - get_animal_emissions_by_category_co2e(): Fetches livestock emissions data by category in CO2e.
     - get_crop_emissions_by_category_co2e(): Retrieves crop emissions data by category in CO2e.
     - get_climate_change_emission_totals(): Fetches total climate change emissions data.
     - get_eutrophication_emission_totals(): Retrieves total eutrophication emissions data.
     - get_abated_eutrophication_emission_totals(): Fetches total eutrophication emissions data after applying abatement rates.
+    - get_abated_eutrophication_emission_totals_sweep(): Fetches total eutrophication emissions for a sweep of abatement rates.
     - get_air_quality_emission_totals(): Fetches total air quality emissions data.
     - get_eutrophication_animal_emissions_by_category(): Retrieves eutrophication emissions data for livestock by category.
     - get_eutrophication_crop_emissions_by_category(): Fetches eutrophication emissions data for crops by category.
@@ -55,7 +57,15 @@ Methods
     - get_forest_aggregate(): Retrieves aggregated forest carbon data.
     - get_total_afforested(): Retrieves data on total afforested area for each scenario.
     - get_landuse_areas(): Retrieves data on land use areas for each scenario and the baseline.
-    - dump_tables(): Dumps all the output tables to a specified directory.
+    - iter_climate_change_animal_emissions_by_category(): Yields climate change emissions data for livestock categories in chunks.
+    - iter_climate_change_crop_emissions_by_category(): Yields climate change emissions data for crop categories in chunks.
+    - iter_eutrophication_animal_emissions_by_category(): Yields eutrophication emissions data for livestock categories in chunks.
+    - iter_eutrophication_crop_emissions_by_category(): Yields eutrophication emissions data for crop categories in chunks.
+    - iter_air_quality_animal_emissions_by_category(): Yields air quality emissions data for livestock categories in chunks.
+    - iter_air_quality_crop_emissions_by_category(): Yields air quality emissions data for crop categories in chunks.
+    - get_tables(): Retrieves several output tables at once, opening each database once.
+    - lazy(): Returns a view whose getters return deferred query plans, executed with collect().
+    - dump_tables(): Dumps the output tables to a specified directory as CSV, gzipped CSV, Parquet or Feather files.
     - get_climate_landuse_totals_time_series(): Retrieves climate land use totals time series data.
     - get_climate_livestock_totals_time_series(): Fetches climate livestock totals time series data.
     - get_climate_forest_totals_time_series(): Retrieves climate forest totals time series data.
@@ -64,28 +74,146 @@ Methods
 
 Each method in the DataFetcher class is designed to retrieve a specific type of data from the output tables managed by the DataManager. The methods return pandas DataFrames containing relevant data, which can be further analyzed or visualized as required.
 
+The table getters accept optional columns, scenarios, years, db_instances and where filters, which are applied in SQLite rather than in pandas.
+The iter_* methods stream the large disaggregated tables in bounded-size chunks instead of loading every instance at once.
+
 The DataFetcher class streamlines the process of data retrieval from complex environmental impact models, making it easier for users to access and utilize the data for research, policy-making, or educational purposes. It ensures that data across different scenarios and impact categories is readily accessible for comprehensive environmental analysis.
 
 Note:
     The class and its methods assume that the DataManager has been properly initialized and that the relevant data tables are available and correctly formatted. The users of this class should have a basic understanding of the data structure and the environmental impact scenarios to effectively utilize the retrieved data.
 """
 
-from goblin_fetcher.resource_manager.database_manager import DataManager
+from goblin_fetcher.resource_manager.database_manager import DataManager, DEFAULT_CACHE_BYTES, DEFAULT_CHUNKSIZE
 from goblin_fetcher.abatement import Abate
-from goblin_fetcher.time_series import TimeSeries
+from goblin_fetcher.table_writer import TableWriter, FORMATS
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import pandas as pd
+import threading
+import time
 import os
 
+# Output file names used by dump_tables, mapped to the output data table and index column they are read from
+OUTPUT_TABLES = {
+    "air_quality_animal_emissions": ("air_quality_livestock_disaggregated", "index"),
+    "air_quality_crop_emissions": ("air_quality_crops_disaggregated", "index"),
+    "air_quality_emissions_totals": ("air_quality_totals", "index"),
+    "climate_change_animal_emissions_aggregated": ("climate_change_livestock_aggregated", "index"),
+    "climate_change_crop_emissions_aggregated": ("climate_change_crops_aggregated", "index"),
+    "climate_change_emissions_totals": ("climate_change_totals", "index"),
+    "climate_change_animal_emissions_by_category": ("climate_change_livestock_disaggregated", "index"),
+    "climate_change_crop_emissions_by_category": ("climate_change_crops_disaggregated", "index"),
+    "crop_catchment_inputs": ("crop_input_data", "index"),
+    "crop_emissions_by_category_co2e": ("climate_change_crops_categories_as_co2e", "index"),
+    "crop_farm_input_applied": ("crop_farm_data", "index"),
+    "eutrophication_emission_totals": ("eutrophication_totals", "index"),
+    "eutrophication_crop_emissions_by_category": ("eutrophication_crops_disaggregated", "index"),
+    "eutrophication_animal_emissions_by_category": ("eutrophication_livestock_disaggregated", "index"),
+    "baseline_livestock_data": ("baseline_animal_data", "index"),
+    "scenario_livestock_data": ("scenario_animal_data", "index"),
+    "livestock_output_summary": ("protein_and_milk_summary", "Scenarios"),
+    "landuse_areas": ("landuse_data", "index"),
+    "landuse_emissions_totals": ("climate_change_landuse", "scenario"),
+    "total_afforested": ("cbm_afforestation_data", "index"),
+    "total_grassland_area": ("total_grassland_area", "index"),
+    "transition_matrix": ("transition_matrix", "index"),
+    "grassland_spared_area_by_soil_group": ("total_spared_area_by_soil_group", "index"),
+    "grassland_scenario_farm_inputs": ("grassland_farm_inputs_scenario", "index"),
+    "grassland_baseline_farm_inputs": ("grassland_farm_inputs_baseline", "index"),
+    "scenario_inputs": ("scenario_input_dataframe", "index"),
+    "stocking_rate_per_ha": ("per_hectare_stocking_rate", None),
+    "forest_aggregate": ("forest_carbon_aggregate", "index"),
+    "forest_flux": ("forest_carbon_flux", "index"),
+    "total_spared_area": ("total_spared_area", "index"),
+    "animal_emissions_by_category_co2e": ("climate_change_livestock_categories_as_co2e", "index"),
+}
+
+# Land use rows read by the time series methods
+LAND_USE_TIME_SERIES_ROWS = ["cropland", "grassland", "wetland", "total"]
+
+
 class DataFetcher:
-    def __init__(self, DATABASE_PATH):
+    def __init__(
+        self,
+        DATABASE_PATH,
+        max_workers=None,
+        backend="thread",
+        cache_bytes=DEFAULT_CACHE_BYTES,
+        cache_dir=None,
+        cache_format="feather",
+        attach=False,
+        read_only=True,
+        pragmas=None,
+        dtypes=None,
+    ):
         """
         A class responsible for fetching various types of data from output data tables.
 
         This class allows easy access to the data saved in the output data tables managed by the DataManager.
 
+        Each table getter accepts optional keyword filters, which are passed to
+        DataManager.get_goblin_results_output_datatable and compiled into parameterised SQL, so only the requested rows
+        and columns are read:
+
+            - columns: the columns to read. 'Scenarios' and 'db_instance' are always included.
+            - scenarios: the scenarios to read.
+            - years: the years to read, for tables with a 'year' or 'Year' column.
+            - db_instances: the db_instance labels of the databases to read.
+            - where: a dict mapping further columns to a value or list of accepted values.
+
+        For example, fetcher.get_landuse_emissions_totals(years=[2020, 2050], where={"land_use": "total"}).
+
+        A ValueError is raised when columns or where name a column the table does not have, or when years is given for
+        a table without a year column.
+
+        The time series methods accept an optional n_jobs, the number of worker processes. If it is greater than one,
+        the time series is computed for each db_instance in a separate process and the results are combined in instance
+        order. The input tables are sent to the workers through shared memory or Arrow IPC files, not pickled, and inputs
+        smaller than partitions.MIN_PARALLEL_BYTES are computed in this process. -1 uses every CPU. Defaults to None,
+        which computes the time series in this process.
+
         Parameters
         ----------
         DATABASE_PATH : str
-            The path to the external database.
+            The path to the external database, or a list of paths to the instance databases. A warehouse database built
+            with goblin_fetcher.resource_manager.warehouse.consolidate can be given instead, so all tables are read from
+            one indexed file.
+
+        max_workers : int, optional
+            The number of workers used to read the instance databases concurrently. Defaults to None, which reads
+            them one after another.
+
+        backend : str, optional
+            The executor used for concurrent reads, either "thread" or "process". Defaults to "thread".
+
+        cache_bytes : int, optional
+            The memory budget in bytes of the in-memory table cache. Tables used by several methods, such as the scenario
+            inputs, are then read from the databases once. Defaults to 512 MiB. None or 0 disables the cache.
+
+        cache_dir : str, optional
+            A directory in which to persist retrieved tables as Feather or Parquet files, keyed by the table and the paths,
+            modification times and sizes of the databases. Later processes against the same databases load the cached
+            files instead of querying SQLite. Defaults to None, which disables the on-disk cache. Requires pyarrow.
+
+        cache_format : str, optional
+            The file format of the on-disk cache, either "feather" or "parquet". Defaults to "feather".
+
+        attach : bool, optional
+            If True, the databases are attached to a single SQLite connection and each table is read with UNION ALL
+            queries over groups of up to SQLITE_MAX_ATTACHED databases. Defaults to False.
+
+        read_only : bool, optional
+            If True, the instance databases are opened as read-only, immutable SQLite URIs, which skips file locking. They
+            must not change while the DataFetcher has them open. Defaults to True.
+
+        pragmas : dict, optional
+            PRAGMA statements run on every new connection, merged over the DataManager defaults for mmap_size,
+            cache_size and temp_store. Defaults to None.
+
+        dtypes : str, optional
+            The dtype policy applied to the tables as they are read. "compact" stores 'db_instance' and other
+            low-cardinality string columns as categoricals and downcasts integer columns, and "arrow" also stores the
+            other string columns as Arrow-backed strings. Defaults to None, which keeps the dtypes pandas reads.
 
         Methods
         -------
@@ -143,6 +271,9 @@ class DataFetcher:
         get_abated_climate_change_animal_emissions_aggregated()
             Returns aggregated climate change emissions data for livestock after applying abatement rates from the "climate_change_livestock_aggregated" output data table.
         
+        get_abated_climate_change_animal_emissions_sweep()
+            Returns aggregated climate change emissions data for livestock for a sweep of abatement rates and GWP variants.
+
         get_animal_emissions_by_category_co2e()
             Returns climate change emissions data for livestock categories converted to CO2e from the "climate_change_livestock_categories_as_co2e" output data table.
 
@@ -161,6 +292,9 @@ class DataFetcher:
         get_abated_eutrophication_emission_totals()
             Returns the total eutrophication emissions data after applying abatement rates from the "eutrophication_totals" output data table.
 
+        get_abated_eutrophication_emission_totals_sweep()
+            Returns the total eutrophication emissions data for a sweep of abatement rates.
+
         get_air_quality_emission_totals()
             Returns the total air quality emissions data from the "air_quality_totals" output data table.
 
@@ -191,8 +325,36 @@ class DataFetcher:
         get_landuse_areas()
             Returns the land use areas data from the "land_use_areas" output data table.
 
+        iter_climate_change_animal_emissions_by_category()
+            Yields climate change emissions data for livestock categories from the "climate_change_livestock_disaggregated" output data table in chunks.
+
+        iter_climate_change_crop_emissions_by_category()
+            Yields climate change emissions data for crop categories from the "climate_change_crops_disaggregated" output data table in chunks.
+
+        iter_eutrophication_animal_emissions_by_category()
+            Yields eutrophication emissions data for livestock categories from the "eutrophication_livestock_disaggregated" output data table in chunks.
+
+        iter_eutrophication_crop_emissions_by_category()
+            Yields eutrophication emissions data for crop categories from the "eutrophication_crops_disaggregated" output data table in chunks.
+
+        iter_air_quality_animal_emissions_by_category()
+            Yields air quality emissions data for livestock categories from the "air_quality_livestock_disaggregated" output data table in chunks.
+
+        iter_air_quality_crop_emissions_by_category()
+            Yields air quality emissions data for crop categories from the "air_quality_crops_disaggregated" output data table in chunks.
+
         dump_tables()
-            Dumps all the output tables to a specified directory.
+            Dumps the output tables to a specified directory as CSV, gzipped CSV, Parquet or Feather files, and returns
+            the rows, bytes and time taken for each table.
+
+        close()
+            Closes the pooled database connections.
+
+        clear_cache()
+            Removes all tables from the in-memory and on-disk caches.
+
+        get_tables()
+            Returns several output tables at once, opening each database once.
 
         get_climate_landuse_totals_time_series()
             Returns the climate land use totals time series data from the output data tables.
@@ -209,15 +371,133 @@ class DataFetcher:
         get_abated_climate_totals_time_series()
             Returns the abated climate totals time series data from the output data tables.
         """
-        self.data_manager_class = DataManager(DATABASE_PATH)
+        self.data_manager_class = DataManager(
+            DATABASE_PATH,
+            max_workers=max_workers,
+            backend=backend,
+            cache_bytes=cache_bytes,
+            cache_dir=cache_dir,
+            cache_format=cache_format,
+            attach=attach,
+            read_only=read_only,
+            pragmas=pragmas,
+            dtypes=dtypes,
+        )
+        self._partitions = None
+        self._partitions_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pooled database connections held by the DataManager, and the worker processes of the time series.
+        """
+        self.data_manager_class.close()
+
+        with self._partitions_lock:
+            if self._partitions is not None:
+                self._partitions.close()
+
+    def clear_cache(self):
+        """
+        Removes all tables from the in-memory and on-disk caches, so the next calls read from the databases again.
+        """
+        self.data_manager_class.clear_cache()
+
+    def add_databases(self, paths):
+        """
+        Adds instance databases, for example the results of newly finished scenario runs.
+
+        The tables already cached are updated by reading only the new databases, so the next calls, including the time
+        series, do not read the existing databases again.
+
+        Parameters
+        ----------
+        paths : str or list of str
+            The paths to the instance databases to add.
+        """
+        self.data_manager_class.add_databases(paths)
+
+    def remove_databases(self, paths):
+        """
+        Removes instance databases. The tables already cached are updated by dropping the rows of the removed databases.
+
+        Parameters
+        ----------
+        paths : str or list of str
+            The paths to the instance databases to remove.
+        """
+        self.data_manager_class.remove_databases(paths)
+
+    def get_tables(self, tables):
+        """
+        Retrieve several output tables at once, opening each database once.
+
+        Parameters
+        ----------
+        tables : list or dict
+            The names of the tables, as listed in OUTPUT_TABLES, or a dict mapping each name to a dict of filters
+            (columns, scenarios, years, db_instances, where) for that table.
 
-    def get_scenario_inputs(self):
+        Returns
+        -------
+        dict of DataFrame
+            The table for each name, equal to the result of the matching getter called with the same filters.
+
+        Examples
+        --------
+            >>> fetcher = DataFetcher(paths)
+            >>> tables = fetcher.get_tables(["scenario_inputs", "forest_flux"])
+        """
+        if not isinstance(tables, dict):
+            tables = {name: {} for name in tables}
+
+        unknown = [name for name in tables if name not in OUTPUT_TABLES]
+        if unknown:
+            raise ValueError(f"Unknown tables {unknown}, expected names from {list(OUTPUT_TABLES)}.")
+
+        queries = {}
+        for name, filters in tables.items():
+            table, index_col = OUTPUT_TABLES[name]
+            queries[name] = {"table": table, "index_col": index_col, **filters}
+
+        return self.data_manager_class.get_many(queries)
+
+    def lazy(self):
+        """
+        Returns a lazy view of the DataFetcher, whose getters return deferred query plans instead of DataFrames.
+
+        The plans can be narrowed with filter, select and abate, and are executed with collect, or several at once with
+        goblin_fetcher.lazy.collect_all, which reads each table they share once.
+
+        Returns
+        -------
+        LazyDataFetcher
+            The lazy view of this DataFetcher.
+
+        Examples
+        --------
+            >>> plan = fetcher.lazy().get_abated_climate_totals_time_series(2020, 2050, 0.3).filter(scenarios=[0, 1])
+            >>> time_series = plan.collect()
+        """
+        # Imported here, as the lazy module builds on this one
+        from goblin_fetcher.lazy import LazyDataFetcher
+
+        return LazyDataFetcher(self)
+
+    def get_scenario_inputs(self, **filters):
         """
         Retrieve a DataFrame containing information about scenario inputs.
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
         
         Returns
         -------
@@ -230,17 +510,19 @@ class DataFetcher:
             >>> baseline_data = data_manager.get_scenario_inputs()
         """
         scenario_inputs = self.data_manager_class.get_goblin_results_output_datatable(
-            "scenario_input_dataframe", index_col="index"
+            "scenario_input_dataframe", index_col="index", **filters
         )
         return scenario_inputs
     
-    def get_stocking_rate_per_ha(self):
+    def get_stocking_rate_per_ha(self, **filters):
         """
         Retrieve a DataFrame containing information about stocking rate per hectare for each scenario.
         
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -253,17 +535,19 @@ class DataFetcher:
             >>> baseline_data = data_manager.get_stocking_rate_per_ha()
         """
         stocking_rate = self.data_manager_class.get_goblin_results_output_datatable(
-            "per_hectare_stocking_rate"
+            "per_hectare_stocking_rate", **filters
         )
         return stocking_rate
 
-    def get_grassland_spared_area_by_soil_group(self):
+    def get_grassland_spared_area_by_soil_group(self, **filters):
         """
         Retrieve a DataFrame containing information about spared (destocked) grassland area by soil group for each scenario.
         
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
         
         Returns
         -------
@@ -276,17 +560,19 @@ class DataFetcher:
             >>> baseline_data = data_manager.get_grassland_spared_area_by_soil_group()
         """
         spared_area = self.data_manager_class.get_goblin_results_output_datatable(
-            "total_spared_area_by_soil_group", index_col="index"
+            "total_spared_area_by_soil_group", index_col="index", **filters
         )
         return spared_area
     
-    def get_crop_farm_input_applied(self):
+    def get_crop_farm_input_applied(self, **filters):
         """
         Retrieve a DataFrame containing information about fertilizer application to crops for each scenario.
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -299,17 +585,19 @@ class DataFetcher:
             >>> baseline_data = data_manager.get_crop_farm_input_applied()
         """
         crop_inputs = self.data_manager_class.get_goblin_results_output_datatable(
-            "crop_farm_data", index_col="index"
+            "crop_farm_data", index_col="index", **filters
         )
         return crop_inputs
     
-    def get_crop_national_inputs(self):
+    def get_crop_national_inputs(self, **filters):
         """
         Retrieve a DataFrame containing information about national crop inputs for each scenario.
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -323,17 +611,19 @@ class DataFetcher:
         """
 
         crop_inputs = self.data_manager_class.get_goblin_results_output_datatable(
-            "crop_input_data", index_col="index"
+            "crop_input_data", index_col="index", **filters
         )
         return crop_inputs
 
-    def get_transition_matrix(self):
+    def get_transition_matrix(self, **filters):
         """
         Retrieve a DataFrame containing information about the land use transition matrix.
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -346,11 +636,11 @@ class DataFetcher:
             >>> baseline_data = data_manager.get_transition_matrix()
         """
         transition_matrix = self.data_manager_class.get_goblin_results_output_datatable(
-            "transition_matrix", index_col="index"
+            "transition_matrix", index_col="index", **filters
         )
         return transition_matrix
     
-    def get_baseline_livestock_data(self):
+    def get_baseline_livestock_data(self, **filters):
         """Fetches and returns the baseline livestock data.
 
         This method is used to retrieve the baseline livestock data, which contains information about animal-related variables in the baseline scenario.
@@ -358,7 +648,9 @@ class DataFetcher:
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -380,11 +672,11 @@ class DataFetcher:
         """
 
         livestock = self.data_manager_class.get_goblin_results_output_datatable(
-            "baseline_animal_data", index_col="index"
+            "baseline_animal_data", index_col="index", **filters
         )
         return livestock
 
-    def get_scenario_livestock_data(self):
+    def get_scenario_livestock_data(self, **filters):
         """
         Fetches and returns the livestock data for the specific scenario.
 
@@ -392,7 +684,9 @@ class DataFetcher:
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -414,14 +708,20 @@ class DataFetcher:
         """
 
         livestock = self.data_manager_class.get_goblin_results_output_datatable(
-            "scenario_animal_data", index_col="index"
+            "scenario_animal_data", index_col="index", **filters
         )
         return livestock
 
-    def get_livestock_output_summary(self):
+    def get_livestock_output_summary(self, **filters):
         """
         Fetches the summary of livestock outputs from the "protein_and_milk_summary" output data table.
 
+        Parameters
+        ----------
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
+
         Returns
         -------
         pandas.DataFrame
@@ -437,18 +737,20 @@ class DataFetcher:
 
         protein_and_milk_summary = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "protein_and_milk_summary", index_col="Scenarios"
+                "protein_and_milk_summary", index_col="Scenarios", **filters
             )
         )
         return protein_and_milk_summary
 
-    def get_grassland_scenario_farm_inputs(self):
+    def get_grassland_scenario_farm_inputs(self, **filters):
         """
         Retrieve a DataFrame containing information about fertilizer application to grassland for each scenario.
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -465,18 +767,20 @@ class DataFetcher:
 
         scenario_farm_inputs = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "grassland_farm_inputs_scenario", index_col="index"
+                "grassland_farm_inputs_scenario", index_col="index", **filters
             )
         )
         return scenario_farm_inputs
 
-    def get_grassland_baseline_farm_inputs(self):
+    def get_grassland_baseline_farm_inputs(self, **filters):
         """
         Retrieve a DataFrame containing information about fertilizer application to grassland in the baseline scenario.
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -493,18 +797,20 @@ class DataFetcher:
 
         baseline_farm_inputs = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "grassland_farm_inputs_baseline", index_col="index"
+                "grassland_farm_inputs_baseline", index_col="index", **filters
             )
         )
         return baseline_farm_inputs
 
-    def get_total_grassland_area(self):
+    def get_total_grassland_area(self, **filters):
         """
         Retrieve the total grassland area for baseline and scenarios.
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -520,18 +826,20 @@ class DataFetcher:
         """
         total_grassland_area = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "total_grassland_area", index_col="index"
+                "total_grassland_area", index_col="index", **filters
             )
         )
         return total_grassland_area
 
-    def get_total_spared_area(self):
+    def get_total_spared_area(self, **filters):
         """
         Retrieve the total spared area in all scenarios.
 
         Parameters
         ----------
-        None
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
 
         Returns
         -------
@@ -547,11 +855,11 @@ class DataFetcher:
         """
 
         total_spared_area = self.data_manager_class.get_goblin_results_output_datatable(
-            "total_spared_area", index_col="index"
+            "total_spared_area", index_col="index", **filters
         )
         return total_spared_area
 
-    def get_climate_change_animal_emissions_by_category(self):
+    def get_climate_change_animal_emissions_by_category(self, **filters):
         """
         Retrieve the total climate change emissions from animal production by category and gas for each scenario and baseline.
 
@@ -563,6 +871,12 @@ class DataFetcher:
             - Pasture (Direct and Indirect N2O)
             - Soils (Fertilizer Application, CO2, Direct and Indirect N2O)
 
+        Parameters
+        ----------
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
+
         Returns
         -------
         DataFrame
@@ -578,12 +892,12 @@ class DataFetcher:
 
         total_animal_gases = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "climate_change_livestock_disaggregated", index_col="index"
+                "climate_change_livestock_disaggregated", index_col="index", **filters
             )
         )
         return total_animal_gases
 
-    def get_climate_change_crop_emissions_by_category(self):
+    def get_climate_change_crop_emissions_by_category(self, **filters):
         """
         Retrieve the total climate change emissions from crop production by category and gas for each scenario and baseline.
 
@@ -594,6 +908,12 @@ class DataFetcher:
             - Fertilizer (Direct and Indirect N2O)
             - Soils (CO2, N2O)
 
+        Parameters
+        ----------
+        **filters
+            Optional columns, scenarios, years, db_instances and where filters, as described in DataFetcher. Raises a
+            ValueError for a column the table does not have, or for years on a table without a year column.
+
         Returns
         -------
         DataFrame
@@ -607,11 +927,11 @@ class DataFetcher:
 
         """
         total_crops_gases = self.data_manager_class.get_goblin_results_output_datatable(
-            "climate_change_crops_disaggregated", index_col="index"
+            "climate_change_crops_disaggregated", index_col="index", **filters
         )
         return total_crops_gases
 
-    def get_climate_change_crop_emissions_aggregated(self):
+    def get_climate_change_crop_emissions_aggregated(self, **filters):
         """
         Get total aggregated greenhouse gas emissions for crop production.
 
@@ -624,6 +944,11 @@ class DataFetcher:
             - CO2 (Carbon Dioxide) emissions
             - CO2E (Carbon Dioxide Equivalent) emissions
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the total aggregated greenhouse gas emissions for crop production.
@@ -639,11 +964,11 @@ class DataFetcher:
         """
 
         total_crops_gases = self.data_manager_class.get_goblin_results_output_datatable(
-            "climate_change_crops_aggregated", index_col="index"
+            "climate_change_crops_aggregated", index_col="index", **filters
         )
         return total_crops_gases
 
-    def get_climate_change_animal_emissions_aggregated(self):
+    def get_climate_change_animal_emissions_aggregated(self, **filters):
         """
         Get total aggregated greenhouse gas emissions for livestock production.
 
@@ -656,6 +981,11 @@ class DataFetcher:
             - CO2 (Carbon Dioxide) emissions
             - CO2E (Carbon Dioxide Equivalent) emissions
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the total aggregated greenhouse gas emissions for livestock production.
@@ -672,7 +1002,7 @@ class DataFetcher:
 
         total_animal_gases = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "climate_change_livestock_aggregated", index_col="index"
+                "climate_change_livestock_aggregated", index_col="index", **filters
             )
         )
         return total_animal_gases
@@ -714,9 +1044,33 @@ class DataFetcher:
            livestock_dataframe, rate, CH4, N2O
         )
         return total_animal_gases
+
+    def get_abated_climate_change_animal_emissions_sweep(self, rates, gwps=None):
+        """
+        Get total aggregated greenhouse gas emissions for livestock production for a sweep of abatement rates.
+
+        This method evaluates many abatement rates, and optionally several GWP variants, in one call. The emissions table is
+        read once and the abatement is broadcast over all rates and variants.
+
+        Parameters:
+            rates (array-like): The abatement rates applied to the emissions.
+            gwps (list of tuple): (CH4, N2O) GWP pairs to evaluate. If None, the default values are used.
+
+        Returns:
+            pandas.DataFrame:
+                A long-form dataframe of the abated emissions, indexed by rate, CH4 GWP, N2O GWP and row. Each rate and GWP
+                slice matches get_abated_climate_change_animal_emissions_aggregated for the same arguments.
+
+        Note:
+            Reported in kilotons.
+
+        """
+        livestock_dataframe = self.get_climate_change_animal_emissions_aggregated()
+
+        return Abate.climate_abate_livestock_rates(livestock_dataframe, rates, gwps)
     
 
-    def get_animal_emissions_by_category_co2e(self):
+    def get_animal_emissions_by_category_co2e(self, **filters):
         """
         Get greenhouse gas emissions for livestock production by specific categories in CO2E (Carbon Dioxide Equivalent).
 
@@ -733,6 +1087,11 @@ class DataFetcher:
                 - Nitrous Oxide emissions from direct and indirect sources related to soils, including emissions from manure application
                 and animal deposits.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing greenhouse gas emissions for livestock production by specific categories, expressed as CO2E values.
@@ -746,11 +1105,11 @@ class DataFetcher:
         """
 
         total_animal_co2e = self.data_manager_class.get_goblin_results_output_datatable(
-            "climate_change_livestock_categories_as_co2e", index_col="index"
+            "climate_change_livestock_categories_as_co2e", index_col="index", **filters
         )
         return total_animal_co2e
 
-    def get_crop_emissions_by_category_co2e(self):
+    def get_crop_emissions_by_category_co2e(self, **filters):
         """
         Get greenhouse gas emissions for crop production by specific categories in CO2E (Carbon Dioxide Equivalent).
 
@@ -760,6 +1119,11 @@ class DataFetcher:
             - CO2 (Carbon Dioxide): Carbon dioxide emissions from various crop processes.
             - Soils (CO2, N2O): Total Emissions from soil-related activities in crop production, including both carbon dioxide and nitrous oxide.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing greenhouse gas emissions for crop production by specific categories, expressed as CO2E values.
@@ -772,11 +1136,11 @@ class DataFetcher:
         """
 
         total_crop_co2e = self.data_manager_class.get_goblin_results_output_datatable(
-            "climate_change_crops_categories_as_co2e", index_col="index"
+            "climate_change_crops_categories_as_co2e", index_col="index", **filters
         )
         return total_crop_co2e
 
-    def get_climate_change_emission_totals(self):
+    def get_climate_change_emission_totals(self, **filters):
         """Get the total greenhouse gas emissions for climate change from combined land use, crop, and livestock activities.
 
         This method retrieves the total greenhouse gas emissions for climate change resulting from combined land use, crop,
@@ -787,6 +1151,11 @@ class DataFetcher:
             - CO2E (Carbon Dioxide Equivalent): Combined emissions of each gas converted to CO2E using the AR value specified
                                             in the configuration file.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the total greenhouse gas emissions for climate change, including CH4, N2O, CO2, and CO2E.
@@ -801,29 +1170,28 @@ class DataFetcher:
 
         total_climate_change = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "climate_change_totals", index_col="index"
+                "climate_change_totals", index_col="index", **filters
             )
         )
         return total_climate_change
 
     def get_abated_climate_change_emissions_totals(self, baseline_year, target_year, rate, CH4=None, N2O=None):
         
-        scenario_df = self.get_scenario_inputs()
-        livestock_df = self.get_climate_change_animal_emissions_aggregated()
-        landcover_df = self.get_landuse_emissions_totals()
+        return self.lazy().get_abated_climate_change_emissions_totals(baseline_year, target_year, rate, CH4, N2O).collect()
 
-        total_climate_change = Abate.climate_total_abated(baseline_year, target_year, scenario_df, livestock_df, landcover_df, rate, CH4, N2O)
 
-        return total_climate_change
-
-
-    def get_eutrophication_emission_totals(self):
+    def get_eutrophication_emission_totals(self, **filters):
         """
         Get the total eutrophication emissions.
 
         This method retrieves the total eutrophication emissions associated with manure management, soils, and overall total.
         The emissions are reported in units of kilotons of PO4e (Phosphorus equivalent).
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the total eutrophication emissions for manure management, soils, and the overall total.
@@ -840,7 +1208,7 @@ class DataFetcher:
 
         total_eutrophication = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "eutrophication_totals", index_col="index"
+                "eutrophication_totals", index_col="index", **filters
             )
         )
         return total_eutrophication
@@ -856,13 +1224,36 @@ class DataFetcher:
         total_eutrophication = Abate.eutrophication_air_quality_abate_livestock(eutrophication_dataframe, rate)
         return total_eutrophication
 
+    def get_abated_eutrophication_emission_totals_sweep(self, rates):
+        """
+        Get the total eutrophication emissions for a sweep of abatement rates.
+
+        The eutrophication table is read once and the abatement is broadcast over all rates.
+
+        Parameters:
+            rates (array-like): The abatement rates applied to the emissions.
+
+        Returns:
+            pandas.DataFrame:
+                A long-form dataframe of the abated emissions, indexed by rate and row. Each rate slice matches
+                get_abated_eutrophication_emission_totals for the same rate.
+        """
+        eutrophication_dataframe = self.get_eutrophication_emission_totals()
+
+        return Abate.eutrophication_air_quality_abate_livestock_rates(eutrophication_dataframe, rates)
+
 
-    def get_air_quality_emission_totals(self):
+    def get_air_quality_emission_totals(self, **filters):
         """
         Get the total air quality emissions.
 
         This method retrieves the total air quality emissions associated with NH3 (Ammonia) from various agricultural activities.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the total air quality emissions for NH3 (Ammonia).
@@ -878,16 +1269,21 @@ class DataFetcher:
         """
 
         total_air_quality = self.data_manager_class.get_goblin_results_output_datatable(
-            "air_quality_totals", index_col="index"
+            "air_quality_totals", index_col="index", **filters
         )
         return total_air_quality
 
-    def get_eutrophication_animal_emissions_by_category(self):
+    def get_eutrophication_animal_emissions_by_category(self, **filters):
         """
         Get the eutrophication emissions from animal-related sources.
 
         This method retrieves the eutrophication emissions associated with manure management and soils from livestock-related activities.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the eutrophication emissions from animal-related sources, categorized into manure management
@@ -905,12 +1301,12 @@ class DataFetcher:
 
         total_animal_gases = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "eutrophication_livestock_disaggregated", index_col="index"
+                "eutrophication_livestock_disaggregated", index_col="index", **filters
             )
         )
         return total_animal_gases
 
-    def get_eutrophication_crop_emissions_by_category(self):
+    def get_eutrophication_crop_emissions_by_category(self, **filters):
         """
         Get the eutrophication emissions from crop-related sources.
 
@@ -918,6 +1314,11 @@ class DataFetcher:
 
         This is totaled in a single soils category.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the eutrophication emissions from crop-related sources, categorized as soils. The emissions
@@ -934,15 +1335,20 @@ class DataFetcher:
         """
 
         total_crop_gases = self.data_manager_class.get_goblin_results_output_datatable(
-            "eutrophication_crops_disaggregated", index_col="index"
+            "eutrophication_crops_disaggregated", index_col="index", **filters
         )
         return total_crop_gases
 
-    def get_air_quality_animal_emissions_by_category(self):
+    def get_air_quality_animal_emissions_by_category(self, **filters):
         """Get the air quality emissions from animal-related sources.
 
         This method retrieves the air quality emissions associated with manure management and soils from animal-related activities.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the air quality emissions from animal-related sources, categorized as manure management and soils.
@@ -960,18 +1366,23 @@ class DataFetcher:
 
         total_animal_gases = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "air_quality_livestock_disaggregated", index_col="index"
+                "air_quality_livestock_disaggregated", index_col="index", **filters
             )
         )
         return total_animal_gases
 
-    def get_air_quality_crop_emissions_by_category(self):
+    def get_air_quality_crop_emissions_by_category(self, **filters):
         """Get the air quality emissions from crop-related sources.
 
         This method retrieves the air quality emissions associated with fertilizer application and soils from crop-related activities.
 
         This is totaled in a single soils category.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the air quality emissions from crop-related sources, categorized as fertilizer application and soils.
@@ -987,17 +1398,22 @@ class DataFetcher:
         """
 
         total_crops_gases = self.data_manager_class.get_goblin_results_output_datatable(
-            "air_quality_crops_disaggregated", index_col="index"
+            "air_quality_crops_disaggregated", index_col="index", **filters
         )
         return total_crops_gases
 
-    def get_landuse_emissions_totals(self):
+    def get_landuse_emissions_totals(self, **filters):
         """
         Get the land use emissions totals by gas.
 
         This method retrieves a dataframe that summarizes the total emissions for each land use category, categorized by different gas types
         such as CO2, CH4, and N2O, as well as a combined total in CO2E (CO2 equivalent).
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the total emissions for each land use category, categorized by different gas types including CO2, CH4,
@@ -1014,12 +1430,12 @@ class DataFetcher:
         """
         total_animal_gases = (
             self.data_manager_class.get_goblin_results_output_datatable(
-                "climate_change_landuse", index_col="scenario"
+                "climate_change_landuse", index_col="scenario", **filters
             )
         )
         return total_animal_gases
 
-    def get_forest_flux(self):
+    def get_forest_flux(self, **filters):
         """
         Get the forest carbon annual flux.
 
@@ -1027,6 +1443,11 @@ class DataFetcher:
         categorized into different components, including biomass, dead organic matter (DOM), and total ecosystem, which represents the combined
         biomass and DOM flux. Additionally, the carbon from harvested wood products are also reported.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the forest carbon annual flux, categorized into different components such as biomass, dead organic
@@ -1044,11 +1465,11 @@ class DataFetcher:
         """
 
         forest_flux = self.data_manager_class.get_goblin_results_output_datatable(
-            "forest_carbon_flux", index_col="index"
+            "forest_carbon_flux", index_col="index", **filters
         )
         return forest_flux
 
-    def get_forest_aggregate(self):
+    def get_forest_aggregate(self, **filters):
         """
         Get the aggregated forest carbon emissions.
 
@@ -1057,6 +1478,11 @@ class DataFetcher:
         carbon storage and release within the forest ecosystem, including both living biomass and dead organic matter components.
         Additionally, the carbon from harvested wood products are also reported.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the aggregated forest carbon emissions, including biomass, dead organic matter (DOM), and total ecosystem
@@ -1074,11 +1500,11 @@ class DataFetcher:
         """
 
         forest_aggregate = self.data_manager_class.get_goblin_results_output_datatable(
-            "forest_carbon_aggregate", index_col="index"
+            "forest_carbon_aggregate", index_col="index", **filters
         )
         return forest_aggregate
 
-    def get_total_afforested(self):
+    def get_total_afforested(self, **filters):
         """
         Get the total afforested area for each scenario.
 
@@ -1086,6 +1512,11 @@ class DataFetcher:
         representing the extent of land that has been converted to forest through afforestation. The afforested areas are essential indicators
         of reforestation efforts and land-use changes to promote carbon sequestration and biodiversity conservation.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the total afforested area for each scenario. The values are reported in hectares (ha) and offer insights
@@ -1101,11 +1532,11 @@ class DataFetcher:
         """
 
         afforestation = self.data_manager_class.get_goblin_results_output_datatable(
-            "cbm_afforestation_data", index_col="index"
+            "cbm_afforestation_data", index_col="index", **filters
         )
         return afforestation
     
-    def get_landuse_areas(self):
+    def get_landuse_areas(self, **filters):
         """
         Get the land use areas for each scenario and the baseline.
 
@@ -1114,6 +1545,11 @@ class DataFetcher:
 
         Share variables for mineral soils, organic soils, organic mineral soils, rewetted, peat extraction, are fractions of the total area of the land use type.
 
+        Parameters:
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as described in
+                DataFetcher. Raises a ValueError for a column the table does not have, or for years on a table without
+                a year column.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the land use areas for each scenario and the baseline. The area values are reported in hectares (ha) and shares are
@@ -1122,73 +1558,260 @@ class DataFetcher:
         """
 
         landuse_areas = self.data_manager_class.get_goblin_results_output_datatable(
-            "landuse_data", index_col="index"
+            "landuse_data", index_col="index", **filters
         )
         return landuse_areas
 
+    def iter_climate_change_animal_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Iterate over the climate change emissions for livestock categories in chunks.
+
+        This method streams the "climate_change_livestock_disaggregated" output data table one chunk at a time.
+        Concatenating the chunks gives the result of get_climate_change_animal_emissions_by_category, without holding every instance in memory.
+
+        Parameters:
+            chunksize (int, optional): The maximum number of rows in each chunk. Defaults to DEFAULT_CHUNKSIZE.
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as for
+                get_climate_change_animal_emissions_by_category.
+
+        Yields:
+            pandas.DataFrame: The next chunk of the table, with 'Scenarios' and 'db_instance' columns.
+        """
+        return self.data_manager_class.iter_table(
+            "climate_change_livestock_disaggregated", index_col="index", chunksize=chunksize, **filters
+        )
+
+    def iter_climate_change_crop_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Iterate over the climate change emissions for crop categories in chunks.
+
+        This method streams the "climate_change_crops_disaggregated" output data table one chunk at a time.
+        Concatenating the chunks gives the result of get_climate_change_crop_emissions_by_category, without holding every instance in memory.
+
+        Parameters:
+            chunksize (int, optional): The maximum number of rows in each chunk. Defaults to DEFAULT_CHUNKSIZE.
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as for
+                get_climate_change_crop_emissions_by_category.
+
+        Yields:
+            pandas.DataFrame: The next chunk of the table, with 'Scenarios' and 'db_instance' columns.
+        """
+        return self.data_manager_class.iter_table(
+            "climate_change_crops_disaggregated", index_col="index", chunksize=chunksize, **filters
+        )
+
+    def iter_eutrophication_animal_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Iterate over the eutrophication emissions for livestock categories in chunks.
+
+        This method streams the "eutrophication_livestock_disaggregated" output data table one chunk at a time.
+        Concatenating the chunks gives the result of get_eutrophication_animal_emissions_by_category, without holding every instance in memory.
+
+        Parameters:
+            chunksize (int, optional): The maximum number of rows in each chunk. Defaults to DEFAULT_CHUNKSIZE.
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as for
+                get_eutrophication_animal_emissions_by_category.
+
+        Yields:
+            pandas.DataFrame: The next chunk of the table, with 'Scenarios' and 'db_instance' columns.
+        """
+        return self.data_manager_class.iter_table(
+            "eutrophication_livestock_disaggregated", index_col="index", chunksize=chunksize, **filters
+        )
+
+    def iter_eutrophication_crop_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Iterate over the eutrophication emissions for crop categories in chunks.
+
+        This method streams the "eutrophication_crops_disaggregated" output data table one chunk at a time.
+        Concatenating the chunks gives the result of get_eutrophication_crop_emissions_by_category, without holding every instance in memory.
+
+        Parameters:
+            chunksize (int, optional): The maximum number of rows in each chunk. Defaults to DEFAULT_CHUNKSIZE.
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as for
+                get_eutrophication_crop_emissions_by_category.
+
+        Yields:
+            pandas.DataFrame: The next chunk of the table, with 'Scenarios' and 'db_instance' columns.
+        """
+        return self.data_manager_class.iter_table(
+            "eutrophication_crops_disaggregated", index_col="index", chunksize=chunksize, **filters
+        )
+
+    def iter_air_quality_animal_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Iterate over the air quality emissions for livestock categories in chunks.
+
+        This method streams the "air_quality_livestock_disaggregated" output data table one chunk at a time.
+        Concatenating the chunks gives the result of get_air_quality_animal_emissions_by_category, without holding every instance in memory.
+
+        Parameters:
+            chunksize (int, optional): The maximum number of rows in each chunk. Defaults to DEFAULT_CHUNKSIZE.
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as for
+                get_air_quality_animal_emissions_by_category.
+
+        Yields:
+            pandas.DataFrame: The next chunk of the table, with 'Scenarios' and 'db_instance' columns.
+        """
+        return self.data_manager_class.iter_table(
+            "air_quality_livestock_disaggregated", index_col="index", chunksize=chunksize, **filters
+        )
+
+    def iter_air_quality_crop_emissions_by_category(self, chunksize=DEFAULT_CHUNKSIZE, **filters):
+        """
+        Iterate over the air quality emissions for crop categories in chunks.
+
+        This method streams the "air_quality_crops_disaggregated" output data table one chunk at a time.
+        Concatenating the chunks gives the result of get_air_quality_crop_emissions_by_category, without holding every instance in memory.
 
+        Parameters:
+            chunksize (int, optional): The maximum number of rows in each chunk. Defaults to DEFAULT_CHUNKSIZE.
+            **filters: Optional columns, scenarios, years, db_instances and where filters, as for
+                get_air_quality_crop_emissions_by_category.
 
-    def dump_tables(self, data_path):
+        Yields:
+            pandas.DataFrame: The next chunk of the table, with 'Scenarios' and 'db_instance' columns.
+        """
+        return self.data_manager_class.iter_table(
+            "air_quality_crops_disaggregated", index_col="index", chunksize=chunksize, **filters
+        )
+
+
+
+    def dump_tables(
+        self,
+        data_path,
+        format="csv",
+        tables=None,
+        max_workers=None,
+        stream=False,
+        chunksize=DEFAULT_CHUNKSIZE,
+        single_pass=True,
+    ):
         """
         Dump all tables to a specified path.
 
         Parameters
         ----------
-        path : str
+        data_path : str
             The path to the directory where the tables will be dumped.
 
+        format : str, optional
+            The output format, one of "csv", "csv.gz", "parquet" or "feather". Defaults to "csv". Parquet and Feather
+            require pyarrow.
+
+        tables : list of str, optional
+            The names of the tables to dump, as listed in OUTPUT_TABLES. Defaults to None, which dumps all tables.
+
+        max_workers : int, optional
+            The number of tables read and written concurrently. Defaults to None, which dumps them one after another.
+
+        stream : bool, optional
+            If True, each table is read and written chunk by chunk with iter_table, so only one chunk per worker is held
+            in memory. Defaults to False, which reads each table whole before writing it, so one table per worker is held
+            in memory.
+
+        chunksize : int, optional
+            The maximum number of rows in each chunk when streaming. Defaults to DEFAULT_CHUNKSIZE.
+
+        single_pass : bool, optional
+            If True and not streaming, all tables are read first with get_tables, which opens each database once and
+            fans its rows out to the tables, but holds every table in memory until it is written. If False, each table is
+            read as it is written, opening every database once per table. Defaults to True. Streamed dumps always read one
+            table at a time, opening every database once per table, so that only one chunk per worker is in memory.
+
         Returns
         -------
-        None
+        pandas.DataFrame
+            The number of rows, the file size in bytes and the time in seconds taken for each table, indexed by table name.
+            With single_pass, the time covers writing the table only, as all tables are read together beforehand.
 
         Notes
         -----
-        This method is used to dump all the tables from the database to a specified directory. The tables are saved as CSV files.
-
-        """
-        tables = [(self.get_air_quality_animal_emissions_by_category, "air_quality_animal_emissions.csv"),
-                    (self.get_air_quality_crop_emissions_by_category, "air_quality_crop_emissions.csv"),
-                    (self.get_air_quality_emission_totals, "air_quality_emissions_totals.csv"),
-                    (self.get_climate_change_animal_emissions_aggregated,"climate_change_animal_emissions_aggregated.csv"),
-                    (self.get_climate_change_crop_emissions_aggregated, "climate_change_crop_emissions_aggregated.csv"),
-                    (self.get_climate_change_emission_totals, "climate_change_emissions_totals.csv"),
-                    (self.get_climate_change_animal_emissions_by_category, "climate_change_animal_emissions_by_category.csv"),
-                    (self.get_climate_change_crop_emissions_by_category, "climate_change_crop_emissions_by_category.csv"),
-                    (self.get_crop_national_inputs, "crop_catchment_inputs.csv"),
-                    (self.get_crop_emissions_by_category_co2e, "crop_emissions_by_category_co2e.csv"),
-                    (self.get_crop_farm_input_applied, "crop_farm_input_applied.csv"),
-                    (self.get_eutrophication_emission_totals, "eutrophication_emission_totals.csv"),
-                    (self.get_eutrophication_crop_emissions_by_category, "eutrophication_crop_emissions_by_category.csv"),
-                    (self.get_eutrophication_animal_emissions_by_category, "eutrophication_animal_emissions_by_category.csv"),
-                    (self.get_baseline_livestock_data, "baseline_livestock_data.csv"),
-                    (self.get_scenario_livestock_data, "scenario_livestock_data.csv"),
-                    (self.get_livestock_output_summary, "livestock_output_summary.csv"),
-                    (self.get_landuse_areas, "landuse_areas.csv"),
-                    (self.get_landuse_emissions_totals, "landuse_emissions_totals.csv"),
-                    (self.get_total_afforested, "total_afforested.csv"),
-                    (self.get_total_grassland_area, "total_grassland_area.csv"),
-                    (self.get_transition_matrix, "transition_matrix.csv"),
-                    (self.get_grassland_spared_area_by_soil_group, "grassland_spared_area_by_soil_group.csv"),
-                    (self.get_grassland_scenario_farm_inputs, "grassland_scenario_farm_inputs.csv"),
-                    (self.get_grassland_baseline_farm_inputs, "grassland_baseline_farm_inputs.csv"),
-                    (self.get_scenario_inputs, "scenario_inputs.csv"),
-                    (self.get_stocking_rate_per_ha, "stocking_rate_per_ha.csv"),
-                    (self.get_forest_aggregate, "forest_aggregate.csv"),
-                    (self.get_forest_flux, "forest_flux.csv"),
-                    (self.get_total_spared_area, "total_spared_area.csv"),
-                    (self.get_animal_emissions_by_category_co2e, "animal_emissions_by_category_co2e.csv")]
-        
+        This method is used to dump all the tables from the database to a specified directory. The tables are saved as
+        CSV files by default, with the same content whether or not they are streamed.
+
+        """
+        TableWriter.check_format(format)
+
+        if tables is None:
+            tables = list(OUTPUT_TABLES)
+        else:
+            unknown = [name for name in tables if name not in OUTPUT_TABLES]
+            if unknown:
+                raise ValueError(f"Unknown tables {unknown}, expected names from {list(OUTPUT_TABLES)}.")
+
+        # Single pass dumps read all tables in one pass over the databases; other dumps read each table as it is written
+        frames = self.get_tables(tables) if single_pass and not stream else None
 
-        for get_method, filename in tables:
-            get_method().to_csv(os.path.join(data_path, filename))
+        dump = partial(
+            self._dump_table, data_path=data_path, format=format, stream=stream, chunksize=chunksize, frames=frames
+        )
+
+        if max_workers is None or max_workers <= 1:
+            stats = [dump(name) for name in tables]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                stats = list(executor.map(dump, tables))
+
+        return pd.DataFrame(stats, columns=["table", "rows", "bytes", "seconds"]).set_index("table")
+
+    def _dump_table(self, name, data_path, format="csv", stream=False, chunksize=DEFAULT_CHUNKSIZE, frames=None):
+        """
+        Writes one of the OUTPUT_TABLES to data_path and returns its name, rows, file size and time taken.
+
+        If frames is given, the table is taken from it and removed from it once written.
+        """
+        start = time.perf_counter()
+
+        table, index_col = OUTPUT_TABLES[name]
+        path = os.path.join(data_path, name + FORMATS[format])
 
+        if stream:
+            chunks = self.data_manager_class.iter_table(table, index_col=index_col, chunksize=chunksize)
+            rows = TableWriter.write_chunks(chunks, path, format)
+        elif frames is not None:
+            rows = TableWriter.write(frames.pop(name), path, format)
+        else:
+            dataframe = self.data_manager_class.get_goblin_results_output_datatable(table, index_col=index_col)
+            rows = TableWriter.write(dataframe, path, format)
 
-    def get_climate_landuse_totals_time_series(self, baseline_year, target_year):
+        return name, rows, os.path.getsize(path), time.perf_counter() - start
+
+
+    def _collect(self, plan, n_jobs=None):
+        """
+        Collects a lazy plan, computing each db_instance in a separate worker process if n_jobs is greater than one, as
+        described in DataFetcher.
+        """
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+
+        if n_jobs is None or n_jobs <= 1:
+            return plan.collect()
+
+        # Imported here, as the partitions module builds on this one
+        from goblin_fetcher.partitions import PartitionedResults
+
+        # One PartitionedResults keeps its worker pool across calls, whatever n_jobs they ask for. It is created under a
+        # lock, so concurrent first calls from several threads share one pool.
+        with self._partitions_lock:
+            if self._partitions is None:
+                self._partitions = PartitionedResults(self, cache_bytes=None)
+
+        return self._partitions.collect(plan, max_workers=n_jobs)
+
+    def get_climate_landuse_totals_time_series(self, baseline_year, target_year, n_jobs=None):
         """
         Get the time series of climate totals.
 
         This method retrieves a dataframe that provides the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e, representing the cumulative greenhouse gas emissions over time.
 
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+            n_jobs (int, optional): The number of worker processes, as described in DataFetcher. Defaults to None.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e and provide insights into the temporal dynamics of greenhouse gas emissions across different scenarios.
@@ -1199,89 +1822,77 @@ class DataFetcher:
             Reported in kilotons.
 
         """
+        return self._collect(self.lazy().get_climate_landuse_totals_time_series(baseline_year, target_year), n_jobs)
 
-        scenario_df = self.get_scenario_inputs()
-        landcover_df = self.get_landuse_emissions_totals()
-
-        total_climate_change = TimeSeries.get_land_use_emissions_time_series(baseline_year, target_year, scenario_df, landcover_df)
-
-        return total_climate_change
-
-
-    def get_climate_livestock_totals_time_series(self,baseline_year, target_year):
+    def get_climate_livestock_totals_time_series(self, baseline_year, target_year, n_jobs=None):
         """
         Get the time series of climate totals.
         
         This method retrieves a dataframe that provides the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e, representing the cumulative greenhouse gas emissions over time.
 
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+            n_jobs (int, optional): The number of worker processes, as described in DataFetcher. Defaults to None.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e and provide insights into the temporal dynamics of greenhouse gas emissions across different scenarios.
         """
+        return self._collect(self.lazy().get_climate_livestock_totals_time_series(baseline_year, target_year), n_jobs)
 
-        scenario_df = self.get_scenario_inputs()
-        livestock_df = self.get_climate_change_animal_emissions_aggregated()
-
-        total_climate_change = TimeSeries.get_livestock_emissions_time_series(baseline_year, target_year, scenario_df, livestock_df)
-
-        return total_climate_change
-    
-
-    def get_climate_forest_totals_time_series(self, baseline_year, target_year):
+    def get_climate_forest_totals_time_series(self, baseline_year, target_year, n_jobs=None):
         """
         Get the time series of climate totals.
 
         This method retrieves a dataframe that provides the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e, representing the cumulative greenhouse gas emissions over time.
 
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+            n_jobs (int, optional): The number of worker processes, as described in DataFetcher. Defaults to None.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e and provide insights into the temporal dynamics of greenhouse gas emissions across different scenarios.
 
         """
-        scenario_df = self.get_scenario_inputs()
-        forest_df = self.get_forest_flux()
-
-        total_climate_change = TimeSeries.get_forest_carbon_time_series(baseline_year, target_year, scenario_df,forest_df)
-
-        return total_climate_change
-    
+        return self._collect(self.lazy().get_climate_forest_totals_time_series(baseline_year, target_year), n_jobs)
 
-    def get_climate_totals_time_series(self, baseline_year, target_year):
+    def get_climate_totals_time_series(self, baseline_year, target_year, n_jobs=None):
         """
         Get the time series of climate totals.
 
         This method retrieves a dataframe that provides the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e, representing the cumulative greenhouse gas emissions over time.
 
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+            n_jobs (int, optional): The number of worker processes, as described in DataFetcher. Defaults to None.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e and provide insights into the temporal dynamics of greenhouse gas emissions across different scenarios.
         """
+        return self._collect(self.lazy().get_climate_totals_time_series(baseline_year, target_year), n_jobs)
 
-        scenario_df = self.get_scenario_inputs()
-        livestock_df = self.get_climate_change_animal_emissions_aggregated()
-        landcover_df = self.get_landuse_emissions_totals()
-        forest_df = self.get_forest_flux()
-
-        total_climate_change = TimeSeries.total_climate_change_emissions_time_series(baseline_year, target_year, scenario_df, livestock_df, landcover_df, forest_df)
-
-        return total_climate_change
-    
-    def get_abated_climate_totals_time_series(self, baseline_year, target_year, rate, CH4=None, N2O=None):
+    def get_abated_climate_totals_time_series(self, baseline_year, target_year, rate, CH4=None, N2O=None, n_jobs=None):
         """
         Get the abated time series of climate totals.
 
         This method retrieves a dataframe that provides the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e, representing the cumulative greenhouse gas emissions over time.
 
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+            rate (float): The rate at which livestock emissions are abated.
+            CH4 (float): The GWP for CH4.
+            N2O (float): The GWP for N2O.
+            n_jobs (int, optional): The number of worker processes, as described in DataFetcher. Defaults to None.
+
         Returns:
             pandas.DataFrame:
                 A dataframe containing the time series of climate totals for each scenario and the baseline. The values are reported in kilotons of CO2e and provide insights into the temporal dynamics of greenhouse gas emissions across different scenarios.
         """
+        return self._collect(self.lazy().get_abated_climate_totals_time_series(baseline_year, target_year, rate, CH4, N2O), n_jobs)
 
-        scenario_df = self.get_scenario_inputs()
-        livestock_df = self.get_abated_climate_change_animal_emissions_aggregated(rate, CH4, N2O)
-        landcover_df = self.get_landuse_emissions_totals()
-        forest_df = self.get_forest_flux()
-
-        total_climate_change = TimeSeries.total_climate_change_emissions_time_series(baseline_year, target_year, scenario_df, livestock_df, landcover_df, forest_df)
-
-        return total_climate_change
\ No newline at end of file
@@ -0,0 +1,773 @@
+"""
+Lazy Data Fetcher Module
+========================
+This module contains deferred query plans over the DataFetcher output tables.
+
+LazyDataFetcher mirrors the DataFetcher getters, time series and abatement methods, but returns plans instead of
+DataFrames. A LazyTable reads one output table; a LazyPlan combines several tables, such as the inputs of a time series,
+and builds its result from them. Plans can be narrowed with filter, select and abate, and are only executed by collect,
+or together by collect_all.
+
+On collect the scenario, db_instance and year filters of a plan are pushed into the SQL of each table it reads, only the
+columns the plan uses are read, and the tables of every collected plan are read with one DataManager.get_many call, so
+each database is opened once and a table read by several plans with the same filters is read once.
+"""
+from goblin_fetcher.goblin_fetcher import OUTPUT_TABLES, LAND_USE_TIME_SERIES_ROWS
+from goblin_fetcher.resource_manager.database_manager import _as_tuple
+from goblin_fetcher.abatement import Abate
+from goblin_fetcher.time_series import TimeSeries
+from functools import partial
+
+# The abatement applied by LazyTable.abate to each table that supports it
+ABATEMENTS = {
+    "climate_change_animal_emissions_aggregated": Abate.climate_abate_livestock,
+    "eutrophication_emission_totals": Abate.eutrophication_air_quality_abate_livestock,
+    "air_quality_emissions_totals": Abate.eutrophication_air_quality_abate_livestock,
+}
+
+# Tables whose scenario is held in a 'Scenario' column, while their 'Scenarios' column is taken from the row index
+SCENARIO_COLUMN = {"forest_flux": "Scenario", "forest_aggregate": "Scenario"}
+
+BASELINE_SCENARIO = -1
+
+# Inputs of the time series and abated totals that must keep their baseline scenario rows
+BASELINE_INPUTS = ("livestock_df", "landuse_df", "landcover_df")
+
+# The input of the time series and abated totals whose scenarios are computed
+SCENARIO_INPUT = "scenario_df"
+
+FILTERS = ("columns", "scenarios", "years", "db_instances", "where")
+
+
+def _intersect(current, values):
+    """
+    Returns the values of a filter accepted by both current and values, in the order of current.
+    """
+    values = _as_tuple(values)
+    if current is None:
+        return list(values)
+
+    return [value for value in current if value in values]
+
+
+def _merge_filters(filters, columns=None, scenarios=None, years=None, db_instances=None, where=None):
+    """
+    Returns the filters narrowed by further filters. Each filter only ever removes rows or columns.
+    """
+    merged = dict(filters)
+
+    for name, values in (("columns", columns), ("scenarios", scenarios), ("years", years), ("db_instances", db_instances)):
+        if values is not None:
+            merged[name] = _intersect(merged.get(name), values)
+
+    if where:
+        merged_where = dict(merged.get("where") or {})
+        for column, values in where.items():
+            merged_where[column] = _intersect(
+                None if column not in merged_where else _as_tuple(merged_where[column]), values
+            )
+        merged["where"] = merged_where
+
+    return merged
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple, range)):
+        return tuple(value)
+    return value
+
+
+def _read_key(name, filters):
+    """
+    Returns a hashable key identifying the read of a table with the given filters.
+    """
+    return name, _freeze({filter: filters[filter] for filter in FILTERS if filters.get(filter) is not None})
+
+
+def collect_all(*plans):
+    """
+    Executes several plans at once.
+
+    The tables of all plans are read with a single DataManager.get_many call. A table read by several plans with the
+    same filters is read once, and each plan receives its own copy.
+
+    Parameters
+    ----------
+    *plans : LazyTable or LazyPlan
+        The plans to execute. They must share the same DataFetcher.
+
+    Returns
+    -------
+    list
+        The result of each plan, in order.
+    """
+    return [plan._build(tables) for plan, tables in zip(plans, _read_plans(plans))]
+
+
+def _read_plans(plans, cache=True, known=None):
+    """
+    Reads the tables of several plans with a single DataManager.get_many call, returning the input tables of each plan.
+
+    known maps the read keys of tables already read to their frames, which are copied rather than read again. If cache is
+    False, the tables read are not stored in the DataManager caches.
+    """
+    if not plans:
+        return []
+
+    fetcher = plans[0].fetcher
+    if any(plan.fetcher is not fetcher for plan in plans):
+        raise ValueError("Plans collected together must share the same DataFetcher.")
+
+    known = known or {}
+
+    keys = {}
+    queries = {}
+    for plan in plans:
+        for name, filters in plan._reads():
+            key = _read_key(name, filters)
+            if key not in keys and key not in known:
+                keys[key] = str(len(keys))
+                table, index_col = OUTPUT_TABLES[name]
+                queries[keys[key]] = {"table": table, "index_col": index_col, **filters}
+
+    frames = fetcher.data_manager_class.get_many(queries, cache=cache) if queries else {}
+
+    used = set()
+    results = []
+    for plan in plans:
+        tables = []
+        for name, filters in plan._reads():
+            if _read_key(name, filters) in known:
+                tables.append(known[_read_key(name, filters)].copy())
+                continue
+
+            key = keys[_read_key(name, filters)]
+            # Steps such as abatement modify their input, so a frame is handed out once and copied after that
+            tables.append(frames[key] if key not in used else frames[key].copy())
+            used.add(key)
+        results.append(tables)
+
+    return results
+
+
+def _build_table(steps, tables):
+    dataframe, = tables
+    for func, args, kwargs in steps:
+        dataframe = func(dataframe, *args, **kwargs)
+
+    return dataframe
+
+
+def _build_plan(build, steps, tables):
+    return build(**{role: _build_table(role_steps, [frame]) for (role, role_steps), frame in zip(steps, tables)})
+
+
+def _steps_key(steps):
+    return tuple((func, args, _freeze(kwargs)) for func, args, kwargs in steps)
+
+
+class LazyTable:
+    """
+    A deferred read of one of the OUTPUT_TABLES.
+
+    Filters are pushed into SQL when the plan is collected, and the steps added with abate or pipe are then applied to
+    the table in order. Each method returns a new plan, so plans can be shared and extended.
+
+    Attributes
+    ----------
+    fetcher : DataFetcher
+        The DataFetcher that executes the plan.
+
+    name : str
+        The name of the table in OUTPUT_TABLES.
+
+    filters : dict
+        The columns, scenarios, years, db_instances and where filters of the read.
+
+    Examples
+    --------
+        >>> plan = fetcher.lazy().get_climate_change_animal_emissions_aggregated().filter(scenarios=[-1, 0]).abate(0.3)
+        >>> abated = plan.collect()
+    """
+    def __init__(self, fetcher, name, filters=None, steps=()):
+        if name not in OUTPUT_TABLES:
+            raise ValueError(f"Unknown table '{name}', expected one of {list(OUTPUT_TABLES)}.")
+
+        self.fetcher = fetcher
+        self.name = name
+        self.filters = _merge_filters({}, **(filters or {}))
+        self._steps = tuple(steps)
+
+    def __repr__(self):
+        steps = "".join(f".{func.__name__}()" for func, _, _ in self._steps)
+        return f"LazyTable({self.name!r}, {self.filters!r}){steps}"
+
+    def filter(self, scenarios=None, db_instances=None, years=None, where=None):
+        """
+        Returns the plan with only the rows matching further filters, as for the DataFetcher getters.
+        """
+        filters = _merge_filters(self.filters, scenarios=scenarios, years=years, db_instances=db_instances, where=where)
+        return LazyTable(self.fetcher, self.name, filters, self._steps)
+
+    def select(self, columns):
+        """
+        Returns the plan reading only the given columns. 'Scenarios' and 'db_instance' are always included.
+        """
+        return LazyTable(self.fetcher, self.name, _merge_filters(self.filters, columns=columns), self._steps)
+
+    def abate(self, rate, *gwps):
+        """
+        Returns the plan with the abatement rate applied to the table, as by the DataFetcher get_abated_* methods.
+
+        The climate change livestock emissions also accept the CH4 and N2O GWPs after the rate.
+        """
+        if self.name not in ABATEMENTS:
+            raise ValueError(f"Table '{self.name}' cannot be abated, expected one of {list(ABATEMENTS)}.")
+
+        return self.pipe(ABATEMENTS[self.name], rate, *gwps)
+
+    def pipe(self, func, *args, **kwargs):
+        """
+        Returns the plan with func(table, *args, **kwargs) applied to the table after it is read.
+        """
+        return LazyTable(self.fetcher, self.name, self.filters, self._steps + ((func, args, kwargs),))
+
+    def collect(self):
+        """
+        Reads the table and applies the steps of the plan.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The table.
+        """
+        return collect_all(self)[0]
+
+    def _reads(self):
+        return [(self.name, self.filters)]
+
+    def _builder(self):
+        """
+        Returns a function building the result of the plan from its input tables, which can be sent to worker processes.
+        """
+        return partial(_build_table, self._steps)
+
+    def _build(self, tables):
+        return self._builder()(tables)
+
+    def _key(self):
+        """
+        Returns a hashable key identifying the plan, leaving out its db_instances filter.
+        """
+        filters = {name: value for name, value in self.filters.items() if name != "db_instances"}
+        return _read_key(self.name, filters), _steps_key(self._steps)
+
+    def _scenario_input(self):
+        """
+        Returns the LazyTable whose scenarios the plan is computed for, or None if the plan has none.
+        """
+        return None
+
+    def _partition(self, label):
+        """
+        Returns the plan computed for the single db_instance label.
+        """
+        return self.filter(db_instances=[label])
+
+
+class LazyPlan:
+    """
+    A deferred computation over several output tables, such as a time series.
+
+    The scenarios and db_instances filters of the plan are pushed into the read of every input table. The baseline
+    scenario is always kept in the emissions tables, as the time series are computed relative to it.
+
+    Attributes
+    ----------
+    fetcher : DataFetcher
+        The DataFetcher that executes the plan.
+
+    inputs : dict
+        The LazyTable read for each input of the plan.
+    """
+    def __init__(self, fetcher, inputs, build, baseline=()):
+        """
+        Initializes the LazyPlan.
+
+        Parameters
+        ----------
+        fetcher : DataFetcher
+            The DataFetcher that executes the plan.
+
+        inputs : dict
+            The LazyTable read for each input, keyed by the name of the keyword argument of build it is passed as. The
+            livestock emissions input is named 'livestock_df'.
+
+        build : callable
+            Builds the result from the input tables.
+
+        baseline : tuple of str, optional
+            The inputs whose baseline scenario rows are kept when filtering scenarios.
+        """
+        self.fetcher = fetcher
+        self.inputs = dict(inputs)
+        self._build_result = build
+        self._baseline = tuple(baseline)
+
+    def __repr__(self):
+        return f"LazyPlan({self._build_result!r}, {self.inputs!r})"
+
+    def filter(self, scenarios=None, db_instances=None):
+        """
+        Returns the plan computed for only the given scenarios and db_instances.
+        """
+        inputs = {}
+        for role, table in self.inputs.items():
+            if scenarios is not None:
+                values = list(_as_tuple(scenarios))
+                if role in self._baseline and BASELINE_SCENARIO not in values:
+                    values.append(BASELINE_SCENARIO)
+
+                if table.name in SCENARIO_COLUMN:
+                    table = table.filter(where={SCENARIO_COLUMN[table.name]: values})
+                else:
+                    table = table.filter(scenarios=values)
+
+            if db_instances is not None:
+                table = table.filter(db_instances=db_instances)
+
+            inputs[role] = table
+
+        return LazyPlan(self.fetcher, inputs, self._build_result, self._baseline)
+
+    def abate(self, rate, CH4=None, N2O=None):
+        """
+        Returns the plan computed from livestock emissions abated at the given rate and GWPs.
+        """
+        if "livestock_df" not in self.inputs:
+            raise ValueError("Only plans that read the livestock emissions can be abated.")
+
+        inputs = {**self.inputs, "livestock_df": self.inputs["livestock_df"].abate(rate, CH4, N2O)}
+        return LazyPlan(self.fetcher, inputs, self._build_result, self._baseline)
+
+    def collect(self):
+        """
+        Reads the input tables and builds the result of the plan.
+        """
+        return collect_all(self)[0]
+
+    def _reads(self):
+        return [read for table in self.inputs.values() for read in table._reads()]
+
+    def _builder(self):
+        """
+        Returns a function building the result of the plan from its input tables, which can be sent to worker processes.
+        """
+        return partial(_build_plan, self._build_result, tuple((role, table._steps) for role, table in self.inputs.items()))
+
+    def _build(self, tables):
+        return self._builder()(tables)
+
+    def _key(self):
+        """
+        Returns a hashable key identifying the plan, leaving out its db_instances filter.
+        """
+        build = self._build_result
+        if isinstance(build, partial):
+            build = (build.func, build.args, _freeze(build.keywords))
+
+        return build, tuple((role, table._key()) for role, table in self.inputs.items())
+
+    def _scenario_input(self):
+        """
+        Returns the LazyTable whose scenarios the plan is computed for, or None if the plan has none.
+        """
+        return self.inputs.get(SCENARIO_INPUT)
+
+    def _partition(self, label):
+        """
+        Returns the plan computed for the single db_instance label.
+
+        The scenario input keeps the filters of the whole plan, so every partition is computed for the same scenarios as
+        the whole plan and raises for the same missing rows.
+        """
+        inputs = {
+            role: table if role == SCENARIO_INPUT else table.filter(db_instances=[label])
+            for role, table in self.inputs.items()
+        }
+        return LazyPlan(self.fetcher, inputs, self._build_result, self._baseline)
+
+
+class LazyDataFetcher:
+    """
+    A view of a DataFetcher whose methods return plans rather than DataFrames.
+
+    Every table getter of DataFetcher returns a LazyTable with the same filters. The time series and abatement methods
+    return a LazyPlan or LazyTable, which collects to the same result as the DataFetcher method of the same name.
+
+    Attributes
+    ----------
+    fetcher : DataFetcher
+        The DataFetcher that executes the plans.
+    """
+    def __init__(self, fetcher):
+        self.fetcher = fetcher
+
+    def table(self, name, **filters):
+        """
+        Returns a plan reading one of the OUTPUT_TABLES, with optional columns, scenarios, years, db_instances and where
+        filters.
+        """
+        return LazyTable(self.fetcher, name, filters)
+
+    def get_scenario_inputs(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_scenario_inputs, with the same filters.
+        """
+        return self.table("scenario_inputs", **filters)
+
+    def get_stocking_rate_per_ha(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_stocking_rate_per_ha, with the same filters.
+        """
+        return self.table("stocking_rate_per_ha", **filters)
+
+    def get_grassland_spared_area_by_soil_group(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_grassland_spared_area_by_soil_group, with the same filters.
+        """
+        return self.table("grassland_spared_area_by_soil_group", **filters)
+
+    def get_crop_farm_input_applied(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_crop_farm_input_applied, with the same filters.
+        """
+        return self.table("crop_farm_input_applied", **filters)
+
+    def get_crop_national_inputs(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_crop_national_inputs, with the same filters.
+        """
+        return self.table("crop_catchment_inputs", **filters)
+
+    def get_transition_matrix(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_transition_matrix, with the same filters.
+        """
+        return self.table("transition_matrix", **filters)
+
+    def get_baseline_livestock_data(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_baseline_livestock_data, with the same filters.
+        """
+        return self.table("baseline_livestock_data", **filters)
+
+    def get_scenario_livestock_data(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_scenario_livestock_data, with the same filters.
+        """
+        return self.table("scenario_livestock_data", **filters)
+
+    def get_livestock_output_summary(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_livestock_output_summary, with the same filters.
+        """
+        return self.table("livestock_output_summary", **filters)
+
+    def get_grassland_scenario_farm_inputs(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_grassland_scenario_farm_inputs, with the same filters.
+        """
+        return self.table("grassland_scenario_farm_inputs", **filters)
+
+    def get_grassland_baseline_farm_inputs(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_grassland_baseline_farm_inputs, with the same filters.
+        """
+        return self.table("grassland_baseline_farm_inputs", **filters)
+
+    def get_total_grassland_area(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_total_grassland_area, with the same filters.
+        """
+        return self.table("total_grassland_area", **filters)
+
+    def get_total_spared_area(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_total_spared_area, with the same filters.
+        """
+        return self.table("total_spared_area", **filters)
+
+    def get_climate_change_animal_emissions_by_category(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_climate_change_animal_emissions_by_category, with the same filters.
+        """
+        return self.table("climate_change_animal_emissions_by_category", **filters)
+
+    def get_climate_change_crop_emissions_by_category(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_climate_change_crop_emissions_by_category, with the same filters.
+        """
+        return self.table("climate_change_crop_emissions_by_category", **filters)
+
+    def get_climate_change_crop_emissions_aggregated(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_climate_change_crop_emissions_aggregated, with the same filters.
+        """
+        return self.table("climate_change_crop_emissions_aggregated", **filters)
+
+    def get_climate_change_animal_emissions_aggregated(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_climate_change_animal_emissions_aggregated, with the same filters.
+        """
+        return self.table("climate_change_animal_emissions_aggregated", **filters)
+
+    def get_animal_emissions_by_category_co2e(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_animal_emissions_by_category_co2e, with the same filters.
+        """
+        return self.table("animal_emissions_by_category_co2e", **filters)
+
+    def get_crop_emissions_by_category_co2e(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_crop_emissions_by_category_co2e, with the same filters.
+        """
+        return self.table("crop_emissions_by_category_co2e", **filters)
+
+    def get_climate_change_emission_totals(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_climate_change_emission_totals, with the same filters.
+        """
+        return self.table("climate_change_emissions_totals", **filters)
+
+    def get_eutrophication_emission_totals(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_eutrophication_emission_totals, with the same filters.
+        """
+        return self.table("eutrophication_emission_totals", **filters)
+
+    def get_air_quality_emission_totals(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_air_quality_emission_totals, with the same filters.
+        """
+        return self.table("air_quality_emissions_totals", **filters)
+
+    def get_eutrophication_animal_emissions_by_category(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_eutrophication_animal_emissions_by_category, with the same filters.
+        """
+        return self.table("eutrophication_animal_emissions_by_category", **filters)
+
+    def get_eutrophication_crop_emissions_by_category(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_eutrophication_crop_emissions_by_category, with the same filters.
+        """
+        return self.table("eutrophication_crop_emissions_by_category", **filters)
+
+    def get_air_quality_animal_emissions_by_category(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_air_quality_animal_emissions_by_category, with the same filters.
+        """
+        return self.table("air_quality_animal_emissions", **filters)
+
+    def get_air_quality_crop_emissions_by_category(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_air_quality_crop_emissions_by_category, with the same filters.
+        """
+        return self.table("air_quality_crop_emissions", **filters)
+
+    def get_landuse_emissions_totals(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_landuse_emissions_totals, with the same filters.
+        """
+        return self.table("landuse_emissions_totals", **filters)
+
+    def get_forest_flux(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_forest_flux, with the same filters.
+        """
+        return self.table("forest_flux", **filters)
+
+    def get_forest_aggregate(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_forest_aggregate, with the same filters.
+        """
+        return self.table("forest_aggregate", **filters)
+
+    def get_total_afforested(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_total_afforested, with the same filters.
+        """
+        return self.table("total_afforested", **filters)
+
+    def get_landuse_areas(self, **filters):
+        """
+        Returns a plan reading the table of DataFetcher.get_landuse_areas, with the same filters.
+        """
+        return self.table("landuse_areas", **filters)
+
+    def get_abated_climate_change_animal_emissions_aggregated(self, rate, CH4=None, N2O=None):
+        """
+        Returns a plan computing DataFetcher.get_abated_climate_change_animal_emissions_aggregated.
+
+        Parameters:
+            rate (float): The abatement rate applied to the emissions.
+            CH4 (float): The abatement rate applied to CH4 emissions. If None, the default value is used.
+            N2O (float): The abatement rate applied to N2O emissions. If None, the default value is used.
+
+        Returns:
+            LazyPlan:
+                A plan whose collect returns the aggregated livestock greenhouse gas emissions after applying the abatement rates.
+        """
+        return self.table("climate_change_animal_emissions_aggregated").abate(rate, CH4, N2O)
+
+    def get_abated_eutrophication_emission_totals(self, rate):
+        """
+        Returns a plan computing DataFetcher.get_abated_eutrophication_emission_totals.
+
+        Parameters:
+            rate (float): The abatement rate applied to the emissions.
+
+        Returns:
+            LazyPlan:
+                A plan whose collect returns the total eutrophication emissions after applying the abatement rate.
+        """
+        return self.table("eutrophication_emission_totals").abate(rate)
+
+    def get_climate_landuse_totals_time_series(self, baseline_year, target_year):
+        """
+        Returns a plan computing DataFetcher.get_climate_landuse_totals_time_series.
+
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+
+        Returns:
+            LazyPlan:
+                A plan whose collect returns the time series of land use climate totals for each scenario and the baseline, in kilotons of CO2e.
+        """
+        return self._time_series(
+            TimeSeries.get_land_use_emissions_time_series, baseline_year, target_year, landuse_df=self._landuse()
+        )
+
+    def get_climate_livestock_totals_time_series(self, baseline_year, target_year):
+        """
+        Returns a plan computing DataFetcher.get_climate_livestock_totals_time_series.
+
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+
+        Returns:
+            LazyPlan:
+                A plan whose collect returns the time series of livestock climate totals for each scenario and the baseline, in kilotons of CO2e.
+        """
+        return self._time_series(
+            TimeSeries.get_livestock_emissions_time_series, baseline_year, target_year, livestock_df=self._livestock()
+        )
+
+    def get_climate_forest_totals_time_series(self, baseline_year, target_year):
+        """
+        Returns a plan computing DataFetcher.get_climate_forest_totals_time_series.
+
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+
+        Returns:
+            LazyPlan:
+                A plan whose collect returns the time series of forest climate totals for each scenario and the baseline, in kilotons of CO2e.
+        """
+        return self._time_series(
+            TimeSeries.get_forest_carbon_time_series,
+            baseline_year,
+            target_year,
+            forest_carbon_df=self._forest(),
+        )
+
+    def get_climate_totals_time_series(self, baseline_year, target_year):
+        """
+        Returns a plan computing DataFetcher.get_climate_totals_time_series.
+
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+
+        Returns:
+            LazyPlan:
+                A plan whose collect returns the time series of climate totals for each scenario and the baseline, in kilotons of CO2e.
+        """
+        return self._time_series(
+            TimeSeries.total_climate_change_emissions_time_series,
+            baseline_year,
+            target_year,
+            livestock_df=self._livestock(),
+            landuse_df=self._landuse(),
+            forest_carbon_df=self._forest(),
+        )
+
+    def get_abated_climate_totals_time_series(self, baseline_year, target_year, rate, CH4=None, N2O=None):
+        """
+        Returns a plan computing DataFetcher.get_abated_climate_totals_time_series.
+
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+            rate (float): The rate at which livestock emissions are abated.
+            CH4 (float): The GWP for CH4.
+            N2O (float): The GWP for N2O.
+
+        Returns:
+            LazyPlan:
+                A plan whose collect returns the time series of abated climate totals for each scenario and the baseline, in kilotons of CO2e.
+        """
+        return self.get_climate_totals_time_series(baseline_year, target_year).abate(rate, CH4, N2O)
+
+    def get_abated_climate_change_emissions_totals(self, baseline_year, target_year, rate, CH4=None, N2O=None):
+        """
+        Returns a plan computing DataFetcher.get_abated_climate_change_emissions_totals.
+
+        Parameters:
+            baseline_year (int): The year for which calibration data is available.
+            target_year (int): The year for which scenario ends.
+            rate (float): The rate at which livestock emissions are abated.
+            CH4 (float): The GWP for CH4.
+            N2O (float): The GWP for N2O.
+
+        Returns:
+            LazyPlan:
+                A plan whose collect returns the abated climate change emissions totals for each instance and scenario.
+        """
+        build = partial(Abate.climate_total_abated, baseline_year, target_year, rate=rate, CH4=CH4, N2O=N2O)
+        inputs = {
+            SCENARIO_INPUT: self._scenarios(),
+            "livestock_df": self._livestock(),
+            "landcover_df": self.table(
+                "landuse_emissions_totals", years=[baseline_year, target_year], where={"land_use": "total"}
+            ),
+        }
+
+        return LazyPlan(self.fetcher, inputs, build, baseline=BASELINE_INPUTS)
+
+    def _time_series(self, method, baseline_year, target_year, **tables):
+        inputs = {SCENARIO_INPUT: self._scenarios(), **tables}
+        return LazyPlan(
+            self.fetcher, inputs, partial(method, baseline_year, target_year), baseline=BASELINE_INPUTS
+        )
+
+    def _scenarios(self):
+        return self.table("scenario_inputs", columns=["Scenarios"])
+
+    def _livestock(self):
+        return self.table("climate_change_animal_emissions_aggregated")
+
+    # The time series take their instances from the land use and forest tables, so their years are not pushed into the
+    # SQL: an instance with no rows in the selected years must still be read, to raise or to give its missing values
+    def _landuse(self):
+        return self.table("landuse_emissions_totals", where={"land_use": LAND_USE_TIME_SERIES_ROWS})
+
+    def _forest(self):
+        return self.table("forest_flux", columns=["Scenario", "Year", "Total Ecosystem"])
+
@@ -0,0 +1,606 @@
+"""
+Partitions Module
+=================
+This module contains the PartitionedResults class, which computes the time series, abatement and other derived results
+of lazy plans separately for each db_instance and memoises each partition.
+
+Every derived result is independent per db_instance, so a plan is computed once per instance from the rows of that
+instance alone, and the partitions are combined into the same result as computing the plan over all instances. The
+scenarios are read once for the whole plan and every partition is computed for all of them, so a partition missing rows
+raises as the whole plan would. Each partition is memoised under the plan, its scenarios and the fingerprint of its
+instance database, so asking again, asking for a subset of the instances, or changing one instance database only
+computes the partitions that are missing or stale. The shards read for a partition are not stored in the DataManager
+caches.
+The partitions can be computed concurrently in a process pool. The input tables of each partition are sent to the
+worker processes as SharedTables, in memory-mapped Arrow IPC files when pyarrow is installed and in shared memory
+otherwise, rather than as pickled DataFrames. Starting the workers and publishing the tables costs more than it saves
+for small inputs, so partitions whose input tables total less than MIN_PARALLEL_BYTES are computed in this process.
+"""
+from goblin_fetcher.lazy import LazyDataFetcher, _read_plans, _read_key
+from goblin_fetcher.time_series import _reindex_rows
+from goblin_fetcher.resource_manager.database_manager import DEFAULT_CACHE_BYTES, _as_tuple
+from goblin_fetcher.resource_manager.table_cache import TableCache, database_fingerprint
+from goblin_fetcher.resource_manager.dtypes import concat_frames
+from goblin_fetcher.resource_manager.shared_tables import SharedTable
+from goblin_fetcher.resource_manager.optional import has_pyarrow
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import pandas as pd
+import threading
+
+# The total size of the input tables below which partitions are computed in this process rather than in the workers
+MIN_PARALLEL_BYTES = 64 * 1024 ** 2
+
+
+def _build_shared_partition(builder, handles):
+    """
+    Builds a partition from the handles of its shared input tables. The tables are copied, as the steps of a plan may
+    modify them.
+    """
+    return builder([handle.open(copy=True) for handle in handles])
+
+
+def _map_bounded(executor, function, arguments, limit):
+    """
+    Calls function with each tuple of arguments on the executor, with at most limit calls running at once, and returns
+    the results in order.
+    """
+    results = [None] * len(arguments)
+    running = {}
+
+    try:
+        for position, call_arguments in enumerate(arguments):
+            if len(running) >= limit:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+
+            running[executor.submit(function, *call_arguments)] = position
+
+        for future, position in running.items():
+            results[position] = future.result()
+    finally:
+        for future in running:
+            future.cancel()
+
+    return results
+
+
+def combine_partitions(frames):
+    """
+    Combines the per-instance partitions of a result into the result computed over all instances.
+
+    Results indexed by scenario and instance, such as the time series, are reordered scenario first, as when computed
+    over all instances. Other results are concatenated in instance order.
+
+    Parameters
+    ----------
+    frames : list of pandas.DataFrame
+        The partition of each instance, in instance order.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The combined result.
+
+    Raises
+    ------
+    ValueError
+        If a scenario and instance combination has no rows, rather than filling it with missing values.
+    """
+    index = frames[0].index
+
+    if isinstance(index, pd.MultiIndex) and list(index.names[:2]) == ["scenario", "instance"]:
+        combined = pd.concat(frames)
+        levels = [combined.index.get_level_values(level).unique() for level in range(combined.index.nlevels)]
+        return _reindex_rows(combined, pd.MultiIndex.from_product(levels, names=combined.index.names), "partition")
+
+    return concat_frames(frames)
+
+
+class PartitionedResults:
+    """
+    A memoising executor of lazy plans that computes each db_instance as a separate partition.
+
+    The table getters, time series and abatement methods of LazyDataFetcher are available with the same arguments, and
+    return the same DataFrames as the DataFetcher methods of the same name.
+
+    Attributes
+    ----------
+    fetcher : DataFetcher
+        The DataFetcher that reads the input tables.
+
+    max_workers : int or None
+        The number of partitions computed at once in worker processes. None computes them one after another. The input
+        tables are sent to the workers as SharedTables. It can be overridden for a single computation with the
+        max_workers argument of collect and collect_all; the worker pool is kept and only grown when more workers are
+        needed.
+
+    min_parallel_bytes : int or None
+        The total size of the input tables below which partitions are computed in this process. None uses
+        MIN_PARALLEL_BYTES.
+
+    cache : TableCache or None
+        The memoised partitions, keyed by plan and db_instance and checked against the fingerprint of the instance
+        database.
+
+    Examples
+    --------
+        >>> partitioned = PartitionedResults(fetcher, max_workers=4)
+        >>> totals = partitioned.get_climate_totals_time_series(2020, 2050)
+        >>> subset = partitioned.collect(fetcher.lazy().get_climate_totals_time_series(2020, 2050).filter(db_instances=["instance_1"]))
+    """
+    def __init__(self, fetcher, max_workers=None, cache_bytes=DEFAULT_CACHE_BYTES, min_parallel_bytes=None):
+        """
+        Initializes the PartitionedResults.
+
+        Parameters
+        ----------
+        fetcher : DataFetcher
+            The DataFetcher that reads the input tables.
+
+        max_workers : int, optional
+            The number of worker processes computing partitions. Defaults to None, which computes them one after another
+            in this process.
+
+        cache_bytes : int, optional
+            The memory budget in bytes of the memoised partitions. Defaults to 512 MiB. None or 0 disables memoisation.
+
+        min_parallel_bytes : int, optional
+            The total size of the input tables below which partitions are computed in this process, as the workers would
+            be slower. Defaults to None, which uses the value of MIN_PARALLEL_BYTES at the time of each computation.
+        """
+        self.fetcher = fetcher
+        self.max_workers = max_workers
+        self.min_parallel_bytes = min_parallel_bytes
+        self.cache = TableCache(cache_bytes) if cache_bytes else None
+        self._lazy = LazyDataFetcher(fetcher)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._pool_size = 0
+        # The number of computations using each worker pool, so a pool replaced by a larger one is only shut down once
+        # the computations still submitting to it have finished
+        self._executor_users = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the worker processes. They are started again on the next computation.
+
+        A computation still running in another thread keeps its pool until it finishes.
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                if not self._executor_users.get(self._executor):
+                    self._executor.shutdown()
+                self._executor = None
+                self._pool_size = 0
+
+    def clear_cache(self):
+        """
+        Removes all memoised partitions.
+        """
+        if self.cache is not None:
+            self.cache.clear()
+
+    def collect(self, plan, max_workers=None):
+        """
+        Computes a plan partition by partition.
+
+        Parameters
+        ----------
+        plan : LazyTable or LazyPlan
+            The plan to compute, such as one returned by DataFetcher.lazy().
+
+        max_workers : int, optional
+            The number of partitions computed at once for this call. Defaults to None, which uses the max_workers
+            attribute.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The result of the plan, as returned by plan.collect().
+        """
+        return self.collect_all(plan, max_workers=max_workers)[0]
+
+    def collect_all(self, *plans, max_workers=None):
+        """
+        Computes several plans partition by partition.
+
+        The partitions missing from the memo are computed together: their input tables are read with a single
+        DataManager.get_many call, and the partitions are then built in the worker processes.
+
+        Parameters
+        ----------
+        *plans : LazyTable or LazyPlan
+            The plans to compute. They must share the DataFetcher of the PartitionedResults.
+
+        max_workers : int, optional
+            The number of partitions computed at once for this call. Defaults to None, which uses the max_workers
+            attribute.
+
+        Returns
+        -------
+        list of pandas.DataFrame
+            The result of each plan, in order.
+        """
+        if any(plan.fetcher is not self.fetcher for plan in plans):
+            raise ValueError("Plans must share the DataFetcher of the PartitionedResults.")
+
+        scenarios = self._read_scenarios(plans)
+        partitions = [self._partitions(plan, scenarios) for plan in plans]
+
+        results = {}
+        missing = []
+        for plan, plan_partitions in zip(plans, partitions):
+            for key, fingerprint, label in plan_partitions:
+                if key in results:
+                    continue
+
+                results[key] = None if self.cache is None else self.cache.get(key, fingerprint)
+                if results[key] is None:
+                    missing.append((key, fingerprint, plan._partition(label)))
+
+        if missing:
+            partition_plans = [partition_plan for _, _, partition_plan in missing]
+            built = self._map(
+                [partition_plan._builder() for partition_plan in partition_plans],
+                _read_plans(partition_plans, cache=False, known=scenarios),
+                self.max_workers if max_workers is None else max_workers,
+            )
+
+            for (key, fingerprint, _), frame in zip(missing, built):
+                if self.cache is not None:
+                    self.cache.put(key, fingerprint, frame)
+                results[key] = frame
+
+        combined = []
+        for plan, plan_partitions in zip(plans, partitions):
+            if not plan_partitions:
+                combined.append(plan.collect())
+            else:
+                # Partitions are shared between plans and with the memo, so each result combines copies
+                combined.append(combine_partitions([results[key].copy() for key, _, _ in plan_partitions]))
+
+        return combined
+
+    def get_scenario_inputs(self, **filters):
+        """
+        Computes DataFetcher.get_scenario_inputs partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_scenario_inputs(**filters))
+
+    def get_stocking_rate_per_ha(self, **filters):
+        """
+        Computes DataFetcher.get_stocking_rate_per_ha partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_stocking_rate_per_ha(**filters))
+
+    def get_grassland_spared_area_by_soil_group(self, **filters):
+        """
+        Computes DataFetcher.get_grassland_spared_area_by_soil_group partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_grassland_spared_area_by_soil_group(**filters))
+
+    def get_crop_farm_input_applied(self, **filters):
+        """
+        Computes DataFetcher.get_crop_farm_input_applied partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_crop_farm_input_applied(**filters))
+
+    def get_crop_national_inputs(self, **filters):
+        """
+        Computes DataFetcher.get_crop_national_inputs partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_crop_national_inputs(**filters))
+
+    def get_transition_matrix(self, **filters):
+        """
+        Computes DataFetcher.get_transition_matrix partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_transition_matrix(**filters))
+
+    def get_baseline_livestock_data(self, **filters):
+        """
+        Computes DataFetcher.get_baseline_livestock_data partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_baseline_livestock_data(**filters))
+
+    def get_scenario_livestock_data(self, **filters):
+        """
+        Computes DataFetcher.get_scenario_livestock_data partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_scenario_livestock_data(**filters))
+
+    def get_livestock_output_summary(self, **filters):
+        """
+        Computes DataFetcher.get_livestock_output_summary partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_livestock_output_summary(**filters))
+
+    def get_grassland_scenario_farm_inputs(self, **filters):
+        """
+        Computes DataFetcher.get_grassland_scenario_farm_inputs partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_grassland_scenario_farm_inputs(**filters))
+
+    def get_grassland_baseline_farm_inputs(self, **filters):
+        """
+        Computes DataFetcher.get_grassland_baseline_farm_inputs partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_grassland_baseline_farm_inputs(**filters))
+
+    def get_total_grassland_area(self, **filters):
+        """
+        Computes DataFetcher.get_total_grassland_area partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_total_grassland_area(**filters))
+
+    def get_total_spared_area(self, **filters):
+        """
+        Computes DataFetcher.get_total_spared_area partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_total_spared_area(**filters))
+
+    def get_climate_change_animal_emissions_by_category(self, **filters):
+        """
+        Computes DataFetcher.get_climate_change_animal_emissions_by_category partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_change_animal_emissions_by_category(**filters))
+
+    def get_climate_change_crop_emissions_by_category(self, **filters):
+        """
+        Computes DataFetcher.get_climate_change_crop_emissions_by_category partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_change_crop_emissions_by_category(**filters))
+
+    def get_climate_change_crop_emissions_aggregated(self, **filters):
+        """
+        Computes DataFetcher.get_climate_change_crop_emissions_aggregated partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_change_crop_emissions_aggregated(**filters))
+
+    def get_climate_change_animal_emissions_aggregated(self, **filters):
+        """
+        Computes DataFetcher.get_climate_change_animal_emissions_aggregated partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_change_animal_emissions_aggregated(**filters))
+
+    def get_animal_emissions_by_category_co2e(self, **filters):
+        """
+        Computes DataFetcher.get_animal_emissions_by_category_co2e partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_animal_emissions_by_category_co2e(**filters))
+
+    def get_crop_emissions_by_category_co2e(self, **filters):
+        """
+        Computes DataFetcher.get_crop_emissions_by_category_co2e partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_crop_emissions_by_category_co2e(**filters))
+
+    def get_climate_change_emission_totals(self, **filters):
+        """
+        Computes DataFetcher.get_climate_change_emission_totals partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_change_emission_totals(**filters))
+
+    def get_eutrophication_emission_totals(self, **filters):
+        """
+        Computes DataFetcher.get_eutrophication_emission_totals partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_eutrophication_emission_totals(**filters))
+
+    def get_air_quality_emission_totals(self, **filters):
+        """
+        Computes DataFetcher.get_air_quality_emission_totals partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_air_quality_emission_totals(**filters))
+
+    def get_eutrophication_animal_emissions_by_category(self, **filters):
+        """
+        Computes DataFetcher.get_eutrophication_animal_emissions_by_category partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_eutrophication_animal_emissions_by_category(**filters))
+
+    def get_eutrophication_crop_emissions_by_category(self, **filters):
+        """
+        Computes DataFetcher.get_eutrophication_crop_emissions_by_category partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_eutrophication_crop_emissions_by_category(**filters))
+
+    def get_air_quality_animal_emissions_by_category(self, **filters):
+        """
+        Computes DataFetcher.get_air_quality_animal_emissions_by_category partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_air_quality_animal_emissions_by_category(**filters))
+
+    def get_air_quality_crop_emissions_by_category(self, **filters):
+        """
+        Computes DataFetcher.get_air_quality_crop_emissions_by_category partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_air_quality_crop_emissions_by_category(**filters))
+
+    def get_landuse_emissions_totals(self, **filters):
+        """
+        Computes DataFetcher.get_landuse_emissions_totals partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_landuse_emissions_totals(**filters))
+
+    def get_forest_flux(self, **filters):
+        """
+        Computes DataFetcher.get_forest_flux partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_forest_flux(**filters))
+
+    def get_forest_aggregate(self, **filters):
+        """
+        Computes DataFetcher.get_forest_aggregate partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_forest_aggregate(**filters))
+
+    def get_total_afforested(self, **filters):
+        """
+        Computes DataFetcher.get_total_afforested partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_total_afforested(**filters))
+
+    def get_landuse_areas(self, **filters):
+        """
+        Computes DataFetcher.get_landuse_areas partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_landuse_areas(**filters))
+
+    def get_abated_climate_change_animal_emissions_aggregated(self, rate, CH4=None, N2O=None):
+        """
+        Computes DataFetcher.get_abated_climate_change_animal_emissions_aggregated partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_abated_climate_change_animal_emissions_aggregated(rate, CH4, N2O))
+
+    def get_abated_eutrophication_emission_totals(self, rate):
+        """
+        Computes DataFetcher.get_abated_eutrophication_emission_totals partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_abated_eutrophication_emission_totals(rate))
+
+    def get_climate_landuse_totals_time_series(self, baseline_year, target_year):
+        """
+        Computes DataFetcher.get_climate_landuse_totals_time_series partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_landuse_totals_time_series(baseline_year, target_year))
+
+    def get_climate_livestock_totals_time_series(self, baseline_year, target_year):
+        """
+        Computes DataFetcher.get_climate_livestock_totals_time_series partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_livestock_totals_time_series(baseline_year, target_year))
+
+    def get_climate_forest_totals_time_series(self, baseline_year, target_year):
+        """
+        Computes DataFetcher.get_climate_forest_totals_time_series partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_forest_totals_time_series(baseline_year, target_year))
+
+    def get_climate_totals_time_series(self, baseline_year, target_year):
+        """
+        Computes DataFetcher.get_climate_totals_time_series partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_climate_totals_time_series(baseline_year, target_year))
+
+    def get_abated_climate_totals_time_series(self, baseline_year, target_year, rate, CH4=None, N2O=None):
+        """
+        Computes DataFetcher.get_abated_climate_totals_time_series partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_abated_climate_totals_time_series(baseline_year, target_year, rate, CH4, N2O))
+
+    def get_abated_climate_change_emissions_totals(self, baseline_year, target_year, rate, CH4=None, N2O=None):
+        """
+        Computes DataFetcher.get_abated_climate_change_emissions_totals partition by partition, with the same arguments.
+        """
+        return self.collect(self._lazy.get_abated_climate_change_emissions_totals(baseline_year, target_year, rate, CH4, N2O))
+
+    def _read_scenarios(self, plans):
+        """
+        Reads the scenario input of each plan once, for all of its partitions, and returns the frames by read key.
+        """
+        tables = [plan._scenario_input() for plan in plans if plan._scenario_input() is not None]
+
+        return {
+            _read_key(table.name, table.filters): frame for table, (frame,) in zip(tables, _read_plans(tables))
+        }
+
+    def _partitions(self, plan, scenarios):
+        """
+        Returns the memo key, fingerprint and db_instance label of each partition of a plan, in instance order.
+
+        The key holds the scenarios of the plan, read into scenarios, as every partition is computed for all of them.
+        """
+        data_manager = self.fetcher.data_manager_class
+
+        labels = list(data_manager.instances)
+        for _, filters in plan._reads():
+            if filters.get("db_instances") is not None:
+                selected = set(_as_tuple(filters["db_instances"]))
+                labels = [label for label in labels if label in selected]
+
+        plan_key = plan._key()
+
+        table = plan._scenario_input()
+        if table is not None:
+            plan_key = plan_key, tuple(scenarios[_read_key(table.name, table.filters)]["Scenarios"].unique())
+
+        return [
+            ((plan_key, label), database_fingerprint(data_manager.select_paths([label])), label) for label in labels
+        ]
+
+    def _acquire_executor(self, max_workers):
+        """
+        Returns the worker pool for a computation, creating it on first use or growing it when more than its workers are
+        needed. Each call must be matched by a call to _release_executor.
+
+        The pool is replaced under a lock, so concurrent calls from several threads share one pool. A pool replaced by a
+        larger one is kept until the computations using it have released it.
+        """
+        with self._executor_lock:
+            if self._pool_size < max_workers:
+                # A smaller max_workers keeps the pool and limits the calls running at once instead
+                retired = self._executor
+                self._executor = ProcessPoolExecutor(max_workers=max_workers)
+                self._pool_size = max_workers
+
+                if retired is not None and not self._executor_users.get(retired):
+                    retired.shutdown()
+
+            self._executor_users[self._executor] = self._executor_users.get(self._executor, 0) + 1
+            return self._executor
+
+    def _release_executor(self, executor):
+        """
+        Releases a worker pool returned by _acquire_executor, shutting it down if it has been replaced or closed and no
+        other computation is using it.
+        """
+        with self._executor_lock:
+            self._executor_users[executor] -= 1
+            if not self._executor_users[executor]:
+                del self._executor_users[executor]
+                if executor is not self._executor:
+                    executor.shutdown()
+
+    def _map(self, builders, tables, max_workers=None):
+        """
+        Builds each partition from its input tables, in max_workers worker processes if it is greater than one and the
+        tables are large enough to be worth sending.
+        """
+        nbytes = sum(
+            int(table.memory_usage(index=True).sum()) for partition_tables in tables for table in partition_tables
+        )
+
+        min_parallel_bytes = MIN_PARALLEL_BYTES if self.min_parallel_bytes is None else self.min_parallel_bytes
+
+        if max_workers is None or max_workers <= 1 or len(builders) <= 1 or nbytes < min_parallel_bytes:
+            return [builder(partition_tables) for builder, partition_tables in zip(builders, tables)]
+
+        transport = "arrow" if has_pyarrow() else "shared_memory"
+
+        shared = []
+        try:
+            for partition_tables in tables:
+                shared.append([])
+                for table in partition_tables:
+                    shared[-1].append(SharedTable(table, transport))
+
+            handles = [[table.handle for table in partition_tables] for partition_tables in shared]
+
+            executor = self._acquire_executor(max_workers)
+            try:
+                return _map_bounded(executor, _build_shared_partition, list(zip(builders, handles)), max_workers)
+            finally:
+                self._release_executor(executor)
+        finally:
+            for partition_tables in shared:
+                for table in partition_tables:
+                    table.close()
+
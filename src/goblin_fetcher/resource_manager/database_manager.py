@@ -1,137 +1,1471 @@
-"""
-Database Manager
-================
-
-This module contains the DataManager class, which is responsible for managing the database
-for the GOBLIN LCA framework. The DataManager class is responsible for retrieving data from the database.
-"""
-import sqlalchemy as sqa
-import pandas as pd
-import os
-import re
-
-
-class DataManager:
-    """
-    Manages the GOBLIN LCA database.
-
-    This class is responsible for managing the database for the GOBLIN LCA framework. It is responsible for creating,
-    clearing, and saving data to the database. It also retrieves data from the database.
-
-    Attributes
-    ----------
-    database_dir : str
-        The directory where the database is stored.
-
-    engine : sqlalchemy.engine.base.Engine
-
-    Methods
-    -------
-    data_engine_creater()
-        Creates the database engine.
-
-    create_or_clear_database()
-        Creates or clears the database.
-
-    prepare_scenarios_column(df)
-        Ensures there is a column named 'Scenarios'.
-
-    get_goblin_results_output_datatable(table, index_col=None)
-        Retrieves a DataFrame from the database.
- 
-    """
-
-    def __init__(self, external_database_paths):
-        """
-        Initializes the DataManager.
-
-        Parameters
-        ----------
-        external_database_path : list of str,
-            list of paths to the external databases
-        """
-
-        self.database_paths = external_database_paths
-
-
-    def data_engine_creator(self, path):
-        """
-        Checks if the database file exists and creates the engine if it does.
-        Informs the user if the database file does not exist.
-
-        Returns
-        -------
-        sqlalchemy.engine.base.Engine or None
-            The database engine if the file exists, None otherwise.
-        """
-        database_dir = os.path.dirname(path)
-        database_name = os.path.basename(path)
-        try:
-            # Construct the full path to the database file
-            database_path = os.path.abspath(os.path.join(database_dir, database_name))
-            
-            # Check if the database file exists
-            if not os.path.isfile(database_path):
-                raise FileNotFoundError(f"Database file '{database_path}' not found.")
-
-            # Create the engine URL and the engine itself
-            engine_url = f"sqlite:///{database_path}"
-            engine = sqa.create_engine(engine_url)
-            return engine
-        except Exception as e:
-            # Inform the user of the problem
-            print(f"An error occurred: {e}")
-            return None
-
-
-    def prepare_scenarios_column(self, df):
-        """
-        Ensures there is a column named 'Scenarios'. If 'scenario' or 'scenarios' exist,
-        it renames them. If 'farm_id' exists, uses it for 'Scenarios'; otherwise, it uses the DataFrame index.
-        """
-        if 'Scenarios' not in df.columns:
-            if 'scenario' in df.columns:
-                df.rename(columns={'scenario': 'Scenarios'}, inplace=True)
-            elif 'scenarios' in df.columns:
-                df.rename(columns={'scenarios': 'Scenarios'}, inplace=True)
-            else:
-                # Check for 'farm_id' to use as 'Scenarios' or default to index
-                if 'farm_id' in df.columns:
-                    df['Scenarios'] = df['farm_id']
-                else:
-                    df['Scenarios'] = df.index
-        
-        return df
-
-
-    def get_goblin_results_output_datatable(self, table, index_col=None):
-        """
-        Retrieves a DataFrame from the database.
-
-        This method retrieves a DataFrame from the database.
-
-        Parameters
-        ----------
-        table : str
-            The name of the table to retrieve the DataFrame from.
-
-        index_col : str, optional
-            The column to use as the index. Defaults to None.
-
-        Returns
-        -------
-        pandas.DataFrame
-            The DataFrame retrieved from the database.
-        """
-        concatenated_data = pd.DataFrame()
-        for path in self.database_paths:
-            self.engine = self.data_engine_creator(path)
-            if self.engine is not None:
-                
-                dataframe = pd.read_sql("SELECT * FROM '%s'" % table, self.engine, index_col)
-                dataframe= self.prepare_scenarios_column(dataframe)
-                dataframe["db_instance"] = re.sub(r'\..*$', '', os.path.basename(path)) 
-                concatenated_data = pd.concat([concatenated_data, dataframe], ignore_index=True)
-                self.engine.dispose()
-
-        return concatenated_data
+"""
+Database Manager
+================
+
+This module contains the DataManager class, which is responsible for managing the database
+for the GOBLIN LCA framework. The DataManager class is responsible for retrieving data from the database.
+"""
+from goblin_fetcher.resource_manager.table_cache import TableCache, database_fingerprint
+from goblin_fetcher.resource_manager.disk_cache import DiskCache
+from goblin_fetcher.resource_manager.dtypes import check_policy, compact_frame, concat_frames
+import sqlalchemy as sqa
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from urllib.request import pathname2url
+import threading
+import sqlite3
+import os
+import re
+
+BACKENDS = ("thread", "process")
+
+DEFAULT_CACHE_BYTES = 512 * 1024 ** 2
+DEFAULT_CHUNKSIZE = 50_000
+
+# Columns that prepare_scenarios_column turns into 'Scenarios', in order of preference
+SCENARIO_COLUMNS = ("Scenarios", "scenario", "scenarios", "farm_id")
+
+YEAR_COLUMNS = ("year", "Year")
+
+# The manifest table of a warehouse database built by warehouse.consolidate
+MANIFEST_TABLE = "goblin_instances"
+
+# SQLite's compile-time default for SQLITE_MAX_ATTACHED, used when the limit cannot be queried
+DEFAULT_ATTACH_LIMIT = 10
+
+# PRAGMA statements run on every new connection. The instance databases are scanned whole, so they are memory-mapped and
+# given a larger page cache, and temporary sort structures are kept in memory.
+DEFAULT_PRAGMAS = {
+    "mmap_size": 256 * 1024 ** 2,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# PRAGMA statements that apply to each attached database separately
+SCHEMA_PRAGMAS = ("mmap_size", "cache_size")
+
+# DataManager used by process pool workers, created once per worker process so engines are reused across tasks
+_worker_data_manager = None
+
+
+def _init_worker(read_only=True, pragmas=None, dtypes=None):
+    """
+    Creates the DataManager of a process pool worker with the connection and dtype settings of the parent DataManager.
+    """
+    global _worker_data_manager
+    _worker_data_manager = DataManager([], cache_bytes=None, read_only=read_only, pragmas=pragmas, dtypes=dtypes)
+
+
+def _read_instance_table_in_worker(path, table, index_col=None, **query):
+    """
+    Reads a table from a single instance database inside a process pool worker.
+    """
+    return _worker_data_manager.read_instance_table(path, table, index_col, **query)
+
+
+def _read_instance_tables_in_worker(path, queries):
+    """
+    Reads several tables from a single instance database inside a process pool worker.
+    """
+    return _worker_data_manager.read_instance_tables(path, queries)
+
+
+def database_uri(path, read_only=True, immutable=True):
+    """
+    Returns the SQLite URI of a database file, opened read-only and, if immutable, without any locking or change detection.
+    """
+    uri = "file:%s" % pathname2url(os.path.abspath(path))
+    if read_only:
+        uri += "?mode=ro&immutable=1" if immutable else "?mode=ro"
+    return uri
+
+
+def apply_pragmas(connection, pragmas, schema=None):
+    """
+    Runs the PRAGMA statements on a sqlite3 connection, for the attached database schema if given.
+    """
+    for name, value in (pragmas or {}).items():
+        if schema is None:
+            connection.execute("PRAGMA %s = %s" % (name, value))
+        elif name in SCHEMA_PRAGMAS:
+            connection.execute("PRAGMA %s.%s = %s" % (_quote(schema), name, value))
+
+
+def instance_label(path):
+    """
+    Returns the db_instance label of a database path, which is its file name without extensions.
+    """
+    return re.sub(r'\..*$', '', os.path.basename(path))
+
+
+def _quote(identifier):
+    return '"%s"' % identifier.replace('"', '""')
+
+
+def _qualify(table, schema=None):
+    """
+    Returns the quoted table name, prefixed with the quoted schema of an attached database if given.
+    """
+    return _quote(table) if schema is None else "%s.%s" % (_quote(schema), _quote(table))
+
+
+def _attach_limit(connection):
+    """
+    Returns the number of databases that can be attached to a sqlite3 connection.
+    """
+    try:
+        return connection.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    except AttributeError:
+        return DEFAULT_ATTACH_LIMIT
+
+
+def _as_tuple(values):
+    """
+    Returns filter values as a tuple, wrapping a single value.
+    """
+    if isinstance(values, (str, bytes)) or not hasattr(values, "__iter__"):
+        return (values,)
+    return tuple(values)
+
+
+class DataManager:
+    """
+    Manages the GOBLIN LCA database.
+
+    This class is responsible for managing the database for the GOBLIN LCA framework. It is responsible for creating,
+    clearing, and saving data to the database. It also retrieves data from the database.
+
+    Attributes
+    ----------
+    database_paths : list of str
+        The paths to the external databases.
+
+    instances : dict
+        The path of each db_instance label.
+
+    max_workers : int or None
+        The number of workers used to read the databases concurrently. None or 1 reads them one after another.
+
+    backend : str
+        The executor used for concurrent reads, either "thread" or "process".
+
+    cache : TableCache or None
+        The in-memory cache of retrieved tables, or None if caching is disabled.
+
+    disk_cache : DiskCache or None
+        The on-disk cache of retrieved tables, or None if no cache directory was given.
+
+    attach : bool
+        Whether tables are read by attaching the databases to a single SQLite connection and combining them with UNION ALL.
+
+    warehouse : str or None
+        The path of the warehouse database read instead of instance databases, or None.
+
+    read_only : bool
+        Whether the databases are opened read-only. Instance databases are then also opened as immutable.
+
+    pragmas : dict
+        The PRAGMA statements run on every new connection.
+
+    dtypes : str or None
+        The dtype policy applied to the frames read, one of DTYPE_POLICIES.
+
+    Methods
+    -------
+    data_engine_creator(path)
+        Creates the database engine.
+
+    get_engine(path)
+        Returns the pooled engine for a database, creating it on first use.
+
+    close()
+        Disposes of all pooled engines and shuts down the worker pool.
+
+    clear_cache()
+        Removes all tables from the in-memory and on-disk caches.
+
+    create_or_clear_database()
+        Creates or clears the database.
+
+    prepare_scenarios_column(df)
+        Ensures there is a column named 'Scenarios'.
+
+    read_instance_table(path, table, index_col=None, columns=None, scenarios=None, years=None, where=None)
+        Retrieves a DataFrame from a single instance database.
+
+    read_instance_tables(path, queries)
+        Retrieves several DataFrames from a single instance database in one read transaction.
+
+    read_attached_tables(paths, queries)
+        Retrieves several tables from many databases attached to a single SQLite connection.
+
+    read_warehouse_tables(queries)
+        Retrieves several tables from a warehouse database in one read transaction.
+
+    warehouse_instances()
+        Returns the db_instance labels held in the warehouse database.
+
+    instance_dtype()
+        Returns the categorical dtype of the 'db_instance' column.
+
+    select_paths(db_instances=None)
+        Returns the database paths for the given db_instance labels.
+
+    get_goblin_results_output_datatable(table, index_col=None, columns=None, scenarios=None, years=None, db_instances=None, where=None)
+        Retrieves a DataFrame from the database, optionally reading only some columns and rows.
+
+    iter_table(table, index_col=None, chunksize=DEFAULT_CHUNKSIZE, columns=None, scenarios=None, years=None, db_instances=None, where=None)
+        Yields a table from the databases in chunks of at most chunksize rows.
+
+    add_databases(paths)
+        Adds instance databases, updating the cached tables by reading only the new databases.
+
+    remove_databases(paths)
+        Removes instance databases, updating the cached tables by dropping their rows.
+
+    get_many(tables, cache=True)
+        Retrieves several tables, opening each database once.
+ 
+    """
+
+    def __init__(
+        self,
+        external_database_paths,
+        max_workers=None,
+        backend="thread",
+        cache_bytes=DEFAULT_CACHE_BYTES,
+        cache_dir=None,
+        cache_format="feather",
+        attach=False,
+        read_only=True,
+        pragmas=None,
+        dtypes=None,
+    ):
+        """
+        Initializes the DataManager.
+
+        Parameters
+        ----------
+        external_database_path : list of str,
+            list of paths to the external databases, or the path to a warehouse database built by warehouse.consolidate.
+            A warehouse holds every instance in one indexed file and is only recognised as the only path.
+
+        max_workers : int, optional
+            The number of workers used to read the databases concurrently. Defaults to None, which reads them one
+            after another.
+
+        backend : str, optional
+            The executor used for concurrent reads, either "thread" or "process". Defaults to "thread".
+
+        cache_bytes : int, optional
+            The memory budget in bytes of the in-memory table cache. Defaults to 512 MiB. None or 0 disables the cache.
+
+        cache_dir : str, optional
+            A directory in which to persist retrieved tables, so later processes can load them without querying the
+            databases. Defaults to None, which disables the on-disk cache. Requires pyarrow.
+
+        cache_format : str, optional
+            The file format of the on-disk cache, either "feather" or "parquet". Defaults to "feather".
+
+        attach : bool, optional
+            If True, tables are read over a single SQLite connection to which the databases are attached in groups of up to
+            the SQLITE_MAX_ATTACHED limit, with one UNION ALL query per table and group. max_workers does not apply to
+            these reads. Defaults to False, which reads each database over its own pooled engine.
+
+        read_only : bool, optional
+            If True, databases are opened with mode=ro URIs, and instance databases also with immutable=1, so SQLite takes
+            no locks and many processes can read them at once. The instance databases must then not change while they
+            are open; call close() to reopen them. A warehouse database, which consolidate updates in place, is opened
+            read-only but not immutable. Defaults to True. Set to False to open the databases read-write.
+
+        pragmas : dict, optional
+            PRAGMA statements run on every new connection, merged over DEFAULT_PRAGMAS, which sets mmap_size, cache_size
+            and temp_store. Defaults to None, which uses DEFAULT_PRAGMAS. A value of None removes a default pragma.
+
+        dtypes : str, optional
+            The dtype policy applied to each frame as it is read, before the frames are concatenated. "compact" stores
+            'db_instance', the dimension columns such as 'land_use' and 'cohort', and other low-cardinality string
+            columns as categoricals, and downcasts integer columns. "arrow" also stores the other string columns as
+            Arrow-backed strings and requires pyarrow. Float columns are never changed. Defaults to None, which keeps
+            the dtypes pandas reads.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}.")
+
+        check_policy(dtypes)
+
+        if isinstance(external_database_paths, str):
+            external_database_paths = [external_database_paths]
+
+        # Imported here, as the warehouse module builds on this one
+        from goblin_fetcher.resource_manager.warehouse import is_warehouse
+
+        # A warehouse must be the only path, so instance databases are not opened here when several paths are given
+        self.warehouse = None
+        if len(external_database_paths) == 1 and is_warehouse(external_database_paths[0]):
+            self.warehouse = external_database_paths[0]
+
+        self._set_database_paths(external_database_paths)
+        self.max_workers = max_workers
+        self.backend = backend
+        self._engines = {}
+        self._engines_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.cache = TableCache(cache_bytes) if cache_bytes else None
+        self.disk_cache = DiskCache(cache_dir, cache_format) if cache_dir is not None else None
+        self.attach = attach
+        self.read_only = read_only
+        self.dtypes = dtypes
+        self.pragmas = {
+            name: value for name, value in {**DEFAULT_PRAGMAS, **(pragmas or {})}.items() if value is not None
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def data_engine_creator(self, path):
+        """
+        Checks if the database file exists and creates the engine if it does.
+        Informs the user if the database file does not exist.
+
+        Returns
+        -------
+        sqlalchemy.engine.base.Engine or None
+            The database engine if the file exists, None otherwise.
+        """
+        database_dir = os.path.dirname(path)
+        database_name = os.path.basename(path)
+        try:
+            # Construct the full path to the database file
+            database_path = os.path.abspath(os.path.join(database_dir, database_name))
+            
+            # Check if the database file exists
+            if not os.path.isfile(database_path):
+                raise FileNotFoundError(f"Database file '{database_path}' not found.")
+
+            # Create the engine, opening read-only connections with the configured pragmas
+            uri = database_uri(database_path, self.read_only, immutable=database_path != self._warehouse_path())
+            engine = sqa.create_engine(
+                "sqlite://",
+                creator=partial(self._connect, uri),
+                poolclass=sqa.pool.QueuePool,
+            )
+            return engine
+        except Exception as e:
+            # Inform the user of the problem
+            print(f"An error occurred: {e}")
+            return None
+
+
+    def _connect(self, uri):
+        """
+        Opens a sqlite3 connection to the database URI and applies the pragmas.
+        """
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        apply_pragmas(connection, self.pragmas)
+        return connection
+
+
+    def _warehouse_path(self):
+        return None if self.warehouse is None else os.path.abspath(self.warehouse)
+
+
+    def get_engine(self, path):
+        """
+        Returns the engine for the given database path.
+
+        Engines are created lazily on first use and kept open, keyed by the absolute database path, so repeated
+        table fetches reuse the same connection pool rather than rebuilding an engine for every call.
+
+        Parameters
+        ----------
+        path : str
+            The path to the database.
+
+        Returns
+        -------
+        sqlalchemy.engine.base.Engine or None
+            The database engine if the file exists, None otherwise.
+        """
+        key = os.path.abspath(path)
+
+        with self._engines_lock:
+            engine = self._engines.get(key)
+
+            if engine is None:
+                engine = self.data_engine_creator(path)
+                if engine is not None:
+                    self._engines[key] = engine
+
+        return engine
+
+
+    def close(self):
+        """
+        Disposes of all pooled engines and their connections, and shuts down the worker pool.
+
+        The DataManager can still be used after closing; engines and workers are recreated on the next fetch.
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        with self._engines_lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+
+
+    def clear_cache(self):
+        """
+        Removes all tables from the in-memory and on-disk caches.
+        """
+        if self.cache is not None:
+            self.cache.clear()
+
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
+
+
+    def _get_executor(self):
+        """
+        Returns the worker pool, creating it on first use.
+
+        The pool is created under a lock, so concurrent first calls from several threads share one pool.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                if self.backend == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, initializer=_init_worker, initargs=(self.read_only, self.pragmas, self.dtypes)
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+            return self._executor
+
+
+    def _map_database_paths(self, paths, table, index_col=None, **query):
+        """
+        Reads a table from each database path, concurrently if max_workers is greater than one.
+
+        Results are returned in the same order as paths regardless of the order in which the reads finish.
+        """
+        if self.max_workers is None or self.max_workers <= 1 or len(paths) <= 1:
+            return [self.read_instance_table(path, table, index_col, **query) for path in paths]
+
+        executor = self._get_executor()
+
+        if self.backend == "process":
+            read = partial(_read_instance_table_in_worker, table=table, index_col=index_col, **query)
+        else:
+            read = partial(self.read_instance_table, table=table, index_col=index_col, **query)
+
+        return list(executor.map(read, paths))
+
+
+    def select_paths(self, db_instances=None):
+        """
+        Returns the database paths whose db_instance label is in db_instances, or all paths if db_instances is None.
+
+        A warehouse database holds every instance, so its path is always returned.
+        """
+        if db_instances is None or self.warehouse is not None:
+            return list(self.database_paths)
+
+        db_instances = set(_as_tuple(db_instances))
+        return [path for path in self.database_paths if self._labels[path] in db_instances]
+
+
+    @property
+    def instances(self):
+        """
+        The path of each db_instance label, in the order of the categories of the 'db_instance' column.
+
+        For a warehouse database, the paths the instances were consolidated from.
+        """
+        if self.warehouse is not None:
+            engine = self.get_engine(self.warehouse)
+            manifest = pd.read_sql(
+                "SELECT db_instance, instance_path FROM %s ORDER BY instance_position" % _quote(MANIFEST_TABLE), engine
+            )
+            return dict(zip(manifest["db_instance"], manifest["instance_path"]))
+
+        instances = {}
+        for path, label in self._labels.items():
+            instances.setdefault(label, path)
+
+        return instances
+
+
+    def instance_dtype(self):
+        """
+        Returns the categorical dtype of the 'db_instance' column under the "compact" and "arrow" dtype policies, whose
+        categories are the db_instance labels in the order of database_paths, or of the warehouse manifest. Without a
+        dtype policy the column holds the labels as strings.
+        """
+        if self.warehouse is not None:
+            return pd.CategoricalDtype(self.warehouse_instances())
+
+        return self._instance_dtype
+
+
+    def _set_database_paths(self, paths):
+        self.database_paths = list(paths)
+
+        # Labels are derived from the paths once; the db_instance column stores their codes
+        self._labels = {path: instance_label(path) for path in self.database_paths}
+        self._instance_dtype = pd.CategoricalDtype(list(dict.fromkeys(self._labels.values())))
+
+
+    def _label(self, path):
+        label = self._labels.get(path)
+        return instance_label(path) if label is None else label
+
+
+    def _build_select(
+        self,
+        connectable,
+        table,
+        index_col=None,
+        columns=None,
+        scenarios=None,
+        years=None,
+        where=None,
+        schema=None,
+        source=None,
+        extra_columns=(),
+        order_by=None,
+    ):
+        """
+        Builds a parameterised SELECT statement that reads only the requested columns and rows of a table.
+
+        source replaces the table in the FROM clause, extra_columns are always selected, and order_by is added as an
+        ORDER BY clause.
+
+        Returns
+        -------
+        tuple
+            The SQL statement, its parameters, and whether the scenarios filter must still be applied in pandas. That is
+            the case when 'Scenarios' is derived from the position of each row rather than from a column.
+        """
+        table_columns = self._table_columns(connectable, table, schema)
+
+        scenario_column = next((column for column in SCENARIO_COLUMNS if column in table_columns), None)
+        if scenario_column is None and index_col in table_columns:
+            scenario_column = index_col
+
+        if columns is None:
+            selection = "*"
+        else:
+            # 'Scenarios' and 'db_instance' are added to every frame, so they can be requested from any table
+            unknown = [
+                column for column in columns if column not in table_columns and column not in ("Scenarios", "db_instance")
+            ]
+            if unknown:
+                raise ValueError(f"Columns {unknown} not found in table '{table}'.")
+
+            selected = [index_col] if index_col in table_columns else []
+            selected += [column for column in columns if column in table_columns]
+            if scenario_column is not None:
+                selected.append(scenario_column)
+            selected += list(extra_columns)
+
+            # Scenarios taken from the row position need at least one column to count the rows
+            selected = selected or table_columns[:1]
+
+            selection = ", ".join(_quote(column) for column in dict.fromkeys(selected))
+
+        conditions = []
+        params = []
+        filters = dict(where or {})
+
+        if years is not None:
+            year_column = next((column for column in YEAR_COLUMNS if column in table_columns), None)
+            if year_column is None:
+                raise ValueError(f"Table '{table}' has no year column to filter on.")
+            filters[year_column] = years
+
+        filter_scenarios_in_pandas = False
+        if scenarios is not None:
+            if scenario_column is None:
+                filter_scenarios_in_pandas = True
+            else:
+                filters[scenario_column] = scenarios
+
+        for column, values in filters.items():
+            if column not in table_columns:
+                raise ValueError(f"Column '{column}' not found in table '{table}'.")
+
+            values = _as_tuple(values)
+            conditions.append("%s IN (%s)" % (_quote(column), ", ".join("?" * len(values))))
+            params.extend(values)
+
+        sql = "SELECT %s FROM %s" % (selection, source or _qualify(table, schema))
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if order_by is not None:
+            sql += " ORDER BY " + order_by
+
+        return sql, tuple(params), filter_scenarios_in_pandas
+
+
+    def prepare_scenarios_column(self, df):
+        """
+        Ensures there is a column named 'Scenarios'. If 'scenario' or 'scenarios' exist,
+        it renames them. If 'farm_id' exists, uses it for 'Scenarios'; otherwise, it uses the DataFrame index.
+        """
+        if 'Scenarios' not in df.columns:
+            if 'scenario' in df.columns:
+                df.rename(columns={'scenario': 'Scenarios'}, inplace=True)
+            elif 'scenarios' in df.columns:
+                df.rename(columns={'scenarios': 'Scenarios'}, inplace=True)
+            else:
+                # Check for 'farm_id' to use as 'Scenarios' or default to index
+                if 'farm_id' in df.columns:
+                    df['Scenarios'] = df['farm_id']
+                else:
+                    df['Scenarios'] = df.index
+        
+        return df
+
+
+    def read_instance_table(self, path, table, index_col=None, columns=None, scenarios=None, years=None, where=None):
+        """
+        Retrieves a DataFrame from a single instance database.
+
+        The columns and filter arguments are compiled into a parameterised SELECT statement, so only the requested rows
+        and columns are read from SQLite. See get_goblin_results_output_datatable for their description.
+
+        Parameters
+        ----------
+        path : str
+            The path to the instance database.
+
+        table : str
+            The name of the table to retrieve the DataFrame from.
+
+        index_col : str, optional
+            The column to use as the index. Defaults to None.
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            The DataFrame retrieved from the database, tagged with its db_instance, or None if the database does not exist.
+        """
+        engine = self.get_engine(path)
+        if engine is None:
+            return None
+
+        return self._read_instance_query(engine, path, table, index_col, columns, scenarios, years, where)
+
+
+    def read_instance_tables(self, path, queries):
+        """
+        Retrieves several DataFrames from a single instance database.
+
+        All tables are read over one connection inside one read transaction, so they come from the same snapshot of the
+        database.
+
+        Parameters
+        ----------
+        path : str
+            The path to the instance database.
+
+        queries : list of dict
+            The arguments of read_instance_table for each table, without the path.
+
+        Returns
+        -------
+        list of pandas.DataFrame or None
+            The DataFrame for each query, in the order of queries, or None for each query if the database does not exist.
+        """
+        engine = self.get_engine(path)
+        if engine is None:
+            return [None] * len(queries)
+
+        with engine.connect() as connection:
+            with connection.begin():
+                # pysqlite only begins a transaction before a write, so start the read transaction explicitly
+                connection.exec_driver_sql("BEGIN")
+
+                return [self._read_instance_query(connection, path, **query) for query in queries]
+
+
+    def _read_instance_query(self, connectable, path, table, index_col=None, columns=None, scenarios=None, years=None, where=None):
+        sql, params, filter_scenarios_in_pandas = self._instance_query(
+            connectable, table, index_col, columns, scenarios, years, where
+        )
+        dataframe = pd.read_sql(sql, connectable, index_col, params=params)
+
+        return self._prepare_instance_frame(dataframe, self._label(path), columns, scenarios, filter_scenarios_in_pandas)
+
+
+    def _instance_query(
+        self, connectable, table, index_col=None, columns=None, scenarios=None, years=None, where=None, schema=None
+    ):
+        """
+        Returns the SQL statement and parameters reading a table from one instance database, and whether the scenarios
+        filter must still be applied in pandas. schema names the database when it is attached to the connection.
+        """
+        if columns is None and scenarios is None and years is None and not where:
+            if schema is None:
+                return "SELECT * FROM '%s'" % table, None, False
+            return "SELECT * FROM %s" % _qualify(table, schema), (), False
+
+        return self._build_select(connectable, table, index_col, columns, scenarios, years, where, schema)
+
+
+    @staticmethod
+    def _table_columns(connectable, table, schema=None):
+        """
+        Returns the column names of a table, in order.
+        """
+        pragma = "PRAGMA table_info(%s)" if schema is None else "PRAGMA %s.table_info(%%s)" % _quote(schema)
+        return list(pd.read_sql(pragma % _quote(table), connectable)["name"])
+
+
+    def read_attached_tables(self, paths, queries):
+        """
+        Retrieves several tables from many databases over a single SQLite connection.
+
+        The databases are attached to the connection in groups of up to the SQLITE_MAX_ATTACHED limit. For each group and
+        table, one UNION ALL query with a literal db_instance column reads the table from every database in the group,
+        so the concatenation happens inside SQLite. Databases whose table has different columns from the first database
+        in the group are read with separate queries instead.
+
+        Parameters
+        ----------
+        paths : list of str
+            The paths to the instance databases.
+
+        queries : list of dict
+            The arguments of read_instance_table for each table, without the path. A query may give the paths it
+            applies to under "paths"; by default it applies to all paths.
+
+        Returns
+        -------
+        list of list of pandas.DataFrame
+            For each query, the frames read from each group of databases, in the order of paths.
+        """
+        existing = []
+        for path in paths:
+            if os.path.isfile(path):
+                existing.append(path)
+            else:
+                print(f"An error occurred: Database file '{os.path.abspath(path)}' not found.")
+
+        results = [[] for _ in queries]
+
+        connection = sqlite3.connect(":memory:", uri=True)
+        try:
+            apply_pragmas(connection, self.pragmas)
+            limit = _attach_limit(connection)
+
+            for start in range(0, len(existing), limit):
+                group = existing[start:start + limit]
+                schemas = ["instance_%d" % position for position in range(len(group))]
+
+                for schema, path in zip(schemas, group):
+                    connection.execute("ATTACH DATABASE ? AS %s" % _quote(schema), (database_uri(path, self.read_only),))
+                    apply_pragmas(connection, self.pragmas, schema)
+
+                try:
+                    for result, query in zip(results, queries):
+                        query = dict(query)
+                        selected = query.pop("paths", None)
+                        members = [
+                            (schema, path) for schema, path in zip(schemas, group) if selected is None or path in selected
+                        ]
+                        if members:
+                            result.extend(self._read_attached_group(connection, members, **query))
+                finally:
+                    for schema in schemas:
+                        connection.execute("DETACH DATABASE %s" % _quote(schema))
+        finally:
+            connection.close()
+
+        return results
+
+
+    def _read_attached_group(
+        self, connection, members, table, index_col=None, columns=None, scenarios=None, years=None, where=None
+    ):
+        """
+        Reads a table from the attached databases in members, a list of (schema, path) pairs, with one UNION ALL query.
+        """
+        table_columns = [self._table_columns(connection, table, schema) for schema, _ in members]
+
+        if any(names != table_columns[0] for names in table_columns[1:]):
+            frames = []
+            for schema, path in members:
+                sql, params, filter_scenarios_in_pandas = self._instance_query(
+                    connection, table, index_col, columns, scenarios, years, where, schema
+                )
+                dataframe = pd.read_sql(sql, connection, index_col, params=params)
+                frames.append(
+                    self._prepare_instance_frame(dataframe, self._label(path), columns, scenarios, filter_scenarios_in_pandas)
+                )
+            return frames
+
+        parts = []
+        params = []
+        for position, (schema, path) in enumerate(members):
+            sql, part_params, filter_scenarios_in_pandas = self._instance_query(
+                connection, table, index_col, columns, scenarios, years, where, schema
+            )
+            parts.append("SELECT *, %d AS attached_position FROM (%s)" % (position, sql))
+            params.extend(part_params)
+
+        dataframe = pd.read_sql(" UNION ALL ".join(parts), connection, index_col, params=params)
+        positions = dataframe.pop("attached_position").to_numpy()
+
+        # Tag rows with the code of their database's label rather than a string per row
+        dtype = self.instance_dtype()
+        codes = dtype.categories.get_indexer([self._label(path) for _, path in members])
+        db_instances = pd.Categorical.from_codes(codes[positions], dtype=dtype)
+
+        # Number rows within each database, as a separate read would, for scenarios taken from the row position
+        if index_col is None:
+            dataframe.index = pd.Series(positions).groupby(positions, sort=False).cumcount().to_numpy()
+
+        return [self._prepare_instance_frame(dataframe, db_instances, columns, scenarios, filter_scenarios_in_pandas)]
+
+
+    def warehouse_instances(self):
+        """
+        Returns the db_instance labels held in the warehouse database, in the order they were consolidated.
+        """
+        engine = self.get_engine(self.warehouse)
+        manifest = pd.read_sql(
+            "SELECT db_instance FROM %s ORDER BY instance_position" % _quote(MANIFEST_TABLE), engine
+        )
+
+        return list(manifest["db_instance"])
+
+
+    def read_warehouse_tables(self, queries):
+        """
+        Retrieves several tables from the warehouse database.
+
+        All tables are read over one connection inside one read transaction. The rows of each table are ordered by the
+        position of their instance in the warehouse and then by their order in the instance database, so the result
+        matches reading the instance databases in the order they were consolidated.
+
+        Parameters
+        ----------
+        queries : list of dict
+            The arguments of get_goblin_results_output_datatable for each table.
+
+        Returns
+        -------
+        list of pandas.DataFrame or None
+            The DataFrame for each query, in the order of queries, or None for each query if the warehouse does not exist.
+        """
+        engine = self.get_engine(self.warehouse)
+        if engine is None:
+            return [None] * len(queries)
+
+        with engine.connect() as connection:
+            with connection.begin():
+                # pysqlite only begins a transaction before a write, so start the read transaction explicitly
+                connection.exec_driver_sql("BEGIN")
+
+                return [self._read_warehouse_query(connection, **query) for query in queries]
+
+
+    def _read_warehouse_query(
+        self, connectable, table, index_col=None, columns=None, scenarios=None, years=None, db_instances=None, where=None
+    ):
+        sql, params, filter_scenarios_in_pandas = self._warehouse_query(
+            connectable, table, index_col, columns, scenarios, years, db_instances, where
+        )
+        dataframe = pd.read_sql(sql, connectable, index_col, params=params)
+
+        return self._prepare_warehouse_frame(dataframe, index_col, columns, scenarios, filter_scenarios_in_pandas)
+
+
+    def _warehouse_query(
+        self, connectable, table, index_col=None, columns=None, scenarios=None, years=None, db_instances=None, where=None
+    ):
+        """
+        Returns the SQL statement and parameters reading a table from the warehouse database, and whether the scenarios
+        filter must still be applied in pandas.
+        """
+        where = dict(where or {})
+        if db_instances is not None:
+            where["db_instance"] = db_instances
+
+        source = (
+            "(SELECT t.*, i.instance_position AS warehouse_position, t.rowid AS warehouse_rowid FROM %s AS t "
+            "JOIN %s AS i ON i.db_instance = t.db_instance)" % (_quote(table), _quote(MANIFEST_TABLE))
+        )
+
+        return self._build_select(
+            connectable,
+            table,
+            index_col,
+            columns,
+            scenarios,
+            years,
+            where,
+            source=source,
+            extra_columns=("db_instance",),
+            order_by="warehouse_position, warehouse_rowid",
+        )
+
+
+    def _prepare_warehouse_frame(self, dataframe, index_col=None, columns=None, scenarios=None, filter_scenarios_in_pandas=False, start=0):
+        """
+        Prepares a frame read from the warehouse database like a frame read from the instance databases.
+
+        start is the number of rows of the instance already read, when the frame is a later chunk of a single instance.
+        """
+        db_instances = pd.Categorical(dataframe.pop("db_instance"), dtype=self.instance_dtype())
+        for column in ("warehouse_position", "warehouse_rowid"):
+            if column in dataframe.columns:
+                dataframe.pop(column)
+
+        # Number rows within each instance, as a separate read would, for scenarios taken from the row position
+        if index_col is None:
+            codes = db_instances.codes
+            dataframe.index = pd.Series(codes).groupby(codes, sort=False).cumcount().to_numpy() + start
+
+        return self._prepare_instance_frame(dataframe, db_instances, columns, scenarios, filter_scenarios_in_pandas)
+
+
+    def _prepare_instance_frame(self, dataframe, db_instance, columns=None, scenarios=None, filter_scenarios_in_pandas=False):
+        """
+        Adds the 'Scenarios' and 'db_instance' columns to a frame read from the instance databases, and applies the
+        scenarios filter and column projection that were not done in SQL.
+
+        db_instance is either the label of the database the frame was read from, or a Categorical with the label of each
+        row. Under a dtype policy a label is stored as a categorical column of its code, without creating a string for
+        each row; without one the column holds the labels as strings, as the getters return them.
+        """
+        dataframe= self.prepare_scenarios_column(dataframe)
+
+        if filter_scenarios_in_pandas:
+            selected = dataframe["Scenarios"].isin(_as_tuple(scenarios)).to_numpy().nonzero()[0]
+            dataframe = dataframe.take(selected)
+            if not isinstance(db_instance, str):
+                db_instance = db_instance[selected]
+
+        if columns is not None:
+            # The index column is read as the index, so it is not reindexed into a column of missing values
+            columns = [column for column in columns if column not in dataframe.index.names]
+            dataframe = dataframe.reindex(columns=list(dict.fromkeys([*columns, "Scenarios"])))
+
+        if self.dtypes is None:
+            dataframe["db_instance"] = db_instance if isinstance(db_instance, str) else np.asarray(db_instance, dtype=object)
+            return dataframe
+
+        if isinstance(db_instance, str):
+            dtype = self._instance_dtype
+            if db_instance not in dtype.categories:
+                # A process pool worker does not know every label; the frames are recoded after concatenation
+                dtype = pd.CategoricalDtype([db_instance])
+
+            code = dtype.categories.get_loc(db_instance)
+            db_instance = pd.Categorical.from_codes(np.full(len(dataframe), code, dtype=np.int32), dtype=dtype)
+
+        dataframe["db_instance"] = db_instance
+
+        return compact_frame(dataframe, self.dtypes)
+
+
+    def iter_table(
+        self,
+        table,
+        index_col=None,
+        chunksize=DEFAULT_CHUNKSIZE,
+        columns=None,
+        scenarios=None,
+        years=None,
+        db_instances=None,
+        where=None,
+    ):
+        """
+        Yields a table from the databases in chunks of at most chunksize rows.
+
+        The databases are read one after another with pd.read_sql(..., chunksize=chunksize), so only one chunk is held in
+        memory at a time. Each chunk carries the 'Scenarios' and 'db_instance' columns, and the chunks are indexed so that
+        concatenating them gives the same frame as get_goblin_results_output_datatable. Chunks are not cached.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to retrieve.
+
+        index_col : str, optional
+            The column to use as the index. Defaults to None.
+
+        chunksize : int, optional
+            The maximum number of rows in each chunk. Defaults to DEFAULT_CHUNKSIZE.
+
+        columns, scenarios, years, db_instances, where : optional
+            Filters applied in SQL, as for get_goblin_results_output_datatable.
+
+        Yields
+        ------
+        pandas.DataFrame
+            The next chunk of the table.
+        """
+        if self.warehouse is not None:
+            yield from self._iter_warehouse_table(table, index_col, chunksize, columns, scenarios, years, db_instances, where)
+            return
+
+        offset = 0
+
+        for path in self.select_paths(db_instances):
+            engine = self.get_engine(path)
+            if engine is None:
+                continue
+
+            sql, params, filter_scenarios_in_pandas = self._instance_query(
+                engine, table, index_col, columns, scenarios, years, where
+            )
+
+            position = 0
+            for chunk in pd.read_sql(sql, engine, index_col, params=params, chunksize=chunksize):
+                # Number rows across chunks, so scenarios taken from the row position match a full read
+                if index_col is None:
+                    chunk.index = pd.RangeIndex(position, position + len(chunk))
+                    position += len(chunk)
+
+                chunk = self._prepare_instance_frame(chunk, self._label(path), columns, scenarios, filter_scenarios_in_pandas)
+                if chunk.empty:
+                    continue
+
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+
+                yield chunk
+
+
+    def _iter_warehouse_table(
+        self, table, index_col=None, chunksize=DEFAULT_CHUNKSIZE, columns=None, scenarios=None, years=None, db_instances=None, where=None
+    ):
+        """
+        Yields a table from the warehouse database in chunks, reading one instance at a time through the db_instance index.
+        """
+        engine = self.get_engine(self.warehouse)
+        if engine is None:
+            return
+
+        instances = self.warehouse_instances()
+        if db_instances is not None:
+            selected = set(_as_tuple(db_instances))
+            instances = [instance for instance in instances if instance in selected]
+
+        offset = 0
+
+        for instance in instances:
+            sql, params, filter_scenarios_in_pandas = self._warehouse_query(
+                engine, table, index_col, columns, scenarios, years, [instance], where
+            )
+
+            position = 0
+            for chunk in pd.read_sql(sql, engine, index_col, params=params, chunksize=chunksize):
+                rows = len(chunk)
+                chunk = self._prepare_warehouse_frame(
+                    chunk, index_col, columns, scenarios, filter_scenarios_in_pandas, start=position
+                )
+                position += rows
+                if chunk.empty:
+                    continue
+
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+                offset += len(chunk)
+
+                yield chunk
+
+
+    def get_goblin_results_output_datatable(
+        self, table, index_col=None, columns=None, scenarios=None, years=None, db_instances=None, where=None
+    ):
+        """
+        Retrieves a DataFrame from the database.
+
+        This method retrieves a DataFrame from the database. When max_workers is set the instance databases are read
+        concurrently, and the results are concatenated in the order of database_paths.
+
+        Results are kept in the in-memory cache, keyed by table and index column, until the cache budget is exhausted or
+        one of the database files changes. The returned DataFrame is always a copy, so it can be modified freely. If a
+        cache directory was given, results are also persisted there and loaded by later processes in place of a query.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to retrieve the DataFrame from.
+
+        index_col : str, optional
+            The column to use as the index. Defaults to None.
+
+        columns : list of str, optional
+            The columns to read. 'Scenarios' and 'db_instance' are always included. Defaults to None, which reads all
+            columns.
+
+        scenarios : list, optional
+            Only read rows whose 'Scenarios' value is in this list. Defaults to None.
+
+        years : list of int, optional
+            Only read rows whose 'year' (or 'Year') value is in this list. Defaults to None.
+
+        db_instances : list of str, optional
+            Only read the databases with these db_instance labels. Defaults to None, which reads all databases.
+
+        where : dict, optional
+            Further filters, mapping a column name to a value or list of accepted values. Defaults to None.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The DataFrame retrieved from the database.
+        """
+        paths = self.select_paths(db_instances)
+        query = {"columns": columns, "scenarios": scenarios, "years": years, "where": where}
+
+        key = self._cache_key(table, index_col, db_instances=db_instances, **query)
+        fingerprint = self._fingerprint(paths)
+
+        cached = self._get_cached(key, fingerprint)
+        if cached is not None:
+            return cached
+
+        if self.warehouse is not None:
+            frames = self.read_warehouse_tables([{"table": table, "index_col": index_col, "db_instances": db_instances, **query}])
+        elif self.attach:
+            frames, = self.read_attached_tables(paths, [{"table": table, "index_col": index_col, **query}])
+        else:
+            frames = self._map_database_paths(paths, table, index_col, **query)
+
+        return self._concat_and_cache(frames, key, fingerprint)
+
+
+    def get_many(self, tables, cache=True):
+        """
+        Retrieves several tables, opening each database once.
+
+        The tables missing from the caches are read from each instance database over a single connection and read
+        transaction with read_instance_tables, concurrently across databases if max_workers is greater than one, or
+        with read_attached_tables in attach mode. Each table is then concatenated and cached exactly as by
+        get_goblin_results_output_datatable.
+
+        Parameters
+        ----------
+        tables : list or dict
+            The tables to retrieve. Either a list of table names, or a dict mapping a result name to a table name or to a
+            dict of get_goblin_results_output_datatable arguments, such as
+            {"land": {"table": "climate_change_landuse", "index_col": "scenario", "years": [2020, 2050]}}.
+
+        cache : bool, optional
+            If False, the tables read are returned without being stored in the in-memory and on-disk caches, for one-off
+            reads such as the shards of a single instance. Defaults to True.
+
+        Returns
+        -------
+        dict of pandas.DataFrame
+            The concatenated DataFrame for each table, keyed by table name or result name.
+        """
+        if not isinstance(tables, dict):
+            tables = {table: table for table in tables}
+
+        results = {}
+        missing = []
+
+        for name, arguments in tables.items():
+            query = {"table": arguments} if isinstance(arguments, str) else dict(arguments)
+            db_instances = query.pop("db_instances", None)
+
+            paths = self.select_paths(db_instances)
+            key = self._cache_key(db_instances=db_instances, **query)
+            fingerprint = self._fingerprint(paths)
+
+            cached = self._get_cached(key, fingerprint)
+            if cached is not None:
+                results[name] = cached
+            else:
+                missing.append((name, query, set(paths), key, fingerprint))
+
+            if self.warehouse is not None:
+                query["db_instances"] = db_instances
+
+        if missing and self.warehouse is not None:
+            frames = self.read_warehouse_tables([query for _, query, _, _, _ in missing])
+            for (name, _, _, key, fingerprint), frame in zip(missing, frames):
+                results[name] = self._concat_and_cache([frame], key, fingerprint, cache)
+
+        elif missing:
+            frames = self._read_selected(
+                self.database_paths,
+                [query for _, query, _, _, _ in missing],
+                [selected for _, _, selected, _, _ in missing],
+            )
+            for (name, _, _, key, fingerprint), query_frames in zip(missing, frames):
+                results[name] = self._concat_and_cache(query_frames, key, fingerprint, cache)
+
+        return {name: results[name] for name in tables}
+
+
+    def _read_selected(self, paths, queries, selections):
+        """
+        Reads each query from the databases of paths in its selection, a set of paths, opening each database once.
+
+        Returns the frames read for each query, in the order of paths.
+        """
+        paths = [path for path in paths if any(path in selected for selected in selections)]
+
+        if self.attach:
+            return self.read_attached_tables(
+                paths, [{**query, "paths": selected} for query, selected in zip(queries, selections)]
+            )
+
+        path_queries = [[query for query, selected in zip(queries, selections) if path in selected] for path in paths]
+
+        frames = [[] for _ in queries]
+        for path, path_frames in zip(paths, self._map_instance_tables(paths, path_queries)):
+            positions = [position for position, selected in enumerate(selections) if path in selected]
+            for position, frame in zip(positions, path_frames):
+                frames[position].append(frame)
+
+        return frames
+
+
+    def add_databases(self, paths):
+        """
+        Adds instance databases after the current ones.
+
+        Each table in the in-memory cache is updated by reading it from the new databases only, with the same filters,
+        and appending their rows, so the cached result is the same as reading every database again. Tables whose
+        db_instances filter excludes the new databases are recategorised to the new 'db_instance' labels under a dtype
+        policy. The updated tables are also written to the on-disk cache.
+
+        Parameters
+        ----------
+        paths : str or list of str
+            The paths to the instance databases to add.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+
+        # Imported here, as the warehouse module builds on this one
+        from goblin_fetcher.resource_manager.warehouse import is_warehouse
+
+        if self.warehouse is not None or len(paths) == 1 and is_warehouse(paths[0]):
+            raise ValueError("Databases cannot be added to a warehouse; consolidate them into the warehouse instead.")
+
+        entries = self._cached_entries()
+        self._set_database_paths(self.database_paths + list(paths))
+
+        updates = []
+        for key, query, fingerprint, selected in entries:
+            added = [path for path in paths if query["db_instances"] is None or self._label(path) in query["db_instances"]]
+            if added:
+                updates.append((key, query, fingerprint, selected + added, set(added)))
+                continue
+
+            # Under a dtype policy, entries that gain no rows are still rewritten, as the categories of 'db_instance' change
+            cached = self.cache.get(key, fingerprint) if self.dtypes is not None else None
+            if cached is not None and len(cached.columns):
+                self._concat_and_cache([cached], key, fingerprint)
+
+        if not updates:
+            return
+
+        frames = self._read_selected(
+            list(paths),
+            [{name: value for name, value in query.items() if name != "db_instances"} for _, query, _, _, _ in updates],
+            [added for _, _, _, _, added in updates],
+        )
+
+        for (key, _, fingerprint, selected, _), added_frames in zip(updates, frames):
+            cached = self.cache.get(key, fingerprint)
+            if cached is None:
+                continue
+
+            current = [cached] if len(cached.columns) else []
+            self._concat_and_cache(current + added_frames, key, database_fingerprint(selected))
+
+
+    def remove_databases(self, paths):
+        """
+        Removes instance databases.
+
+        Each table in the in-memory cache is updated by dropping the rows of the removed databases, so the cached result
+        is the same as reading the remaining databases again. The pooled engines of the removed databases are disposed.
+
+        Parameters
+        ----------
+        paths : str or list of str
+            The paths to the instance databases to remove. Every occurrence of each path is removed.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+
+        if self.warehouse is not None:
+            raise ValueError("Databases cannot be removed from a warehouse; consolidate the remaining instances instead.")
+
+        removed = {os.path.abspath(path) for path in paths}
+
+        entries = self._cached_entries()
+        self._set_database_paths([path for path in self.database_paths if os.path.abspath(path) not in removed])
+
+        with self._engines_lock:
+            for path in list(self._engines):
+                if path in removed:
+                    self._engines.pop(path).dispose()
+
+        # Every entry is rewritten, as under a dtype policy the categories of 'db_instance' change even where no rows are
+        # dropped
+        for key, query, fingerprint, selected in entries:
+            remaining = [path for path in selected if os.path.abspath(path) not in removed]
+
+            # Rows are told apart by label, so a removed label must not also belong to a remaining database
+            labels = {self._label(path) for path in selected if os.path.abspath(path) in removed}
+            if labels & {self._label(path) for path in remaining}:
+                continue
+
+            cached = self.cache.get(key, fingerprint)
+            if cached is None or not len(cached.columns):
+                continue
+
+            kept = cached[~cached["db_instance"].isin(labels).to_numpy()]
+            self._concat_and_cache([kept] if len(remaining) else [], key, database_fingerprint(remaining))
+
+
+    def _cached_entries(self):
+        """
+        Returns the key, query, fingerprint and selected database paths of each valid table in the in-memory cache.
+        """
+        if self.cache is None:
+            return []
+
+        entries = []
+        for key, fingerprint in self.cache.entries():
+            query = self._query_from_key(key)
+            selected = self.select_paths(query["db_instances"])
+            if fingerprint == database_fingerprint(selected):
+                entries.append((key, query, fingerprint, selected))
+
+        return entries
+
+
+    def _map_instance_tables(self, paths, queries):
+        """
+        Reads the tables in queries[i] from paths[i] for each path, concurrently if max_workers is greater than one.
+        """
+        if self.max_workers is None or self.max_workers <= 1 or len(paths) <= 1:
+            return [self.read_instance_tables(path, path_queries) for path, path_queries in zip(paths, queries)]
+
+        executor = self._get_executor()
+        read = _read_instance_tables_in_worker if self.backend == "process" else self.read_instance_tables
+
+        return list(executor.map(read, paths, queries))
+
+
+    def _cache_key(self, table, index_col=None, columns=None, scenarios=None, years=None, db_instances=None, where=None):
+        """
+        Returns the cache key of a table read. Unfiltered reads are keyed by the table and index column alone, plus the
+        dtype policy if one is set.
+        """
+        key = (table, index_col)
+        if any(value is not None for value in (columns, scenarios, years, db_instances, where)):
+            key += (
+                None if columns is None else tuple(columns),
+                None if scenarios is None else _as_tuple(scenarios),
+                None if years is None else _as_tuple(years),
+                None if db_instances is None else _as_tuple(db_instances),
+                None if where is None else tuple((column, _as_tuple(values)) for column, values in where.items()),
+            )
+
+        if self.dtypes is not None:
+            key += (("dtypes", self.dtypes),)
+
+        return key
+
+
+    @staticmethod
+    def _query_from_key(key):
+        """
+        Returns the get_goblin_results_output_datatable arguments of a cache key made by _cache_key.
+        """
+        table, index_col, *filters = key
+        if len(filters) % 5:
+            # The last element is the dtype policy
+            filters = filters[:-1]
+
+        columns, scenarios, years, db_instances, where = filters or (None,) * 5
+
+        return {
+            "table": table,
+            "index_col": index_col,
+            "columns": columns,
+            "scenarios": scenarios,
+            "years": years,
+            "db_instances": db_instances,
+            "where": None if where is None else dict(where),
+        }
+
+
+    def _fingerprint(self, paths):
+        if self.cache is None and self.disk_cache is None:
+            return None
+
+        return database_fingerprint(paths)
+
+
+    def _get_cached(self, key, fingerprint):
+        """
+        Returns the table from the in-memory cache, or else from the on-disk cache, or None if neither holds it.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(key, fingerprint)
+            if cached is not None:
+                return cached
+
+        if self.disk_cache is not None:
+            cached = self.disk_cache.get(key, fingerprint)
+            if cached is not None:
+                if self.cache is not None:
+                    self.cache.put(key, fingerprint, cached)
+                return cached
+
+        return None
+
+
+    def _concat_and_cache(self, frames, key, fingerprint, cache=True):
+        """
+        Concatenates the frames read from each database and stores the result in the caches, unless cache is False.
+        """
+        frames = [frame for frame in frames if frame is not None]
+
+        # Concatenate once at the end; growing the result inside the loop copies every row again for each database.
+        if not frames:
+            return pd.DataFrame()
+
+        concatenated_data = concat_frames(frames)
+
+        if self.dtypes is not None and "db_instance" in concatenated_data.columns:
+            dtype = self.instance_dtype()
+            if concatenated_data["db_instance"].dtype != dtype:
+                concatenated_data["db_instance"] = concatenated_data["db_instance"].astype(dtype)
+
+        # Frames can disagree on which string columns are low-cardinality, so the policy is applied to the result too
+        concatenated_data = compact_frame(concatenated_data, self.dtypes)
+
+        if cache and self.disk_cache is not None:
+            self.disk_cache.put(key, fingerprint, concatenated_data)
+
+        if cache and self.cache is not None:
+            self.cache.put(key, fingerprint, concatenated_data)
+
+        return concatenated_data
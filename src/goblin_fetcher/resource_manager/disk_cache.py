@@ -0,0 +1,159 @@
+"""
+Disk Cache
+==========
+
+This module contains the DiskCache class, which persists the concatenated tables retrieved by the DataManager as
+Feather or Parquet files, so later processes can load them without querying the instance databases.
+
+Reading and writing the cache requires the optional pyarrow dependency.
+"""
+from goblin_fetcher.resource_manager.optional import require_pyarrow
+import pandas as pd
+import hashlib
+import os
+import uuid
+import re
+
+FORMATS = {"feather": ".feather", "parquet": ".parquet"}
+
+# Names of the cache files written by path_for: the table, the digest of its key and paths, and the digest of its key
+# and fingerprint. Only the digests are matched, as table names can hold any character allowed in a file name
+CACHE_FILE_NAME = re.compile(r"^.+-[0-9a-f]{16}-[0-9a-f]{16}$")
+
+
+class DiskCache:
+    """
+    A directory of cached tables stored in a columnar file format.
+
+    Each file name is a hash of the table name, index column and the fingerprint of the source databases (their paths,
+    modification times and sizes). A change to any of the databases therefore produces a new file name, and stale files
+    are never read. Writing a table deletes the files of the same table read from the same database paths before the
+    databases changed, so the directory holds one file per table and set of databases.
+
+    Attributes
+    ----------
+    directory : str
+        The directory where the cached tables are stored.
+
+    format : str
+        The file format of the cached tables, either "feather" or "parquet".
+
+    Methods
+    -------
+    get(key, fingerprint)
+        Returns the cached frame, or None if it has not been cached.
+
+    put(key, fingerprint, dataframe)
+        Writes the frame to the cache directory, deleting the stale files of the same key.
+
+    clear()
+        Deletes all cached tables from the cache directory.
+    """
+
+    def __init__(self, directory, format="feather"):
+        """
+        Initializes the DiskCache, creating the cache directory if it does not exist.
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the cached tables are stored.
+
+        format : str, optional
+            The file format of the cached tables, either "feather" or "parquet". Defaults to "feather".
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown cache format '{format}', expected one of {tuple(FORMATS)}.")
+
+        require_pyarrow("The on-disk table cache")
+
+        self.directory = directory
+        self.format = format
+        os.makedirs(directory, exist_ok=True)
+
+    def _prefix(self, key, fingerprint):
+        """
+        Returns the file name prefix shared by the cache files of the key read from the same database paths, whatever
+        their modification times and sizes.
+        """
+        paths = tuple(entry[0] for entry in fingerprint)
+        digest = hashlib.sha256(repr((key, paths)).encode("utf-8")).hexdigest()
+        table = key[0] if isinstance(key, tuple) else key
+
+        return f"{table}-{digest[:16]}-"
+
+    def path_for(self, key, fingerprint):
+        """
+        Returns the path of the cache file for the key and database fingerprint.
+        """
+        digest = hashlib.sha256(repr((key, fingerprint)).encode("utf-8")).hexdigest()
+
+        return os.path.join(self.directory, f"{self._prefix(key, fingerprint)}{digest[:16]}{FORMATS[self.format]}")
+
+    def get(self, key, fingerprint):
+        """
+        Returns the cached frame for the key and database fingerprint.
+
+        Feather files are memory-mapped rather than read into memory up front.
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            The cached frame, or None if it has not been cached.
+        """
+        path = self.path_for(key, fingerprint)
+        if not os.path.isfile(path):
+            return None
+
+        if self.format == "feather":
+            from pyarrow import feather
+
+            return feather.read_table(path, memory_map=True).to_pandas()
+
+        return pd.read_parquet(path, memory_map=True)
+
+    def put(self, key, fingerprint, dataframe):
+        """
+        Writes the frame to the cache directory.
+
+        The frame is written to a temporary file first and then moved into place, so concurrent processes never read a
+        partially written file. The files of the key cached for earlier versions of the databases are then deleted.
+        """
+        path = self.path_for(key, fingerprint)
+        temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            if self.format == "feather":
+                dataframe.to_feather(temporary_path)
+            else:
+                dataframe.to_parquet(temporary_path)
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+        self._prune(self._prefix(key, fingerprint), os.path.basename(path))
+
+    def _prune(self, prefix, current):
+        """
+        Deletes the cache files whose names start with prefix, other than current.
+        """
+        extension = FORMATS[self.format]
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(extension) and name != current:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    # Already deleted by another process, or still open by a reader where open files cannot be deleted
+                    pass
+
+    def clear(self):
+        """
+        Deletes all cached tables from the cache directory.
+
+        Only files named like the cache files are deleted, so other files kept in the directory are left in place.
+        """
+        extension = FORMATS[self.format]
+        for name in os.listdir(self.directory):
+            if name.endswith(extension) and CACHE_FILE_NAME.match(name[:-len(extension)]):
+                os.remove(os.path.join(self.directory, name))
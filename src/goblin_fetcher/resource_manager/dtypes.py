@@ -0,0 +1,126 @@
+"""
+Dtypes
+======
+
+This module contains the dtype policies a DataManager can apply to the frames it reads, and concat_frames, which
+concatenates frames without losing their categorical columns.
+
+The "compact" policy stores the known dimension columns and other low-cardinality string
+columns as categoricals, and downcasts integer columns to the smallest integer dtype that holds their values. Float
+columns are left as float64, so values are unchanged. The "arrow" policy also stores the remaining string columns as
+Arrow-backed strings, which requires the optional pyarrow dependency.
+"""
+from goblin_fetcher.resource_manager.optional import require_pyarrow
+import pandas as pd
+
+DTYPE_POLICIES = (None, "compact", "arrow")
+
+# String columns of the output tables that hold a small set of repeated values
+DIMENSION_COLUMNS = (
+    "land_use",
+    "cohort",
+    "ef_country",
+    "forage",
+    "grazing",
+    "con_type",
+    "mm_storage",
+    "daily_spreading",
+    "crop_type",
+    "species",
+    "yield_class",
+    "Cattle systems",
+    "Manure management",
+)
+
+# Other string columns become categoricals when at most this fraction of their values are distinct
+CATEGORY_RATIO = 0.5
+
+
+def check_policy(policy):
+    """
+    Raises a ValueError if the dtype policy is not supported, and an ImportError if it requires pyarrow and pyarrow is
+    not installed.
+    """
+    if policy not in DTYPE_POLICIES:
+        raise ValueError(f"Unknown dtype policy '{policy}', expected one of {DTYPE_POLICIES}.")
+
+    if policy == "arrow":
+        require_pyarrow("The 'arrow' dtype policy")
+
+
+def compact_frame(dataframe, policy):
+    """
+    Converts the columns of a frame in place according to the dtype policy.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        The frame to convert.
+
+    policy : str or None
+        The dtype policy, one of DTYPE_POLICIES. None leaves the frame unchanged.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The converted frame.
+    """
+    if policy is None:
+        return dataframe
+
+    for column in dataframe.columns:
+        values = dataframe[column]
+
+        if pd.api.types.is_integer_dtype(values.dtype) and not isinstance(values.dtype, pd.ArrowDtype):
+            dataframe[column] = pd.to_numeric(values, downcast="integer")
+        elif values.dtype == object and _is_string(values):
+            if column in DIMENSION_COLUMNS or values.nunique() <= CATEGORY_RATIO * len(values):
+                dataframe[column] = values.astype("category")
+            elif policy == "arrow":
+                dataframe[column] = values.astype("string[pyarrow]")
+
+    return dataframe
+
+
+def _is_string(values):
+    return pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty")
+
+
+def concat_frames(frames):
+    """
+    Concatenates frames with pd.concat(frames, ignore_index=True), first giving each categorical column the union of
+    its categories across the frames so it stays categorical.
+
+    Parameters
+    ----------
+    frames : list of pandas.DataFrame
+        The frames to concatenate.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The concatenated frame.
+    """
+    if len(frames) > 1:
+        columns = [
+            column
+            for column, dtype in frames[0].dtypes.items()
+            if isinstance(dtype, pd.CategoricalDtype)
+            and all(column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames)
+        ]
+
+        if columns:
+            frames = [frame.copy(deep=False) for frame in frames]
+
+            for column in columns:
+                dtypes = {frame[column].dtype for frame in frames}
+                if len(dtypes) == 1:
+                    continue
+
+                categories = frames[0][column].cat.categories.append(
+                    [frame[column].cat.categories for frame in frames[1:]]
+                ).unique()
+                for frame in frames:
+                    frame[column] = frame[column].cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,28 @@
+"""
+Optional Dependencies
+=====================
+
+This module contains the checks for the optional pyarrow dependency, which is used by the on-disk table cache, the
+'arrow' dtype policy and the 'arrow' shared table transport.
+"""
+import importlib.util
+
+
+def has_pyarrow():
+    """
+    Returns True if pyarrow is installed, without importing it.
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def require_pyarrow(feature):
+    """
+    Raises an ImportError naming the feature if pyarrow is not installed.
+
+    Parameters
+    ----------
+    feature : str
+        The feature that requires pyarrow, such as "The on-disk table cache".
+    """
+    if not has_pyarrow():
+        raise ImportError(f"{feature} requires pyarrow. Install it with 'pip install pyarrow'.")
@@ -0,0 +1,328 @@
+"""
+Shared Tables
+=============
+
+This module contains the SharedTable class, which publishes a DataFrame to worker processes without pickling it, and
+the TableHandle class, the small picklable reference to a published table that is sent to the workers instead.
+
+Two transports are supported. "shared_memory" copies the columns into a multiprocessing.shared_memory block, and the
+workers build the DataFrame on NumPy views of that block. "arrow" writes the table to an Arrow IPC file, in /dev/shm
+where available, and the workers memory-map it; this transport requires the optional pyarrow dependency.
+
+Either way, N workers opening a table share one copy of its numeric, boolean, datetime and categorical code columns.
+Other columns, such as object string columns, are rebuilt in each worker: with "shared_memory" they travel inside the
+handle, and with "arrow" they are converted from the mapped file.
+
+Frames opened without copying are read-only views, so a worker cannot change the table seen by the others; copy the
+frame, or open it with copy=True, to modify it. The mapping of a table stays open while any frame or array opened from
+it is in use, and is closed once they are garbage-collected.
+"""
+from goblin_fetcher.resource_manager.optional import require_pyarrow
+from multiprocessing import shared_memory, resource_tracker
+import pandas as pd
+import numpy as np
+import tempfile
+import weakref
+import uuid
+import sys
+import os
+
+TRANSPORTS = ("shared_memory", "arrow")
+
+# Columns in a shared memory block start at multiples of this many bytes
+ALIGNMENT = 64
+
+# Bytes of the shared memory blocks mapped by this process, by block name, while frames opened from them are in use
+_MAPPINGS = weakref.WeakValueDictionary()
+
+
+def _default_directory():
+    """
+    Returns /dev/shm if it exists, so Arrow files are held in memory, and the temporary directory otherwise.
+    """
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def _map_block(name):
+    """
+    Returns the bytes of the shared memory block of name as a uint8 array, mapping the block if this process has not
+    mapped it yet.
+
+    Every column opened from the block is a view of this array, so the block is closed once the array and all of its
+    views are garbage-collected.
+    """
+    buffer = _MAPPINGS.get(name)
+    if buffer is None:
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+            # Attaching registers the block with the resource tracker, which would unlink it when this process exits
+            resource_tracker.unregister(block._name, "shared_memory")
+
+        buffer = np.frombuffer(block.buf, dtype=np.uint8)
+
+        # The memoryview NumPy keeps over the block releases it before its finalizers run, so the block can be closed
+        weakref.finalize(buffer.base, block.close)
+        _MAPPINGS[name] = buffer
+
+    return buffer
+
+
+def _is_shareable(dtype):
+    return isinstance(dtype, np.dtype) and dtype.kind in "biufcmM"
+
+
+class TableHandle:
+    """
+    A picklable reference to a table published with SharedTable.
+
+    Attributes
+    ----------
+    transport : str
+        The transport of the table, either "shared_memory" or "arrow".
+
+    name : str
+        The name of the shared memory block, or the path of the Arrow IPC file.
+
+    Methods
+    -------
+    open(copy=False)
+        Returns the table as a DataFrame.
+
+    release()
+        Forgets the mapping of the table held by this process.
+    """
+
+    def __init__(self, transport, name, columns=None, index=None, layout=None):
+        self.transport = transport
+        self.name = name
+        self._columns = columns
+        self._index = index
+        self._layout = layout
+
+    def __repr__(self):
+        return f"TableHandle({self.transport!r}, {self.name!r})"
+
+    def open(self, copy=False):
+        """
+        Returns the table as a DataFrame.
+
+        Without copying, the frame is a read-only view of the shared block or mapped file, which stays mapped in this
+        process while the frame, or any frame or array derived from it without copying, is in use. Opening the handle
+        again while the block is mapped does not map it twice.
+
+        Parameters
+        ----------
+        copy : bool, optional
+            If True, the frame is copied into memory owned by this process, so it can be modified, and the table is
+            unmapped once it is copied. Defaults to False.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The table.
+        """
+        if self.transport == "arrow":
+            return self._open_arrow(copy)
+
+        buffer = _map_block(self.name)
+
+        index = self._decode_index(buffer, copy)
+        arrays = {position: self._decode(buffer, spec, copy) for position, spec in enumerate(self._layout)}
+
+        dataframe = pd.DataFrame(arrays, index=index, copy=False)
+        dataframe.columns = self._columns
+        return dataframe
+
+    def release(self):
+        """
+        Forgets the mapping of the table held by this process, if any, so the next open maps the table again.
+
+        The mapping itself is closed once the frames opened from it are garbage-collected, whether or not release is
+        called.
+        """
+        _MAPPINGS.pop(self.name, None)
+
+    def _open_arrow(self, copy):
+        import pyarrow as pa
+
+        if copy:
+            with pa.OSFile(self.name) as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+
+        # The converted columns keep the file mapped after the source is closed, until they are garbage-collected.
+        # Without consolidating blocks, columns without nulls are converted without copying
+        with pa.memory_map(self.name) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+
+    @staticmethod
+    def _view(buffer, dtype, offset, length, copy):
+        dtype = np.dtype(dtype)
+        array = buffer[offset:offset + length * dtype.itemsize].view(dtype)
+        if copy:
+            return array.copy()
+
+        array.flags.writeable = False
+        return array
+
+    def _decode(self, buffer, spec, copy):
+        kind = spec[0]
+
+        if kind == "array":
+            _, dtype, offset, length = spec
+            return self._view(buffer, dtype, offset, length, copy)
+
+        if kind == "categorical":
+            _, dtype, offset, length, categorical_dtype = spec
+            codes = self._view(buffer, dtype, offset, length, copy)
+            return pd.Categorical.from_codes(codes, dtype=categorical_dtype, validate=False)
+
+        _, values = spec
+        return values
+
+    def _decode_index(self, buffer, copy):
+        kind = self._index[0]
+
+        if kind == "range":
+            _, start, stop, step, name = self._index
+            return pd.RangeIndex(start, stop, step, name=name)
+
+        _, specs, names = self._index
+        levels = [self._decode(buffer, spec, copy) for spec in specs]
+        if len(levels) == 1:
+            return pd.Index(levels[0], name=names[0], copy=False)
+
+        return pd.MultiIndex.from_arrays(levels, names=names)
+
+
+class SharedTable:
+    """
+    A DataFrame published for worker processes.
+
+    The publishing process owns the shared block or file, and must close the SharedTable once the workers are done with
+    it. The workers receive the handle, which pickles to a few hundred bytes plus any columns that cannot be shared,
+    and open it.
+
+    Attributes
+    ----------
+    handle : TableHandle
+        The reference to send to the workers.
+
+    nbytes : int
+        The size in bytes of the shared block or file.
+
+    Methods
+    -------
+    close()
+        Frees the shared block or deletes the file.
+
+    Examples
+    --------
+        >>> with SharedTable(fetcher.get_climate_change_animal_emissions_by_category()) as table:
+        ...     results = list(executor.map(analyse, repeat(table.handle), scenarios))
+
+        where each worker calls handle.open() to get the DataFrame.
+    """
+
+    def __init__(self, dataframe, transport="shared_memory", directory=None):
+        """
+        Publishes the DataFrame.
+
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+            The table to publish.
+
+        transport : str, optional
+            Either "shared_memory" or "arrow". Defaults to "shared_memory".
+
+        directory : str, optional
+            The directory of the Arrow IPC file. Defaults to /dev/shm where it exists, and the temporary directory
+            otherwise. Only used by the "arrow" transport.
+        """
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport '{transport}', expected one of {TRANSPORTS}.")
+
+        self._block = None
+        self._path = None
+
+        if transport == "arrow":
+            self._publish_arrow(dataframe, directory or _default_directory())
+        else:
+            self._publish_shared_memory(dataframe)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Frees the shared block or deletes the Arrow file. Workers that still map the table keep their mapping.
+        """
+        if self._block is not None:
+            if sys.version_info < (3, 13):
+                # A worker sharing the resource tracker of this process unregisters the block when it maps it, so it is
+                # registered again for unlink to unregister
+                resource_tracker.register(self._block._name, "shared_memory")
+
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+        if self._path is not None:
+            os.remove(self._path)
+            self._path = None
+
+    def _publish_arrow(self, dataframe, directory):
+        require_pyarrow("The 'arrow' shared table transport")
+        import pyarrow as pa
+
+        path = os.path.join(directory, f"goblin_fetcher_{uuid.uuid4().hex}.arrow")
+        table = pa.Table.from_pandas(dataframe)
+
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        self._path = path
+        self.nbytes = os.path.getsize(path)
+        self.handle = TableHandle("arrow", path)
+
+    def _publish_shared_memory(self, dataframe):
+        arrays = []
+        offset = 0
+
+        def encode(values):
+            # Returns the spec of a column, queueing the arrays it stores in the block
+            nonlocal offset
+
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes = np.ascontiguousarray(values.codes if isinstance(values, pd.Categorical) else values.cat.codes)
+                spec = ("categorical", codes.dtype.str, offset, len(codes), values.dtype)
+            elif _is_shareable(values.dtype):
+                codes = np.ascontiguousarray(values)
+                spec = ("array", codes.dtype.str, offset, len(codes))
+            else:
+                return ("object", values.to_numpy() if isinstance(values, pd.Series) else values)
+
+            arrays.append((offset, codes))
+            offset += -(-codes.nbytes // ALIGNMENT) * ALIGNMENT
+            return spec
+
+        layout = [encode(dataframe.iloc[:, position]) for position in range(dataframe.shape[1])]
+
+        if isinstance(dataframe.index, pd.RangeIndex):
+            index = ("range", dataframe.index.start, dataframe.index.stop, dataframe.index.step, dataframe.index.name)
+        else:
+            levels = [dataframe.index.get_level_values(level) for level in range(dataframe.index.nlevels)]
+            index = ("arrays", [encode(level._values) for level in levels], list(dataframe.index.names))
+
+        block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for start, values in arrays:
+            np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf, offset=start)[:] = values
+
+        self._block = block
+        self.nbytes = block.size
+        self.handle = TableHandle("shared_memory", block.name, dataframe.columns, index, layout)
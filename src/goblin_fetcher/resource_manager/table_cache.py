@@ -0,0 +1,181 @@
+"""
+Table Cache
+===========
+
+This module contains the TableCache class, an in-memory least recently used cache of the concatenated tables
+retrieved by the DataManager.
+"""
+from collections import OrderedDict
+import threading
+import os
+
+
+def database_fingerprint(paths):
+    """
+    Returns a fingerprint of the database files, made up of the absolute path, modification time and size of each file.
+
+    Missing files are included with a modification time and size of None, so a file appearing later changes the fingerprint.
+
+    Parameters
+    ----------
+    paths : list of str
+        The paths to the databases.
+
+    Returns
+    -------
+    tuple
+        The fingerprint of the database files.
+    """
+    fingerprint = []
+    for path in paths:
+        database_path = os.path.abspath(path)
+        try:
+            stat = os.stat(database_path)
+            fingerprint.append((database_path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            fingerprint.append((database_path, None, None))
+
+    return tuple(fingerprint)
+
+
+class TableCache:
+    """
+    An in-memory least recently used cache of DataFrames.
+
+    Each entry is stored with the fingerprint of the databases it was read from. An entry whose fingerprint no longer
+    matches is treated as a miss and dropped. Once the total size of the cached frames exceeds the memory budget, the
+    least recently used entries are evicted.
+
+    Frames are copied on the way in and on the way out, so callers that modify a returned frame in place do not change
+    the cached data.
+
+    Attributes
+    ----------
+    max_bytes : int
+        The memory budget of the cache in bytes.
+
+    Methods
+    -------
+    get(key, fingerprint)
+        Returns a copy of the cached frame, or None if there is no valid entry.
+
+    put(key, fingerprint, dataframe)
+        Stores a copy of the frame in the cache.
+
+    entries()
+        Returns the key and fingerprint of each cached frame.
+
+    clear()
+        Removes all entries from the cache.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        Initializes the TableCache.
+
+        Parameters
+        ----------
+        max_bytes : int
+            The memory budget of the cache in bytes.
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """
+        The total size of the cached frames in bytes.
+        """
+        return self._size
+
+    def get(self, key, fingerprint):
+        """
+        Returns a copy of the cached frame for the key.
+
+        Parameters
+        ----------
+        key : hashable
+            The cache key.
+
+        fingerprint : tuple
+            The current fingerprint of the databases the frame was read from.
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            A copy of the cached frame, or None if the key is not cached or the databases have changed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            cached_fingerprint, dataframe, nbytes = entry
+            if cached_fingerprint != fingerprint:
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        return dataframe.copy()
+
+    def put(self, key, fingerprint, dataframe):
+        """
+        Stores a copy of the frame in the cache, evicting the least recently used entries to stay within the budget.
+
+        Frames larger than the whole budget are not cached.
+
+        Parameters
+        ----------
+        key : hashable
+            The cache key.
+
+        fingerprint : tuple
+            The fingerprint of the databases the frame was read from.
+
+        dataframe : pandas.DataFrame
+            The frame to cache.
+        """
+        nbytes = int(dataframe.memory_usage(index=True, deep=True).sum())
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if nbytes > self.max_bytes:
+                return
+
+            self._entries[key] = (fingerprint, dataframe.copy(), nbytes)
+            self._size += nbytes
+
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def entries(self):
+        """
+        Returns the key and fingerprint of each cached frame, from the least to the most recently used.
+
+        Returns
+        -------
+        list of tuple
+            The (key, fingerprint) pair of each entry.
+        """
+        with self._lock:
+            return [(key, fingerprint) for key, (fingerprint, _, _) in self._entries.items()]
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        _, _, nbytes = self._entries.pop(key)
+        self._size -= nbytes
@@ -0,0 +1,230 @@
+"""
+Warehouse
+=========
+
+This module contains the consolidate function, which copies the output tables of many instance databases into a single
+indexed warehouse database, and is_warehouse, which recognises such a database.
+
+Each warehouse table holds the rows of every instance, tagged with a db_instance column and indexed on db_instance and on
+the scenario, db_instance and year columns. A manifest table records the path, modification time, size and position of
+each imported instance, so consolidating again only re-imports the instances whose file changed.
+
+A DataManager or DataFetcher given the path of a warehouse reads from it instead of the instance databases.
+"""
+from goblin_fetcher.resource_manager.database_manager import (
+    MANIFEST_TABLE,
+    SCENARIO_COLUMNS,
+    YEAR_COLUMNS,
+    database_uri,
+    instance_label,
+    _quote,
+)
+import sqlite3
+import os
+
+
+def is_warehouse(path):
+    """
+    Returns True if the path is a SQLite database containing a warehouse manifest table.
+
+    The database is opened read-only, so checking an instance database does not lock or change it.
+
+    Parameters
+    ----------
+    path : str
+        The path to the database.
+
+    Returns
+    -------
+    bool
+        Whether the database is a warehouse.
+    """
+    if not os.path.isfile(path):
+        return False
+
+    try:
+        connection = sqlite3.connect(database_uri(path, read_only=True, immutable=False), uri=True)
+    except sqlite3.Error:
+        return False
+
+    try:
+        found = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (MANIFEST_TABLE,)
+        ).fetchone()
+        return found is not None
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        connection.close()
+
+
+def consolidate(paths, out_path, tables=None):
+    """
+    Copies the output tables of the instance databases into a single warehouse database.
+
+    Each instance is imported in its own transaction: its previous rows are deleted from every warehouse table, and the
+    rows of each of its tables are copied with an INSERT ... SELECT over the attached instance database. Instances whose
+    path, modification time and size match the manifest are skipped, and instances that are no longer listed in paths
+    are removed. Warehouse tables gain any columns an instance adds.
+
+    Parameters
+    ----------
+    paths : list of str
+        The paths to the instance databases. Their file names without extensions must be unique, as they become the
+        db_instance labels.
+
+    out_path : str
+        The path to the warehouse database, which is created if it does not exist.
+
+    tables : list of str, optional
+        The names of the tables to copy. Defaults to None, which copies every table.
+
+    Returns
+    -------
+    dict
+        The db_instance labels that were imported, skipped and removed, under the keys "imported", "skipped" and
+        "removed".
+    """
+    labels = [instance_label(path) for path in paths]
+    duplicates = sorted({label for label in labels if labels.count(label) > 1})
+    if duplicates:
+        raise ValueError(f"Instance databases must have unique file names, found duplicates {duplicates}.")
+
+    for path in paths:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Database file '{os.path.abspath(path)}' not found.")
+
+    summary = {"imported": [], "skipped": [], "removed": []}
+
+    # URI filenames are enabled so the instance databases can be attached read-only
+    connection = sqlite3.connect(out_path, uri=True)
+    try:
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS %s (db_instance TEXT PRIMARY KEY, instance_path TEXT, "
+                "instance_mtime_ns INTEGER, instance_size INTEGER, instance_position INTEGER)" % _quote(MANIFEST_TABLE)
+            )
+
+        manifest = {
+            label: (instance_path, mtime_ns, size)
+            for label, instance_path, mtime_ns, size in connection.execute(
+                "SELECT db_instance, instance_path, instance_mtime_ns, instance_size FROM %s" % _quote(MANIFEST_TABLE)
+            )
+        }
+
+        for label in sorted(set(manifest) - set(labels)):
+            with connection:
+                _delete_instance(connection, label)
+            summary["removed"].append(label)
+
+        for position, (label, path) in enumerate(zip(labels, paths)):
+            database_path = os.path.abspath(path)
+            stat = os.stat(database_path)
+            fingerprint = (database_path, stat.st_mtime_ns, stat.st_size)
+
+            if manifest.get(label) == fingerprint:
+                with connection:
+                    connection.execute(
+                        "UPDATE %s SET instance_position = ? WHERE db_instance = ?" % _quote(MANIFEST_TABLE),
+                        (position, label),
+                    )
+                summary["skipped"].append(label)
+                continue
+
+            _import_instance(connection, label, database_path, tables)
+
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO %s VALUES (?, ?, ?, ?, ?)" % _quote(MANIFEST_TABLE),
+                    (label, *fingerprint, position),
+                )
+            summary["imported"].append(label)
+
+        connection.execute("PRAGMA optimize")
+    finally:
+        connection.close()
+
+    return summary
+
+
+def _warehouse_tables(connection):
+    return [
+        name
+        for name, in connection.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")
+        if name != MANIFEST_TABLE and not name.startswith("sqlite_")
+    ]
+
+
+def _delete_instance(connection, label):
+    """
+    Deletes the rows of an instance from every warehouse table and from the manifest.
+    """
+    for table in _warehouse_tables(connection):
+        connection.execute("DELETE FROM main.%s WHERE db_instance = ?" % _quote(table), (label,))
+
+    connection.execute("DELETE FROM main.%s WHERE db_instance = ?" % _quote(MANIFEST_TABLE), (label,))
+
+
+def _import_instance(connection, label, database_path, tables=None):
+    """
+    Replaces the rows of an instance in the warehouse with the tables of its database, in one transaction.
+    """
+    connection.execute("ATTACH DATABASE ? AS source", (database_uri(database_path, read_only=True, immutable=False),))
+    try:
+        with connection:
+            _delete_instance(connection, label)
+
+            source_tables = [
+                name
+                for name, in connection.execute("SELECT name FROM source.sqlite_master WHERE type = 'table'")
+                if not name.startswith("sqlite_") and (tables is None or name in tables)
+            ]
+
+            for table in source_tables:
+                columns = [
+                    (name, declared_type)
+                    for _, name, declared_type, *_ in connection.execute("PRAGMA source.table_info(%s)" % _quote(table))
+                ]
+                _ensure_table(connection, table, columns)
+
+                names = ", ".join(_quote(name) for name, _ in columns)
+                connection.execute(
+                    "INSERT INTO main.%s (%s, db_instance) SELECT %s, ? FROM source.%s ORDER BY rowid"
+                    % (_quote(table), names, names, _quote(table)),
+                    (label,),
+                )
+    finally:
+        connection.execute("DETACH DATABASE source")
+
+
+def _ensure_table(connection, table, columns):
+    """
+    Creates the warehouse table and its indexes, or adds the columns it is missing.
+    """
+    existing = [name for _, name, *_ in connection.execute("PRAGMA main.table_info(%s)" % _quote(table))]
+
+    if not existing:
+        definitions = ", ".join("%s %s" % (_quote(name), declared_type) for name, declared_type in columns)
+        connection.execute("CREATE TABLE main.%s (%s, db_instance TEXT)" % (_quote(table), definitions))
+        existing = [name for name, _ in columns] + ["db_instance"]
+    else:
+        for name, declared_type in columns:
+            if name not in existing:
+                connection.execute("ALTER TABLE main.%s ADD COLUMN %s %s" % (_quote(table), _quote(name), declared_type))
+                existing.append(name)
+
+    scenario_column = next((column for column in SCENARIO_COLUMNS if column in existing), None)
+    year_column = next((column for column in YEAR_COLUMNS if column in existing), None)
+
+    # db_instance alone serves incremental deletes and instance filters; the composite index serves scenario and year filters
+    indexes = {"db_instance": ["db_instance"]}
+    if scenario_column is not None or year_column is not None:
+        indexes["scenarios_instance_year"] = [
+            column for column in (scenario_column, "db_instance", year_column) if column is not None
+        ]
+
+    for suffix, index_columns in indexes.items():
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS main.%s ON %s (%s)"
+            % (_quote(f"{table}_{suffix}"), _quote(table), ", ".join(_quote(column) for column in index_columns))
+        )
@@ -0,0 +1,183 @@
+"""
+Table Writer Module
+===================
+This module contains the TableWriter class which is used to write output tables to disk as CSV, gzipped CSV, Parquet or
+Feather files, either from a whole DataFrame or chunk by chunk.
+
+Parquet and Feather output requires the optional pyarrow dependency.
+"""
+import pandas as pd
+import gzip
+import uuid
+import os
+
+FORMATS = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet", "feather": ".feather"}
+
+
+class TableWriter:
+    """
+    TableWriter class is used to write output tables in one of the supported FORMATS.
+    """
+    @staticmethod
+    def check_format(format):
+        """
+        Raises a ValueError if the format is not supported.
+
+        Parameters:
+            format (str): The output format.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown output format '{format}', expected one of {tuple(FORMATS)}.")
+
+    @staticmethod
+    def write(dataframe, path, format="csv"):
+        """
+        Write a whole table to a file.
+
+        Parameters:
+            dataframe (DataFrame): The table to write.
+            path (str): The path of the output file.
+            format (str): The output format, one of "csv", "csv.gz", "parquet" or "feather".
+
+        Returns:
+            int: The number of rows written.
+        """
+        TableWriter.check_format(format)
+
+        if format == "csv":
+            dataframe.to_csv(path)
+        elif format == "csv.gz":
+            dataframe.to_csv(path, compression="gzip")
+        elif format == "parquet":
+            dataframe.to_parquet(path)
+        else:
+            dataframe.to_feather(path)
+
+        return len(dataframe)
+
+    @staticmethod
+    def write_chunks(chunks, path, format="csv"):
+        """
+        Write a table to a file chunk by chunk, holding one chunk in memory at a time.
+
+        CSV output matches writing the concatenated chunks with write. Parquet chunks are written as row groups and
+        Feather chunks as record batches. Their schema is widened when a later chunk does not fit it, for example when an
+        integer column gains missing values or needs a wider integer dtype. The Parquet and Feather files do not store
+        the index of the chunks, so they read back with a default RangeIndex.
+
+        Parameters:
+            chunks (iterable of DataFrame): The chunks of the table.
+            path (str): The path of the output file.
+            format (str): The output format, one of "csv", "csv.gz", "parquet" or "feather".
+
+        Returns:
+            int: The number of rows written.
+        """
+        TableWriter.check_format(format)
+
+        if format in ("csv", "csv.gz"):
+            return TableWriter._write_csv_chunks(chunks, path, compressed=format == "csv.gz")
+
+        return TableWriter._write_arrow_chunks(chunks, path, format)
+
+    @staticmethod
+    def _write_csv_chunks(chunks, path, compressed=False):
+        rows = 0
+        opener = gzip.open if compressed else open
+
+        with opener(path, "wt", newline="") as file:
+            for chunk in chunks:
+                chunk.to_csv(file, header=rows == 0)
+                rows += len(chunk)
+
+        return rows
+
+    @staticmethod
+    def _write_arrow_chunks(chunks, path, format):
+        """
+        Writes the chunks as row groups or record batches, widening the schema when a chunk does not fit it.
+
+        The chunks are written to a temporary segment file. A chunk whose schema cannot be cast to the schema of the
+        current segment without loss, such as an integer column that gained a missing value and became float, or an
+        int8 column downcast to int16 in a later chunk, starts a new segment with the schemas promoted together. If the
+        chunks spanned several segments, they are then copied batch by batch into one file with the widest schema.
+        """
+        import pyarrow as pa
+
+        rows = 0
+        segments = []
+        schema = None
+        writer = None
+
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+
+                if schema is not None:
+                    promoted = pa.unify_schemas([schema, table.schema], promote_options="permissive")
+                    if not promoted.equals(schema):
+                        writer.close()
+                        writer = None
+                        schema = promoted
+
+                    table = table.cast(schema)
+                else:
+                    schema = table.schema
+
+                if writer is None:
+                    segments.append(f"{path}.{uuid.uuid4().hex}.tmp")
+                    writer = TableWriter._open_arrow_writer(segments[-1], schema, format)
+
+                writer.write_table(table)
+                rows += len(chunk)
+
+            if writer is not None:
+                writer.close()
+                writer = None
+
+            if not segments:
+                TableWriter.write(pd.DataFrame(), path, format)
+            elif len(segments) == 1:
+                os.replace(segments[0], path)
+            else:
+                # The last segment has the widest schema, as each segment promotes the schema of the one before
+                writer = TableWriter._open_arrow_writer(path, schema, format)
+                for segment in segments:
+                    for batch in TableWriter._read_arrow_batches(segment, format):
+                        writer.write_table(pa.Table.from_batches([batch]).cast(schema))
+        finally:
+            if writer is not None:
+                writer.close()
+
+            for segment in segments:
+                if os.path.exists(segment):
+                    os.remove(segment)
+
+        return rows
+
+    @staticmethod
+    def _open_arrow_writer(path, schema, format):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if format == "parquet":
+            return pq.ParquetWriter(path, schema)
+
+        return pa.ipc.new_file(path, schema)
+
+    @staticmethod
+    def _read_arrow_batches(path, format):
+        """
+        Yields the record batches of a Parquet or Feather file, one at a time.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if format == "parquet":
+            yield from pq.ParquetFile(path).iter_batches()
+            return
+
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for position in range(reader.num_record_batches):
+                yield reader.get_batch(position)
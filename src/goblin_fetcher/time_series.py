@@ -6,7 +6,90 @@ This module contains the TimeSeries class which is used to generate time series
 """
 import pandas as pd
 import numpy as np
-import itertools
+
+
+def _ordered_group_sum(df, keys, column):
+    """
+    Sums a column within groups of keys, adding the values of each group in row order.
+
+    This matches summing each group separately with Series.sum. groupby().sum() uses compensated summation, which can
+    differ from it in the last bit.
+    """
+    codes, groups = pd.MultiIndex.from_frame(df[keys]).factorize()
+    sums = np.zeros(len(groups))
+
+    if len(codes):
+        values = df[column].to_numpy(dtype=float)
+        positions = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+
+        # Add the n-th value of every group at once, so each group is still summed first to last
+        for position in range(positions.max() + 1):
+            selected = positions == position
+            sums[codes[selected]] += values[selected]
+
+    return pd.Series(sums, index=groups)
+
+
+def _scenario_list(scenario_df):
+    """
+    Returns the scenarios in order of first appearance. Integer scenarios are returned as int64 values, so the scenario
+    index level stays int64 also when the column has been downcast by a dtype policy; other dtypes are kept as they are.
+    """
+    scenarios = scenario_df["Scenarios"].unique()
+    if pd.api.types.is_integer_dtype(scenarios.dtype):
+        scenarios = scenarios.astype(np.int64)
+
+    return list(scenarios)
+
+
+def _instance_labels(df):
+    """
+    Returns the db_instance labels in order of first appearance, as an object array also when the column is categorical.
+    """
+    return np.asarray(df["db_instance"].unique(), dtype=object)
+
+
+def _reindex_rows(frame, index, description):
+    """
+    Reindexes frame to index, raising a ValueError if an entry of index has no row, as looking up each row did.
+    """
+    missing = ~index.isin(frame.index)
+    if missing.any():
+        raise ValueError(f"No {description} row for {index[missing][0]!r}.")
+
+    return frame.reindex(index)
+
+
+def _interpolate_endpoints(frame):
+    """
+    Linearly interpolates each row between its first and last column.
+
+    This gives the same values as frame.interpolate(axis=1, method='linear', limit_direction='forward') when only the
+    endpoints are set, but computes all rows in one array operation. Rows with a missing endpoint are left to pandas.
+    """
+    values = frame.to_numpy(dtype=float, copy=True)
+    steps = values.shape[1] - 1
+
+    if steps < 2:
+        return pd.DataFrame(values, index=frame.index, columns=frame.columns)
+
+    start = values[:, :1]
+    end = values[:, -1:]
+    complete = ~(np.isnan(start) | np.isnan(end)).ravel()
+
+    # Same arithmetic as numpy.interp, which pandas uses for linear interpolation
+    slope = (end[complete] - start[complete]) / steps
+    values[complete, 1:-1] = slope * np.arange(1, steps, dtype=float) + start[complete]
+
+    interpolated = pd.DataFrame(values, index=frame.index, columns=frame.columns)
+
+    if not complete.all():
+        interpolated.iloc[~complete] = frame.iloc[~complete].astype(float).interpolate(
+            axis=1, method='linear', limit_direction='forward'
+        )
+
+    return interpolated
+
 
 class TimeSeries:
     """
@@ -25,95 +108,78 @@ class TimeSeries:
 
         Returns:
             DataFrame: A dataframe of total emissions for each scenario.
+
+        Raises:
+            ValueError: If an instance has no baseline "total" land use row at the baseline year.
         """
         # year range
         years = list(range(baseline_year, target_year + 1))
 
-        default_scenario_list = list(scenario_df["Scenarios"].unique())
+        default_scenario_list = _scenario_list(scenario_df)
 
         baseline_index = -1
 
-        scenario_list_extended = [baseline_index]
-        scenario_list_extended.extend(list(scenario_df["Scenarios"].unique()))
-
         gases = ["CH4", "N2O", "CO2", "CO2e"]
-        instances = landuse_df.db_instance.unique()
+        instances = _instance_labels(landuse_df)
 
         CH4_conversion = 28
         N2O_conversion = 265
 
-        #empty land use dataframe
         # Create the MultiIndex
         land_multiindex = pd.MultiIndex.from_product([default_scenario_list, instances, gases], names=['scenario', 'instance','gas'])
 
-        land_use_time_series = pd.DataFrame(index=land_multiindex, columns=years)
-
-        # land use data 
-        for (instance, sc, gas, year) in itertools.product(instances, default_scenario_list, gases, years):
-
-            CO2_land_mask_2050 = (
-                (landuse_df.Scenarios == sc)
-                & (landuse_df.db_instance == instance)
-                & ((landuse_df["land_use"] == "cropland")
-                | (landuse_df["land_use"] == "grassland")
-                | (landuse_df["land_use"] == "wetland"))
-                & (landuse_df["year"] == target_year)
-            )
-                                    
-            CO2_land_mask = (
-                (landuse_df.Scenarios == baseline_index)
-                & (landuse_df.db_instance == instance)
-                & ((landuse_df["land_use"] == "cropland")
-                | (landuse_df["land_use"] == "grassland")
-                | (landuse_df["land_use"] == "wetland"))
-                & (landuse_df["year"] == baseline_year)
-            )
-
-            default_mask = (
-                (landuse_df.Scenarios == baseline_index)
-                & (landuse_df.db_instance == instance)
-                & (landuse_df["land_use"] == "total")
-                & (landuse_df["year"] == baseline_year)
-            )
-
-            default_mask_2050 = (
-                (landuse_df.Scenarios == baseline_index)
-                & (landuse_df.db_instance == instance)
-                & (landuse_df["land_use"] == "total")
-                & (landuse_df["year"] == baseline_year)
-            )
-     
-            if year == baseline_year:
-                if gas == "CO2":
-                    emission_value = landuse_df.loc[CO2_land_mask, gas].sum()
-                else:
-                    emission_value = landuse_df.loc[default_mask, gas].item()
-
-            elif year == target_year:
-                if gas == "CO2":
-                    emission_value = landuse_df.loc[CO2_land_mask_2050, gas].sum()
-                else:
-                    emission_value = landuse_df.loc[default_mask_2050, gas].item()
-               
+        endpoints = landuse_df[landuse_df["year"].isin([baseline_year, target_year])]
+
+        # CO2 is the sum of the cropland, grassland and wetland sectors; other gases are taken from the baseline total
+        sector_CO2 = _ordered_group_sum(
+            endpoints[endpoints["land_use"].isin(["cropland", "grassland", "wetland"])],
+            ["Scenarios", "db_instance", "year"],
+            "CO2",
+        )
+
+        baseline_CO2 = sector_CO2.reindex(
+            pd.MultiIndex.from_product([[baseline_index], instances, [baseline_year]]), fill_value=0
+        ).to_numpy()
+
+        target_CO2 = sector_CO2.reindex(
+            pd.MultiIndex.from_product([default_scenario_list, instances, [target_year]]), fill_value=0
+        ).to_numpy().reshape(len(default_scenario_list), len(instances))
+
+        baseline_totals = (
+            endpoints[
+                (endpoints.Scenarios == baseline_index)
+                & (endpoints["land_use"] == "total")
+                & (endpoints["year"] == baseline_year)
+            ]
+            .set_index("db_instance")
+        )
+        baseline_totals = _reindex_rows(baseline_totals, pd.Index(instances), "baseline land use total")
+
+        # values[scenario, instance, gas, year]
+        values = np.full((len(default_scenario_list), len(instances), len(gases), len(years)), np.nan)
+
+        for gas_index, gas in enumerate(gases):
+            if gas == "CO2":
+                values[:, :, gas_index, -1] = target_CO2
+                values[:, :, gas_index, 0] = baseline_CO2
             else:
-                emission_value = np.nan
-
+                values[:, :, gas_index, -1] = baseline_totals[gas].to_numpy()
+                values[:, :, gas_index, 0] = baseline_totals[gas].to_numpy()
 
-            land_use_time_series.loc[(sc, instance, gas), year] = emission_value
+        land_use_time_series = pd.DataFrame(values.reshape(len(land_multiindex), len(years)), index=land_multiindex, columns=years)
 
-    
         # Apply linear interpolation to fill in NaN values along each row
-        land_use_time_series = land_use_time_series.astype(float).interpolate(axis=1, method='linear', limit_direction='forward')
-        
+        land_use_time_series = _interpolate_endpoints(land_use_time_series)
+
         # Calculate CO2e and add it to the DataFrame
-        for year in years:
-            for sc in default_scenario_list:
-                for instance in instances:
-                    CO2 = land_use_time_series.loc[(sc, instance, "CO2"), year]
-                    CH4 = land_use_time_series.loc[(sc, instance, "CH4"), year] * CH4_conversion
-                    N2O = land_use_time_series.loc[(sc, instance, "N2O"), year] * N2O_conversion
-                    CO2e = CO2 + CH4 + N2O
-                    land_use_time_series.loc[(sc, instance, "CO2e"), year] = CO2e
+        values = land_use_time_series.to_numpy().reshape(values.shape)
+
+        CO2 = values[:, :, gases.index("CO2")]
+        CH4 = values[:, :, gases.index("CH4")] * CH4_conversion
+        N2O = values[:, :, gases.index("N2O")] * N2O_conversion
+        values[:, :, gases.index("CO2e")] = CO2 + CH4 + N2O
+
+        land_use_time_series.iloc[:, :] = values.reshape(len(land_multiindex), len(years))
 
         return land_use_time_series
     
@@ -131,52 +197,55 @@ class TimeSeries:
 
         Returns:
             DataFrame: A dataframe of total emissions for each scenario.
+
+        Raises:
+            ValueError: If an instance has no livestock row for the baseline or for one of the scenarios.
         """
         # year range
         years = list(range(baseline_year, target_year + 1))
 
-        default_scenario_list = list(scenario_df["Scenarios"].unique())
+        default_scenario_list = _scenario_list(scenario_df)
 
         baseline_index = -1
 
-        scenario_list_extended = [baseline_index]
-        scenario_list_extended.extend(list(scenario_df["Scenarios"].unique()))
-
         gases = ["CH4", "N2O", "CO2", "CO2e"]
-        instances = livestock_df.db_instance.unique()
+        instances = _instance_labels(livestock_df)
 
         CH4_conversion = 28
         N2O_conversion = 265
 
 
-        #empty land use dataframe
         # Create the MultiIndex
         livestock_multiindex = pd.MultiIndex.from_product([default_scenario_list, instances, gases], names=['scenario', 'instance','gas'])
 
-        livesetock_time_series = pd.DataFrame(index=livestock_multiindex, columns=years)
+        emissions = livestock_df.set_index(["Scenarios", "db_instance"])[gases]
 
-        for (instance, sc, gas, year) in itertools.product(instances, default_scenario_list, gases, years):
-            if year == baseline_year:
-                mask = ((livestock_df.Scenarios == baseline_index) & (livestock_df.db_instance == instance))
-                emission_value = livestock_df.loc[mask, gas].item()
-            elif year == target_year:
-                mask = ((livestock_df.Scenarios == sc) & (livestock_df.db_instance == instance))
-                emission_value = livestock_df.loc[mask, gas].item()
-            else:
-                emission_value = np.nan
+        baseline_emissions = _reindex_rows(
+            emissions, pd.MultiIndex.from_product([[baseline_index], instances]), "livestock emissions"
+        ).to_numpy()
+        target_emissions = _reindex_rows(
+            emissions, pd.MultiIndex.from_product([default_scenario_list, instances]), "livestock emissions"
+        ).to_numpy()
 
-            livesetock_time_series.loc[(sc, instance, gas), year] = emission_value
+        # values[scenario, instance, gas, year]
+        values = np.full((len(default_scenario_list), len(instances), len(gases), len(years)), np.nan)
+        values[..., -1] = target_emissions.reshape(len(default_scenario_list), len(instances), len(gases))
+        values[..., 0] = baseline_emissions
+
+        livesetock_time_series = pd.DataFrame(values.reshape(len(livestock_multiindex), len(years)), index=livestock_multiindex, columns=years)
 
         # Apply linear interpolation to fill in NaN values along each row
-        livesetock_time_series = livesetock_time_series.astype(float).interpolate(axis=1, method='linear', limit_direction='forward')
+        livesetock_time_series = _interpolate_endpoints(livesetock_time_series)
 
         # Calculate CO2e and add it to the DataFrame
-        for (year, sc, instance) in itertools.product(years, default_scenario_list, instances):
-            CO2 = livesetock_time_series.loc[(sc, instance, "CO2"), year]
-            CH4 = livesetock_time_series.loc[(sc, instance, "CH4"), year] * CH4_conversion
-            N2O = livesetock_time_series.loc[(sc, instance, "N2O"), year] * N2O_conversion
-            CO2e = CO2 + CH4 + N2O
-            livesetock_time_series.loc[(sc, instance, "CO2e"), year] = CO2e
+        values = livesetock_time_series.to_numpy().reshape(values.shape)
+
+        CO2 = values[:, :, gases.index("CO2")]
+        CH4 = values[:, :, gases.index("CH4")] * CH4_conversion
+        N2O = values[:, :, gases.index("N2O")] * N2O_conversion
+        values[:, :, gases.index("CO2e")] = CO2 + CH4 + N2O
+
+        livesetock_time_series.iloc[:, :] = values.reshape(len(livestock_multiindex), len(years))
 
         return livesetock_time_series
     
@@ -201,26 +270,24 @@ class TimeSeries:
         # year range
         years = list(range(baseline_year, target_year + 1))
 
-        default_scenario_list = list(scenario_df["Scenarios"].unique())
+        default_scenario_list = _scenario_list(scenario_df)
 
         gas = ["CO2e"]
-        instances = forest_carbon_df.db_instance.unique()
+        instances = _instance_labels(forest_carbon_df)
 
-        #empty land use dataframe
         # Create the MultiIndex
         forest_multiindex = pd.MultiIndex.from_product([default_scenario_list, instances, gas], names=['scenario', 'instance','gas'])
 
-        forest_time_series = pd.DataFrame(index=forest_multiindex, columns=years)
-
-        for (instance, sc, year) in itertools.product(instances, default_scenario_list, years):
-            mask = ((forest_carbon_df.Scenario == sc) & (forest_carbon_df.db_instance == instance) & (forest_carbon_df["Year"] == year))
+        total_ecosystem = (
+            forest_carbon_df.set_index(["Scenario", "db_instance", "Year"])["Total Ecosystem"]
+            .reindex(pd.MultiIndex.from_product([default_scenario_list, instances, years]))
+            .to_numpy()
+        )
 
-            if mask.any():
-                emission_value = forest_carbon_df.loc[mask, "Total Ecosystem"].item() * CO2e_conversion * t_to_kt
-            else:
-                emission_value = np.nan
+        values = total_ecosystem.reshape(len(forest_multiindex), len(years)) * CO2e_conversion * t_to_kt
 
-            forest_time_series.loc[(sc, instance, gas), year] = emission_value
+        # Kept as object dtype, as returned by the cell by cell implementation
+        forest_time_series = pd.DataFrame(values, index=forest_multiindex, columns=years).astype(object)
 
         return forest_time_series
     
@@ -240,6 +307,10 @@ class TimeSeries:
 
         Returns:
             DataFrame: A dataframe of total emissions for each scenario.
+
+        Raises:
+            ValueError: If an instance of the land use data has no livestock or forest row for the baseline or for one
+                of the scenarios.
         """
         land_use_time_series = TimeSeries.get_land_use_emissions_time_series(baseline_year, target_year, scenario_df, landuse_df)
         livestock_time_series = TimeSeries.get_livestock_emissions_time_series(baseline_year, target_year, scenario_df, livestock_df)
@@ -247,42 +318,51 @@ class TimeSeries:
 
         land_uses = ["Agriculture", "Other Land Use", "Forestry", "Total"]
         gases = ["CH4", "N2O", "CO2", "CO2e"]
-        default_scenario_list = list(scenario_df["Scenarios"].unique())
-        instances = landuse_df.db_instance.unique()
+        default_scenario_list = _scenario_list(scenario_df)
+        instances = _instance_labels(landuse_df)
 
         years = list(range(baseline_year, target_year + 1))
 
         # Create the MultiIndex
         total_multiindex = pd.MultiIndex.from_product([default_scenario_list, instances, land_uses, gases], names=['scenario', 'instance', 'land_use', 'gas'])
 
-        total_time_series = pd.DataFrame(index=total_multiindex, columns=years)
-
-        for (landuse, instance, sc, gas, year) in itertools.product(land_uses, instances, default_scenario_list, gases, years):
-            if landuse == "Agriculture":
-                land_use_mask = (livestock_time_series.index.get_level_values("scenario") == sc) & (livestock_time_series.index.get_level_values("instance") == instance) & (livestock_time_series.index.get_level_values("gas") == gas)
-                emission_value = livestock_time_series.loc[land_use_mask, year].item()
-            elif landuse == "Other Land Use":
-                land_use_mask = (land_use_time_series.index.get_level_values("scenario") == sc) & (land_use_time_series.index.get_level_values("instance") == instance) & (land_use_time_series.index.get_level_values("gas") == gas)
-                emission_value = land_use_time_series.loc[land_use_mask, year].item()
-            elif landuse == "Forestry":
-                if gas == "CO2e" or gas == "CO2":
-                    land_use_mask = (forest_time_series.index.get_level_values("scenario") == sc) & (forest_time_series.index.get_level_values("instance") == instance) & (forest_time_series.index.get_level_values("gas") == "CO2e")
-                    emission_value = forest_time_series.loc[land_use_mask, year].item()
-                else:
-                    emission_value = 0
-            else:
-                emission_value = np.nan
+        sector_index = pd.MultiIndex.from_product([default_scenario_list, instances, gases])
+        sector_shape = (len(default_scenario_list), len(instances), len(gases), len(years))
+
+        # values[scenario, instance, land_use, gas, year]
+        values = np.empty((len(default_scenario_list), len(instances), len(land_uses), len(gases), len(years)))
+
+        values[:, :, 0] = (
+            _reindex_rows(livestock_time_series, sector_index, "livestock time series")
+            .to_numpy(dtype=float)
+            .reshape(sector_shape)
+        )
+        values[:, :, 1] = (
+            _reindex_rows(land_use_time_series, sector_index, "land use time series")
+            .to_numpy(dtype=float)
+            .reshape(sector_shape)
+        )
+
+        # Forestry only reports CO2e, which is used for both CO2 and CO2e
+        forest_CO2e = (
+            _reindex_rows(
+                forest_time_series.xs("CO2e", level="gas"),
+                pd.MultiIndex.from_product([default_scenario_list, instances]),
+                "forest time series",
+            )
+            .to_numpy(dtype=float)
+            .reshape(len(default_scenario_list), len(instances), len(years))
+        )
+        for gas_index, gas in enumerate(gases):
+            values[:, :, 2, gas_index] = forest_CO2e if gas in ("CO2", "CO2e") else 0
 
-            total_time_series.loc[(sc, instance, landuse, gas), year] = emission_value
+        values[:, :, 3] = values[:, :, :3].sum(axis=2)
 
+        # Kept as object dtype, with integer zeros for the forestry gases it does not report, as returned by the cell by
+        # cell implementation
+        total_values = values.astype(object)
+        total_values[:, :, 2, [gases.index("CH4"), gases.index("N2O")]] = 0
 
-        # Calculate totals after filling the other categories
-        for (instance, sc, gas, year) in itertools.product(instances, default_scenario_list, gases, years):
-            total = 0
-            for landuse in ['Agriculture', 'Other Land Use', 'Forestry']:
-                total += total_time_series.loc[(sc, instance, landuse, gas), year]
-            total_time_series.loc[(sc, instance, 'Total', gas), year] = total
+        total_time_series = pd.DataFrame(total_values.reshape(len(total_multiindex), len(years)), index=total_multiindex, columns=years)
 
         return total_time_series
-        
-
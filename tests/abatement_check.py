@@ -1,5 +1,8 @@
 import unittest
 from goblin_fetcher.goblin_fetcher import DataFetcher
+from goblin_fetcher.abatement import Abate
+from contextlib import redirect_stdout
+import io
 import os
 import pandas as pd
 
@@ -104,6 +107,65 @@ class TestClimateAbateLivestock(unittest.TestCase):
                     self.assertLess(actual, expected)
 
 
+    def test_climate_change_total_abated_missing_matches(self):
+        scenario_df = self.fetcher.get_scenario_inputs()
+        livestock_df = self.fetcher.get_climate_change_animal_emissions_aggregated()
+        landcover_df = self.fetcher.get_landuse_emissions_totals()
+
+        # Drop the baseline land use rows of one instance
+        landcover_df = landcover_df[~((landcover_df.Scenarios == -1) & (landcover_df.db_instance == "instance_1"))]
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            abated_emissions = Abate.climate_total_abated(2020, 2050, scenario_df, livestock_df, landcover_df, self.rate)
+
+        self.assertEqual(output.getvalue().count("Warning"), 1)
+        self.assertEqual(len(abated_emissions[abated_emissions.db_instance == "instance_1"]), 100)
+        self.assertEqual(len(abated_emissions[abated_emissions.db_instance == "instance_0"]), 101)
+
+
+    def test_climate_change_total_abated_duplicate_keys(self):
+        scenario_df = self.fetcher.get_scenario_inputs()
+        livestock_df = self.fetcher.get_climate_change_animal_emissions_aggregated()
+        landcover_df = self.fetcher.get_landuse_emissions_totals()
+
+        with self.assertRaises(pd.errors.MergeError):
+            Abate.climate_total_abated(
+                2020, 2050, scenario_df, pd.concat([livestock_df, livestock_df.iloc[:1]]), landcover_df, self.rate
+            )
+
+        with self.assertRaises(pd.errors.MergeError):
+            Abate.climate_total_abated(
+                2020, 2050, scenario_df, livestock_df, pd.concat([landcover_df, landcover_df]), self.rate
+            )
+
+
+    def test_climate_abate_livestock_sweep(self):
+        rates = [0.0, 0.15, 0.3]
+        gwps = [(28, 265), (27.2, 273)]
+
+        livestock_df = self.fetcher.get_climate_change_animal_emissions_aggregated()
+        sweep = Abate.climate_abate_livestock_rates(livestock_df, rates, gwps)
+
+        # The input is left unchanged
+        pd.testing.assert_frame_equal(livestock_df, self.fetcher.get_climate_change_animal_emissions_aggregated())
+        self.assertEqual(len(sweep), len(rates) * len(gwps) * len(livestock_df))
+
+        for rate in rates:
+            for CH4, N2O in gwps:
+                expected = self.fetcher.get_abated_climate_change_animal_emissions_aggregated(rate, CH4, N2O)
+                pd.testing.assert_frame_equal(sweep.loc[(rate, CH4, N2O)], expected, check_names=False, check_exact=True)
+
+
+    def test_eutrophication_abate_sweep(self):
+        rates = [0.1, 0.3]
+        sweep = self.fetcher.get_abated_eutrophication_emission_totals_sweep(rates)
+
+        for rate in rates:
+            expected = self.fetcher.get_abated_eutrophication_emission_totals(rate)
+            pd.testing.assert_frame_equal(sweep.loc[rate], expected, check_names=False, check_exact=True)
+
+
         
 if __name__ == "__main__":
     unittest.main()
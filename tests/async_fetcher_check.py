@@ -0,0 +1,63 @@
+import unittest
+from goblin_fetcher.async_fetcher import AsyncDataFetcher
+from goblin_fetcher.goblin_fetcher import DataFetcher
+import pandas as pd
+import threading
+import asyncio
+import os
+
+
+class TestAsyncDataFetcher(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.path = [os.path.join("./data", "instance_0.db"), os.path.join("./data", "instance_1.db")]
+        self.expected = DataFetcher(self.path, cache_bytes=None)
+
+    def tearDown(self):
+        self.expected.close()
+
+
+    async def test_coroutines_match_data_fetcher(self):
+        async with AsyncDataFetcher(self.path, max_concurrency=2, cache_bytes=None) as fetcher:
+            inputs, flux, totals = await asyncio.gather(
+                fetcher.get_scenario_inputs(),
+                fetcher.get_forest_flux(years=[2020]),
+                fetcher.get_climate_totals_time_series(2020, 2050),
+            )
+
+            pd.testing.assert_frame_equal(inputs, self.expected.get_scenario_inputs())
+            pd.testing.assert_frame_equal(flux, self.expected.get_forest_flux(years=[2020]))
+            pd.testing.assert_frame_equal(totals, self.expected.get_climate_totals_time_series(2020, 2050))
+
+            tables = await fetcher.get_tables(["scenario_inputs", "forest_flux", "landuse_areas"])
+            self.assertListEqual(list(tables), ["scenario_inputs", "forest_flux", "landuse_areas"])
+            pd.testing.assert_frame_equal(tables["landuse_areas"], self.expected.get_landuse_areas())
+
+            chunks = [chunk async for chunk in fetcher.iter_climate_change_crop_emissions_by_category(chunksize=7)]
+            pd.testing.assert_frame_equal(
+                pd.concat(chunks), pd.concat(self.expected.iter_climate_change_crop_emissions_by_category(chunksize=7))
+            )
+
+
+    async def test_cancelled_read_does_not_run(self):
+        async with AsyncDataFetcher(self.path, max_concurrency=1, cache_bytes=None) as fetcher:
+            # Occupy the only thread so the read stays queued until it is cancelled
+            release = threading.Event()
+            blocker = asyncio.ensure_future(fetcher._run(release.wait))
+
+            task = asyncio.ensure_future(fetcher.get_scenario_inputs())
+            await asyncio.sleep(0)
+            task.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            release.set()
+            await blocker
+
+            self.assertEqual(len(fetcher.fetcher.data_manager_class._engines), 0)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,384 @@
+import unittest
+from goblin_fetcher.resource_manager.database_manager import DataManager
+from goblin_fetcher.resource_manager.table_cache import TableCache
+from goblin_fetcher.resource_manager.disk_cache import DiskCache
+import pandas as pd
+import sqlalchemy as sqa
+import tempfile
+import importlib.util
+import shutil
+import os
+
+
+class TestDataManager(unittest.TestCase):
+
+    def setUp(self):
+        self.path = [os.path.join("./data", "instance_0.db"), os.path.join("./data", "instance_1.db")]
+        self.data_manager = DataManager(self.path)
+
+    def tearDown(self):
+        self.data_manager.close()
+
+
+    def test_engines_are_reused(self):
+        self.data_manager.get_goblin_results_output_datatable("climate_change_totals", index_col="index")
+        engines = dict(self.data_manager._engines)
+
+        self.data_manager.get_goblin_results_output_datatable("eutrophication_totals", index_col="index")
+
+        self.assertEqual(len(engines), 2)
+        for key, engine in self.data_manager._engines.items():
+            self.assertIs(engine, engines[key])
+
+
+    def test_close(self):
+        with DataManager(self.path) as data_manager:
+            data = data_manager.get_goblin_results_output_datatable("climate_change_totals", index_col="index")
+            self.assertEqual(len(data_manager._engines), 2)
+
+        self.assertEqual(len(data_manager._engines), 0)
+        self.assertListEqual(list(data.db_instance.unique()), ["instance_0", "instance_1"])
+
+
+    def test_parallel_backends_match_sequential(self):
+        # List the second instance first to check the results follow database_paths rather than completion order
+        paths = list(reversed(self.path))
+        expected = DataManager(paths).get_goblin_results_output_datatable("climate_change_landuse", index_col="scenario")
+
+        for backend in ["thread", "process"]:
+            with DataManager(paths, max_workers=2, backend=backend) as data_manager:
+                data = data_manager.get_goblin_results_output_datatable("climate_change_landuse", index_col="scenario")
+
+            pd.testing.assert_frame_equal(data, expected)
+            self.assertListEqual(list(data.db_instance.unique()), ["instance_1", "instance_0"])
+
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            DataManager(self.path, max_workers=2, backend="cluster")
+
+
+
+    def test_cache_returns_copies(self):
+        data = self.data_manager.get_goblin_results_output_datatable("climate_change_livestock_aggregated", index_col="index")
+        data["CH4"] = 0
+
+        cached = self.data_manager.get_goblin_results_output_datatable("climate_change_livestock_aggregated", index_col="index")
+
+        self.assertEqual(len(self.data_manager.cache), 1)
+        self.assertFalse((cached["CH4"] == 0).all())
+
+
+    def test_cache_invalidated_when_database_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [shutil.copy(path, directory) for path in self.path]
+
+            with DataManager(paths) as data_manager:
+                before = data_manager.get_goblin_results_output_datatable("climate_change_totals", index_col="index")
+
+                # Replace the first instance with the second, which changes the file modification time
+                shutil.copy(self.path[1], paths[0])
+                os.utime(paths[0], ns=(0, 0))
+                after = data_manager.get_goblin_results_output_datatable("climate_change_totals", index_col="index")
+
+        first = before.db_instance == "instance_0"
+        self.assertFalse(before.loc[first, "CO2e"].equals(before.loc[~first, "CO2e"]))
+        self.assertTrue(after.loc[first, "CO2e"].reset_index(drop=True).equals(after.loc[~first, "CO2e"].reset_index(drop=True)))
+
+
+    def test_cache_evicts_least_recently_used(self):
+        frame = pd.DataFrame({"value": range(100)})
+        nbytes = frame.memory_usage(index=True, deep=True).sum()
+        cache = TableCache(2 * nbytes)
+
+        cache.put("a", (), frame)
+        cache.put("b", (), frame)
+        cache.get("a", ())
+        cache.put("c", (), frame)
+
+        self.assertIsNotNone(cache.get("a", ()))
+        self.assertIsNone(cache.get("b", ()))
+        self.assertIsNotNone(cache.get("c", ()))
+        self.assertIsNone(cache.get("c", ("changed",)))
+        self.assertEqual(cache.size, nbytes)
+
+
+    def test_iter_table_matches_full_read(self):
+        for table, index_col in [("climate_change_livestock_disaggregated", "index"), ("per_hectare_stocking_rate", None)]:
+            expected = self.data_manager.get_goblin_results_output_datatable(table, index_col=index_col)
+            chunks = list(self.data_manager.iter_table(table, index_col=index_col, chunksize=7))
+
+            self.assertTrue(all(len(chunk) <= 7 for chunk in chunks))
+            pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+        filtered = self.data_manager.iter_table("climate_change_landuse", index_col="scenario", chunksize=5, years=[2050])
+        self.assertTrue(all((chunk.year == 2050).all() for chunk in filtered))
+
+
+    def test_get_many_reads_each_database_once(self):
+        tables = {
+            "totals": "climate_change_totals",
+            "land": {"table": "climate_change_landuse", "index_col": "scenario", "years": [2050], "db_instances": ["instance_0"]},
+            "forest": {"table": "forest_carbon_flux", "index_col": "index"},
+        }
+
+        with DataManager(self.path, max_workers=2) as data_manager:
+            connections = []
+            for path in self.path:
+                sqa.event.listen(data_manager.get_engine(path), "engine_connect", connections.append)
+
+            frames = data_manager.get_many(tables)
+
+            self.assertEqual(len(connections), 2)
+            self.assertListEqual(list(frames), list(tables))
+
+        pd.testing.assert_frame_equal(frames["totals"], self.data_manager.get_goblin_results_output_datatable("climate_change_totals"))
+        pd.testing.assert_frame_equal(
+            frames["land"],
+            self.data_manager.get_goblin_results_output_datatable("climate_change_landuse", index_col="scenario", years=[2050], db_instances=["instance_0"]),
+        )
+        pd.testing.assert_frame_equal(frames["forest"], self.data_manager.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index"))
+
+
+    def test_add_and_remove_databases(self):
+        queries = [
+            ("climate_change_landuse", "scenario", {}),
+            ("per_hectare_stocking_rate", None, {"scenarios": [0, 3]}),
+            ("forest_carbon_flux", "index", {"years": [2020], "db_instances": ["instance_1"]}),
+        ]
+
+        for options in ({}, {"attach": True}, {"dtypes": "compact"}):
+            with DataManager(self.path[:1], **options) as data_manager, DataManager(self.path, cache_bytes=None, **options) as expected:
+                for table, index_col, filters in queries:
+                    data_manager.get_goblin_results_output_datatable(table, index_col=index_col, **filters)
+
+                connections = []
+                sqa.event.listen(data_manager.get_engine(self.path[0]), "engine_connect", connections.append)
+
+                data_manager.add_databases(self.path[1])
+                self.assertListEqual(data_manager.database_paths, self.path)
+
+                for table, index_col, filters in queries:
+                    pd.testing.assert_frame_equal(
+                        data_manager.get_goblin_results_output_datatable(table, index_col=index_col, **filters),
+                        expected.get_goblin_results_output_datatable(table, index_col=index_col, **filters),
+                    )
+
+                # Only the added database was read
+                self.assertEqual(len(connections), 0)
+
+                data_manager.remove_databases([self.path[0]])
+                expected.remove_databases([self.path[0]])
+                self.assertListEqual(list(data_manager.instances), ["instance_1"])
+                for table, index_col, filters in queries:
+                    pd.testing.assert_frame_equal(
+                        data_manager.get_goblin_results_output_datatable(table, index_col=index_col, **filters),
+                        expected.get_goblin_results_output_datatable(table, index_col=index_col, **filters),
+                    )
+
+
+    def test_add_databases_recategorises_excluded_tables(self):
+        filters = {"db_instances": ["instance_0"]}
+
+        for options in ({}, {"dtypes": "compact"}):
+            with DataManager(self.path[:1], **options) as data_manager:
+                data_manager.get_goblin_results_output_datatable("climate_change_totals", index_col="index", **filters)
+                data_manager.add_databases(self.path[1])
+
+                # The table gains no rows, but its 'db_instance' column matches a fresh read of both databases
+                with DataManager(self.path, cache_bytes=None, **options) as expected:
+                    pd.testing.assert_frame_equal(
+                        data_manager.get_goblin_results_output_datatable("climate_change_totals", index_col="index", **filters),
+                        expected.get_goblin_results_output_datatable("climate_change_totals", index_col="index", **filters),
+                    )
+
+
+    def test_attach_mode_matches_engines(self):
+        # More databases than the default attach limit, so they are read in two groups
+        paths = self.path * 6
+
+        with DataManager(paths, cache_bytes=None) as engines, DataManager(paths, cache_bytes=None, attach=True) as attached:
+            for table, index_col, filters in [
+                ("climate_change_landuse", "scenario", {}),
+                ("per_hectare_stocking_rate", None, {"scenarios": [0, 3]}),
+                ("forest_carbon_flux", "index", {"years": [2020], "db_instances": ["instance_1"]}),
+            ]:
+                pd.testing.assert_frame_equal(
+                    attached.get_goblin_results_output_datatable(table, index_col=index_col, **filters),
+                    engines.get_goblin_results_output_datatable(table, index_col=index_col, **filters),
+                )
+
+            self.assertEqual(len(attached._engines), 0)
+
+
+    def test_read_only_mode(self):
+        with DataManager(self.path, cache_bytes=None, read_only=False) as writable, DataManager(self.path, cache_bytes=None, pragmas={"cache_size": -1024}) as read_only:
+            pd.testing.assert_frame_equal(
+                read_only.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index"),
+                writable.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index"),
+            )
+
+            with read_only.get_engine(self.path[0]).connect() as connection:
+                self.assertEqual(connection.exec_driver_sql("PRAGMA cache_size").scalar(), -1024)
+                self.assertEqual(connection.exec_driver_sql("PRAGMA temp_store").scalar(), 2)
+
+                with self.assertRaises(sqa.exc.OperationalError):
+                    connection.exec_driver_sql("CREATE TABLE read_only_check (x INTEGER)")
+
+
+    def test_db_instance_dtype(self):
+        self.assertDictEqual(
+            self.data_manager.instances, {"instance_0": self.path[0], "instance_1": self.path[1]}
+        )
+
+        # Without a dtype policy the labels are strings, so grouping by them shows only the instances read
+        dataframe = self.data_manager.get_goblin_results_output_datatable("forest_carbon_flux", db_instances=["instance_1"])
+        self.assertEqual(dataframe["db_instance"].dtype, object)
+        self.assertListEqual(list(dataframe.groupby("db_instance").size().index), ["instance_1"])
+
+        for data_manager in (
+            DataManager(self.path, cache_bytes=None, dtypes="compact"),
+            DataManager(self.path[::-1], cache_bytes=None, attach=True, dtypes="compact"),
+        ):
+            with data_manager:
+                dataframe = data_manager.get_goblin_results_output_datatable("forest_carbon_flux", scenarios=[0, 2])
+
+                self.assertEqual(dataframe["db_instance"].dtype, data_manager.instance_dtype())
+                self.assertListEqual(list(dataframe["db_instance"].cat.categories), list(data_manager.instances))
+                self.assertListEqual(list(dataframe["db_instance"].unique()), list(data_manager.instances))
+
+
+    def test_compact_dtypes(self):
+        expected = self.data_manager.get_goblin_results_output_datatable("scenario_animal_data")
+
+        with DataManager(self.path, cache_bytes=None, dtypes="compact") as data_manager:
+            compact = data_manager.get_goblin_results_output_datatable("scenario_animal_data")
+            chunks = list(data_manager.iter_table("scenario_animal_data", chunksize=1000))
+
+        pd.testing.assert_frame_equal(compact, expected, check_dtype=False, check_categorical=False)
+        self.assertListEqual(list(compact["db_instance"].cat.categories), ["instance_0", "instance_1"])
+        self.assertIsInstance(compact["cohort"].dtype, pd.CategoricalDtype)
+        self.assertLess(compact["Scenarios"].dtype.itemsize, expected["Scenarios"].dtype.itemsize)
+        self.assertLess(compact.memory_usage(deep=True).sum() * 3, expected.memory_usage(deep=True).sum())
+
+        # Every chunk shares the db_instance categories, so the chunks concatenate to a categorical column
+        self.assertIsInstance(pd.concat(chunks)["db_instance"].dtype, pd.CategoricalDtype)
+
+        with self.assertRaises(ValueError):
+            DataManager(self.path, dtypes="small")
+
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "requires pyarrow")
+    def test_disk_cache(self):
+        expected = self.data_manager.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index")
+
+        with tempfile.TemporaryDirectory() as directory:
+            for cache_format in ["feather", "parquet"]:
+                with DataManager(self.path, cache_bytes=None, cache_dir=directory, cache_format=cache_format) as data_manager:
+                    data_manager.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index")
+
+                # A new DataManager loads the table from the cache directory without opening the databases
+                with DataManager(self.path, cache_bytes=None, cache_dir=directory, cache_format=cache_format) as data_manager:
+                    cached = data_manager.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index")
+                    self.assertEqual(len(data_manager._engines), 0)
+
+                pd.testing.assert_frame_equal(cached, expected)
+
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "requires pyarrow")
+    def test_disk_cache_clear_keeps_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            other = os.path.join(directory, "forest_carbon_flux.feather")
+            pd.DataFrame({"a": [1, 2]}).to_feather(other)
+
+            with DataManager(self.path, cache_bytes=None, cache_dir=directory) as data_manager:
+                data_manager.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index")
+                self.assertEqual(len(os.listdir(directory)), 2)
+
+                data_manager.clear_cache()
+
+            self.assertListEqual(os.listdir(directory), ["forest_carbon_flux.feather"])
+
+            # Table names are not limited to word characters
+            cache = DiskCache(directory)
+            for table in ["forest-carbon.flux", "forest_carbon_flux"]:
+                cache.put((table, "index"), ((self.path[0], 0, 1),), pd.DataFrame({"a": [1, 2]}))
+
+            cache.clear()
+            self.assertListEqual(os.listdir(directory), ["forest_carbon_flux.feather"])
+
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "requires pyarrow")
+    def test_disk_cache_prunes_stale_files(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = [shutil.copy(database, directory) for database in self.path]
+            cache_dir = os.path.join(directory, "cache")
+
+            for mtime in [0, 10 ** 9, None]:
+                if mtime is not None:
+                    os.utime(path[0], ns=(mtime, mtime))
+
+                with DataManager(path, cache_bytes=None, cache_dir=cache_dir) as data_manager:
+                    data_manager.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index")
+                    data_manager.get_goblin_results_output_datatable("forest_carbon_aggregate", index_col="index")
+
+                # Each table keeps only the file of the current databases
+                self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+            # The same table read from other databases is kept alongside
+            with DataManager(path[:1], cache_bytes=None, cache_dir=cache_dir) as data_manager:
+                data_manager.get_goblin_results_output_datatable("forest_carbon_flux", index_col="index")
+
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+        finally:
+            shutil.rmtree(directory)
+
+
+    def test_filters_match_pandas(self):
+        data = self.data_manager.get_goblin_results_output_datatable("climate_change_landuse", index_col="scenario")
+
+        filtered = self.data_manager.get_goblin_results_output_datatable(
+            "climate_change_landuse",
+            index_col="scenario",
+            columns=["land_use", "year", "CO2"],
+            scenarios=[-1, 0],
+            years=[2020, 2050],
+            db_instances=["instance_1"],
+            where={"land_use": ["total", "wetland"]},
+        )
+
+        expected = data[
+            data.Scenarios.isin([-1, 0])
+            & data.year.isin([2020, 2050])
+            & (data.db_instance == "instance_1")
+            & data.land_use.isin(["total", "wetland"])
+        ][["land_use", "year", "CO2", "Scenarios", "db_instance"]].reset_index(drop=True)
+
+        self.assertGreater(len(filtered), 0)
+        pd.testing.assert_frame_equal(filtered, expected)
+
+
+    def test_filters_on_unknown_columns(self):
+        with self.assertRaises(ValueError):
+            self.data_manager.get_goblin_results_output_datatable("climate_change_totals", index_col="index", columns=["missing"])
+
+        with self.assertRaises(ValueError):
+            self.data_manager.get_goblin_results_output_datatable("climate_change_totals", index_col="index", years=[2020])
+
+
+    def test_projection_of_added_and_index_columns(self):
+        data = self.data_manager.get_goblin_results_output_datatable("climate_change_landuse", index_col="scenario")
+
+        # 'db_instance' is accepted like 'Scenarios', and the index column is not turned into a column of missing values
+        projected = self.data_manager.get_goblin_results_output_datatable(
+            "climate_change_landuse", index_col="scenario", columns=["scenario", "db_instance", "land_use", "CO2"]
+        )
+
+        self.assertNotIn("scenario", projected.columns)
+        pd.testing.assert_frame_equal(projected, data[["db_instance", "land_use", "CO2", "Scenarios"]])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+from goblin_fetcher.goblin_fetcher import DataFetcher, OUTPUT_TABLES
+from goblin_fetcher.table_writer import TableWriter
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
+import pandas as pd
+import tempfile
+import os
+
+
+class TestDataFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.path = [os.path.join("./data", "instance_0.db"), os.path.join("./data", "instance_1.db")]
+        self.fetcher = DataFetcher(self.path)
+
+    def tearDown(self):
+        self.fetcher.close()
+
+
+    def test_dump_tables_streamed_matches_buffered(self):
+        with tempfile.TemporaryDirectory() as buffered, tempfile.TemporaryDirectory() as streamed:
+            stats = self.fetcher.dump_tables(buffered)
+            self.fetcher.dump_tables(streamed, max_workers=4, stream=True, chunksize=13)
+
+            self.assertListEqual(list(stats.index), list(OUTPUT_TABLES))
+            self.assertEqual(stats.loc["scenario_inputs", "rows"], len(self.fetcher.get_scenario_inputs()))
+
+            for name in OUTPUT_TABLES:
+                with open(os.path.join(buffered, name + ".csv"), "rb") as expected, open(os.path.join(streamed, name + ".csv"), "rb") as actual:
+                    self.assertEqual(actual.read(), expected.read(), name)
+
+
+    def test_dump_tables_single_pass(self):
+        reads = []
+        get_tables = self.fetcher.get_tables
+        self.fetcher.get_tables = lambda tables: reads.append(tables) or get_tables(tables)
+
+        with tempfile.TemporaryDirectory() as by_table, tempfile.TemporaryDirectory() as single_pass:
+            self.fetcher.dump_tables(by_table, single_pass=False)
+            self.assertEqual(len(reads), 0)
+
+            self.fetcher.dump_tables(single_pass)
+            self.assertEqual(len(reads), 1)
+
+            self.fetcher.dump_tables(by_table, stream=True)
+            self.assertEqual(len(reads), 1)
+
+            for name in OUTPUT_TABLES:
+                with open(os.path.join(by_table, name + ".csv"), "rb") as expected, open(os.path.join(single_pass, name + ".csv"), "rb") as actual:
+                    self.assertEqual(actual.read(), expected.read(), name)
+
+
+    def test_get_tables_matches_getters(self):
+        tables = self.fetcher.get_tables({"scenario_inputs": {}, "forest_flux": {"years": [2020, 2021]}})
+
+        pd.testing.assert_frame_equal(tables["scenario_inputs"], self.fetcher.get_scenario_inputs())
+        pd.testing.assert_frame_equal(tables["forest_flux"], self.fetcher.get_forest_flux(years=[2020, 2021]))
+
+        with self.assertRaises(ValueError):
+            self.fetcher.get_tables(["missing"])
+
+
+    def test_dump_tables_compressed_subset(self):
+        tables = ["climate_change_emissions_totals", "forest_flux"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            stats = self.fetcher.dump_tables(directory, format="csv.gz", tables=tables, stream=True)
+
+            self.assertListEqual(sorted(os.listdir(directory)), sorted(name + ".csv.gz" for name in tables))
+
+            dumped = pd.read_csv(os.path.join(directory, "forest_flux.csv.gz"), index_col=0)
+            self.assertEqual(len(dumped), stats.loc["forest_flux", "rows"])
+            self.assertEqual(len(dumped), len(self.fetcher.get_forest_flux()))
+
+
+    def test_dump_tables_unknown_options(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                self.fetcher.dump_tables(directory, format="xlsx")
+
+            with self.assertRaises(ValueError):
+                self.fetcher.dump_tables(directory, tables=["missing"])
+
+
+    def test_time_series_in_worker_processes(self):
+        # The test tables are small, so they are computed in this process
+        expected = self.fetcher.get_climate_totals_time_series(2020, 2050)
+        pd.testing.assert_frame_equal(self.fetcher.get_climate_totals_time_series(2020, 2050, n_jobs=2), expected)
+        self.assertIsNone(self.fetcher._partitions._executor)
+
+        self.fetcher._partitions.min_parallel_bytes = 0
+        for method, args in [
+            (self.fetcher.get_climate_totals_time_series, (2020, 2050)),
+            (self.fetcher.get_abated_climate_totals_time_series, (2020, 2050, 0.3)),
+            (self.fetcher.get_climate_forest_totals_time_series, (2020, 2050)),
+        ]:
+            pd.testing.assert_frame_equal(method(*args, n_jobs=3), method(*args), check_exact=True)
+
+        # The worker pool is kept when fewer workers are asked for
+        executor = self.fetcher._partitions._executor
+        self.assertIsNotNone(executor)
+        pd.testing.assert_frame_equal(self.fetcher.get_climate_totals_time_series(2020, 2050, n_jobs=2), expected, check_exact=True)
+        self.assertIs(self.fetcher._partitions._executor, executor)
+
+
+    def test_concurrent_time_series_with_different_n_jobs(self):
+        expected = self.fetcher.get_climate_totals_time_series(2020, 2050)
+        self.fetcher.get_climate_totals_time_series(2020, 2050, n_jobs=2)
+        self.fetcher._partitions.min_parallel_bytes = 0
+
+        # Calls asking for more workers grow the pool while the other calls are still submitting to the smaller one
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(lambda n_jobs: self.fetcher.get_climate_totals_time_series(2020, 2050, n_jobs=n_jobs), [2, 3, 4, 2])
+            )
+
+        for result in results:
+            pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+        self.assertIsNone(self.fetcher._partitions.max_workers)
+        self.assertEqual(self.fetcher._partitions._pool_size, 4)
+        self.assertDictEqual(self.fetcher._partitions._executor_users, {})
+
+
+    def test_compact_time_series_index_dtypes(self):
+        with DataFetcher(self.path, dtypes="compact") as compact:
+            for method, args in [
+                ("get_climate_totals_time_series", (2020, 2050)),
+                ("get_climate_landuse_totals_time_series", (2020, 2050)),
+                ("get_climate_forest_totals_time_series", (2020, 2050)),
+                ("get_abated_climate_totals_time_series", (2020, 2050, 0.3)),
+            ]:
+                expected = getattr(self.fetcher, method)(*args)
+                result = getattr(compact, method)(*args)
+
+                self.assertEqual(result.index.levels[0].dtype, "int64")
+                self.assertListEqual(
+                    [level.dtype for level in result.index.levels], [level.dtype for level in expected.index.levels]
+                )
+                pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+
+@unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "requires pyarrow")
+class TestTableWriterChunks(unittest.TestCase):
+
+    def assert_chunks_round_trip(self, chunks):
+        expected = pd.concat(chunks, ignore_index=True).infer_objects()
+
+        for format in ["parquet", "feather"]:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "table." + format)
+                rows = TableWriter.write_chunks(iter(chunks), path, format)
+                result = pd.read_parquet(path) if format == "parquet" else pd.read_feather(path)
+
+                self.assertEqual(rows, len(expected))
+                self.assertListEqual(os.listdir(directory), ["table." + format])
+                pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=True)
+
+
+    def test_integer_column_gains_nulls(self):
+        self.assert_chunks_round_trip([
+            pd.DataFrame({"Year": [2020, 2021], "Value": [1, 2]}),
+            pd.DataFrame({"Year": [2022, 2023], "Value": [3.0, None]}),
+        ])
+
+
+    def test_all_null_first_chunk(self):
+        self.assert_chunks_round_trip([
+            pd.DataFrame({"Year": [2020, 2021], "Value": [None, None]}),
+            pd.DataFrame({"Year": [2022, 2023], "Value": [1.5, 2.5]}),
+        ])
+
+
+    def test_integer_dtype_widens_between_chunks(self):
+        self.assert_chunks_round_trip([
+            pd.DataFrame({"Year": pd.Series([20, 21], dtype="int8"), "Value": [1.0, 2.0]}),
+            pd.DataFrame({"Year": pd.Series([2022, 2023], dtype="int16"), "Value": [3.0, 4.0]}),
+            pd.DataFrame({"Year": pd.Series([24, 25], dtype="int8"), "Value": [5.0, 6.0]}),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
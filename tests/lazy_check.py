@@ -0,0 +1,85 @@
+import unittest
+from goblin_fetcher.goblin_fetcher import DataFetcher
+from goblin_fetcher.lazy import collect_all
+import pandas as pd
+import tempfile
+import sqlite3
+import shutil
+import os
+
+
+class TestLazyDataFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.path = [os.path.join("./data", "instance_0.db"), os.path.join("./data", "instance_1.db")]
+        self.fetcher = DataFetcher(self.path, cache_bytes=None)
+        self.lazy = self.fetcher.lazy()
+
+    def tearDown(self):
+        self.fetcher.close()
+
+
+    def test_plans_match_getters(self):
+        pd.testing.assert_frame_equal(
+            self.lazy.get_forest_flux(years=[2020]).filter(scenarios=[0, 1]).collect(),
+            self.fetcher.get_forest_flux(years=[2020], scenarios=[0, 1]),
+        )
+        pd.testing.assert_frame_equal(
+            self.lazy.get_climate_change_animal_emissions_aggregated().abate(0.3).collect(),
+            self.fetcher.get_abated_climate_change_animal_emissions_aggregated(0.3),
+        )
+
+        with self.assertRaises(ValueError):
+            self.lazy.get_forest_flux().abate(0.3)
+
+
+    def test_filtered_time_series(self):
+        expected = self.fetcher.get_abated_climate_totals_time_series(2020, 2050, 0.3)
+
+        plan = self.lazy.get_climate_totals_time_series(2020, 2050).abate(0.3)
+        filtered = plan.filter(scenarios=[0, 2], db_instances=["instance_1"]).collect()
+
+        selected = expected.index.get_level_values("scenario").isin([0, 2]) & (
+            expected.index.get_level_values("instance") == "instance_1"
+        )
+        pd.testing.assert_frame_equal(filtered, expected[selected], check_exact=True)
+
+
+    def test_collect_all_reads_shared_tables_once(self):
+        plan = self.lazy.get_climate_totals_time_series(2020, 2050)
+
+        reads = []
+        get_many = self.fetcher.data_manager_class.get_many
+        self.fetcher.data_manager_class.get_many = lambda tables, **options: reads.append(tables) or get_many(tables, **options)
+
+        totals, abated = collect_all(plan, plan.abate(0.3))
+
+        # One read of the four input tables serves both plans, and the abatement does not change the shared frame
+        self.assertEqual(len(reads), 1)
+        self.assertEqual(len(reads[0]), 4)
+        pd.testing.assert_frame_equal(totals, self.fetcher.get_climate_totals_time_series(2020, 2050))
+        pd.testing.assert_frame_equal(abated, self.fetcher.get_abated_climate_totals_time_series(2020, 2050, 0.3))
+
+
+
+    def test_time_series_keep_instances_without_rows_in_the_years(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = [shutil.copy(name, directory) for name in self.path]
+
+            with sqlite3.connect(path[1]) as connection:
+                connection.execute('DELETE FROM forest_carbon_flux WHERE "Year" <= 2030')
+                connection.execute('DELETE FROM climate_change_landuse WHERE "year" IN (2020, 2030)')
+            connection.close()
+
+            with DataFetcher(path, cache_bytes=None) as fetcher:
+                # The forest rows of the instance are missing rather than dropped, as when every year is read
+                forest = fetcher.lazy().get_climate_forest_totals_time_series(2020, 2030).collect()
+                self.assertTrue(forest.xs("instance_1", level="instance").isna().all(axis=None))
+
+                with self.assertRaisesRegex(ValueError, "instance_1"):
+                    fetcher.lazy().get_climate_landuse_totals_time_series(2020, 2030).collect()
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from goblin_fetcher.goblin_fetcher import DataFetcher
+from goblin_fetcher.partitions import PartitionedResults
+import pandas as pd
+import tempfile
+import sqlite3
+import shutil
+import os
+
+
+class TestPartitionedResults(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = [
+            shutil.copy(os.path.join("./data", "instance_0.db"), self.directory),
+            shutil.copy(os.path.join("./data", "instance_1.db"), self.directory),
+        ]
+        self.fetcher = DataFetcher(self.path, cache_bytes=None)
+
+    def tearDown(self):
+        self.fetcher.close()
+        shutil.rmtree(self.directory)
+
+
+    def test_partitions_match_fetcher(self):
+        with PartitionedResults(self.fetcher, max_workers=2, min_parallel_bytes=0) as partitioned:
+            pd.testing.assert_frame_equal(
+                partitioned.get_abated_climate_totals_time_series(2020, 2050, 0.3),
+                self.fetcher.get_abated_climate_totals_time_series(2020, 2050, 0.3),
+                check_exact=True,
+            )
+            pd.testing.assert_frame_equal(
+                partitioned.get_abated_climate_change_emissions_totals(2020, 2050, 0.3),
+                self.fetcher.get_abated_climate_change_emissions_totals(2020, 2050, 0.3),
+                check_exact=True,
+            )
+            pd.testing.assert_frame_equal(
+                partitioned.get_forest_flux(years=[2020]),
+                self.fetcher.get_forest_flux(years=[2020]),
+            )
+
+
+    def test_only_missing_partitions_are_computed(self):
+        partitioned = PartitionedResults(self.fetcher)
+        expected = partitioned.get_climate_livestock_totals_time_series(2020, 2050)
+
+        reads = []
+        get_many = self.fetcher.data_manager_class.get_many
+        self.fetcher.data_manager_class.get_many = lambda tables, **options: reads.append(tables) or get_many(tables, **options)
+
+        # A subset of the instances is taken from the memo, reading only the scenarios
+        plan = self.fetcher.lazy().get_climate_livestock_totals_time_series(2020, 2050)
+        subset = partitioned.collect(plan.filter(db_instances=["instance_1"]))
+
+        self.assertEqual(len(reads), 1)
+        self.assertListEqual([query["table"] for query in reads[0].values()], ["scenario_input_dataframe"])
+        pd.testing.assert_frame_equal(subset, expected.xs("instance_1", level="instance", drop_level=False))
+
+        # Changing one instance database only recomputes its partition
+        os.utime(self.path[0], ns=(0, 0))
+        pd.testing.assert_frame_equal(partitioned.get_climate_livestock_totals_time_series(2020, 2050), expected)
+
+        self.assertEqual(len(reads), 3)
+        self.assertTrue(all(query["db_instances"] == ["instance_0"] for query in reads[2].values()))
+
+
+    def test_ragged_instances_match_fetcher(self):
+        # The second instance lists fewer scenarios, which are still computed from the scenarios of every instance
+        with sqlite3.connect(self.path[1]) as connection:
+            connection.execute('DELETE FROM scenario_input_dataframe WHERE "Scenarios" = 5')
+        connection.close()
+
+        with PartitionedResults(self.fetcher, cache_bytes=None) as partitioned:
+            pd.testing.assert_frame_equal(
+                partitioned.get_climate_totals_time_series(2020, 2050),
+                self.fetcher.get_climate_totals_time_series(2020, 2050),
+                check_exact=True,
+            )
+
+        # A missing livestock row raises as it does when computed over all instances, and no shard is cached
+        with sqlite3.connect(self.path[1]) as connection:
+            connection.execute('DELETE FROM climate_change_livestock_aggregated WHERE "index" = 3')
+        connection.close()
+
+        with DataFetcher(self.path) as fetcher, PartitionedResults(fetcher, cache_bytes=None) as partitioned:
+            with self.assertRaisesRegex(ValueError, "instance_1"):
+                fetcher.get_climate_livestock_totals_time_series(2020, 2050)
+
+            with self.assertRaisesRegex(ValueError, "instance_1"):
+                partitioned.get_climate_livestock_totals_time_series(2020, 2050)
+
+            keys = [key for key, _ in fetcher.data_manager_class.cache.entries()]
+            self.assertFalse(any(("instance_0",) in key or ("instance_1",) in key for key in keys))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
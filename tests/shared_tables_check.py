@@ -0,0 +1,135 @@
+import unittest
+from goblin_fetcher.goblin_fetcher import DataFetcher
+from goblin_fetcher.resource_manager.shared_tables import SharedTable, _MAPPINGS
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import multiprocessing
+import importlib.util
+import subprocess
+import pickle
+import sys
+import gc
+import os
+
+
+def emissions_by_scenario(handle, scenario):
+    dataframe = handle.open()
+    return dataframe.loc[dataframe["Scenarios"] == scenario, "enteric_ch4"].sum()
+
+
+class TestSharedTable(unittest.TestCase):
+
+    def setUp(self):
+        self.path = [os.path.join("./data", "instance_0.db"), os.path.join("./data", "instance_1.db")]
+        self.fetcher = DataFetcher(self.path, dtypes="compact")
+
+    def tearDown(self):
+        self.fetcher.close()
+
+
+    def check_round_trip(self, transport):
+        for dataframe in [
+            self.fetcher.get_climate_change_animal_emissions_by_category(),
+            self.fetcher.get_scenario_inputs().set_index(["Scenarios", "db_instance"]),
+            pd.DataFrame(),
+        ]:
+            with SharedTable(dataframe, transport) as table:
+                handle = pickle.loads(pickle.dumps(table.handle))
+
+                pd.testing.assert_frame_equal(handle.open(), dataframe, check_exact=True)
+                pd.testing.assert_frame_equal(handle.open(copy=True), dataframe, check_exact=True)
+
+                handle.release()
+
+    def test_shared_memory_round_trip(self):
+        self.check_round_trip("shared_memory")
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "requires pyarrow")
+    def test_arrow_round_trip(self):
+        self.check_round_trip("arrow")
+
+
+    def test_opened_frames_are_read_only_views(self):
+        dataframe = self.fetcher.get_climate_change_animal_emissions_aggregated()
+
+        with SharedTable(dataframe) as table:
+            shared = table.handle.open()
+            with self.assertRaises(ValueError):
+                shared.loc[0, "CO2e"] = 0
+
+            copied = table.handle.open(copy=True)
+            copied.loc[0, "CO2e"] = 0
+            self.assertEqual(table.handle.open().loc[0, "CO2e"], dataframe.loc[0, "CO2e"])
+
+            del shared
+            table.handle.release()
+
+
+    def test_mappings_are_freed_with_their_frames(self):
+        dataframe = self.fetcher.get_climate_change_animal_emissions_by_category()
+
+        with SharedTable(dataframe) as table:
+            shared = table.handle.open()
+            column = shared["enteric_ch4"]
+            self.assertIn(table.handle.name, _MAPPINGS)
+
+            # A column outliving its frame keeps the block mapped
+            del shared
+            gc.collect()
+            self.assertIn(table.handle.name, _MAPPINGS)
+            self.assertEqual(column.sum(), dataframe["enteric_ch4"].sum())
+
+            del column
+            gc.collect()
+            self.assertNotIn(table.handle.name, _MAPPINGS)
+
+            table.handle.open(copy=True)
+            self.assertNotIn(table.handle.name, _MAPPINGS)
+
+
+    def test_workers_open_handles(self):
+        dataframe = self.fetcher.get_climate_change_animal_emissions_by_category()
+        scenarios = list(dataframe["Scenarios"].unique())
+
+        with SharedTable(dataframe) as table, ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertLess(len(pickle.dumps(table.handle)), len(pickle.dumps(dataframe)) / 10)
+
+            totals = list(executor.map(emissions_by_scenario, [table.handle] * len(scenarios), scenarios))
+
+        self.assertListEqual(
+            totals, [dataframe.loc[dataframe["Scenarios"] == scenario, "enteric_ch4"].sum() for scenario in scenarios]
+        )
+
+
+    def test_handles_outlive_worker_processes(self):
+        dataframe = self.fetcher.get_climate_change_animal_emissions_by_category()
+        scenario = dataframe["Scenarios"].iloc[0]
+        expected = dataframe.loc[dataframe["Scenarios"] == scenario, "enteric_ch4"].sum()
+
+        with SharedTable(dataframe) as table:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                self.assertEqual(executor.submit(emissions_by_scenario, table.handle, scenario).result(), expected)
+
+            # A process with its own resource tracker maps the block and exits without unlinking it
+            subprocess.run(
+                [sys.executable, "-c", "import pickle, sys; pickle.loads(sys.stdin.buffer.read()).open()"],
+                input=pickle.dumps(table.handle),
+                env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+                check=True,
+            )
+
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                self.assertEqual(executor.submit(emissions_by_scenario, table.handle, scenario).result(), expected)
+
+            pd.testing.assert_frame_equal(table.handle.open(), dataframe, check_exact=True)
+            table.handle.release()
+
+
+    def test_unknown_transport(self):
+        with self.assertRaises(ValueError):
+            SharedTable(pd.DataFrame(), "pickle")
+
+
+
+if __name__ == "__main__":
+    unittest.main()
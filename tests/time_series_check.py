@@ -0,0 +1,312 @@
+import unittest
+from goblin_fetcher.time_series import TimeSeries
+import pandas as pd
+import numpy as np
+import itertools
+
+
+def synthetic_inputs(scenarios, instances, baseline_year=2020, target_year=2050, seed=0):
+    """
+    Builds scenario and land use frames shaped like the GOBLIN output tables.
+    """
+    rng = np.random.default_rng(seed)
+    gases = ["CO2", "CH4", "N2O", "CO2e"]
+    land_uses = ["cropland", "grassland", "forest", "wetland", "total"]
+
+    scenario_df = pd.DataFrame({"Scenarios": np.repeat(np.arange(scenarios), 2)})
+
+    rows = []
+    for instance in [f"instance_{i}" for i in range(instances)]:
+        for sc in range(-1, scenarios):
+            year = baseline_year if sc == -1 else target_year
+            for land_use in land_uses:
+                rows.append([land_use, year, *(rng.random(len(gases)) * 1000), sc, instance])
+
+    landuse_df = pd.DataFrame(rows, columns=["land_use", "year", *gases, "Scenarios", "db_instance"])
+
+    return scenario_df, landuse_df
+
+
+def synthetic_livestock(scenarios, instances, seed=0):
+    """
+    Builds a frame shaped like the climate_change_livestock_aggregated output table.
+    """
+    rng = np.random.default_rng(seed)
+    gases = ["CH4", "N2O", "CO2", "CO2e"]
+
+    rows = []
+    for instance in [f"instance_{i}" for i in range(instances)]:
+        for sc in range(-1, scenarios):
+            rows.append([*(rng.random(len(gases)) * 1000), sc, instance])
+
+    return pd.DataFrame(rows, columns=[*gases, "Scenarios", "db_instance"])
+
+
+def synthetic_forest(scenarios, instances, baseline_year=2020, target_year=2050, seed=0):
+    """
+    Builds a frame shaped like the forest_carbon_flux output table, with the last year missing for scenario 0.
+    """
+    rng = np.random.default_rng(seed)
+
+    rows = []
+    for instance in [f"instance_{i}" for i in range(instances)]:
+        for sc in range(-1, scenarios):
+            for year in range(baseline_year, target_year + (0 if sc == 0 else 1)):
+                rows.append([year, (rng.random() - 0.5) * 1e6, sc, instance])
+
+    return pd.DataFrame(rows, columns=["Year", "Total Ecosystem", "Scenario", "db_instance"])
+
+
+def legacy_land_use_emissions_time_series(baseline_year, target_year, scenario_df, landuse_df):
+    """
+    The loop based implementation of TimeSeries.get_land_use_emissions_time_series, kept as a reference.
+    """
+    years = list(range(baseline_year, target_year + 1))
+    default_scenario_list = list(scenario_df["Scenarios"].unique())
+    baseline_index = -1
+    gases = ["CH4", "N2O", "CO2", "CO2e"]
+    instances = landuse_df.db_instance.unique()
+    sectors = landuse_df["land_use"].isin(["cropland", "grassland", "wetland"])
+
+    land_multiindex = pd.MultiIndex.from_product([default_scenario_list, instances, gases], names=['scenario', 'instance','gas'])
+    land_use_time_series = pd.DataFrame(index=land_multiindex, columns=years)
+
+    for (instance, sc, gas, year) in itertools.product(instances, default_scenario_list, gases, years):
+        instance_mask = landuse_df.db_instance == instance
+        default_mask = (
+            (landuse_df.Scenarios == baseline_index) & instance_mask
+            & (landuse_df["land_use"] == "total") & (landuse_df["year"] == baseline_year)
+        )
+
+        if year == baseline_year:
+            if gas == "CO2":
+                mask = (landuse_df.Scenarios == baseline_index) & instance_mask & sectors & (landuse_df["year"] == baseline_year)
+                emission_value = landuse_df.loc[mask, gas].sum()
+            else:
+                emission_value = landuse_df.loc[default_mask, gas].item()
+        elif year == target_year:
+            if gas == "CO2":
+                mask = (landuse_df.Scenarios == sc) & instance_mask & sectors & (landuse_df["year"] == target_year)
+                emission_value = landuse_df.loc[mask, gas].sum()
+            else:
+                emission_value = landuse_df.loc[default_mask, gas].item()
+        else:
+            emission_value = np.nan
+
+        land_use_time_series.loc[(sc, instance, gas), year] = emission_value
+
+    land_use_time_series = land_use_time_series.astype(float).interpolate(axis=1, method='linear', limit_direction='forward')
+
+    for year in years:
+        for sc in default_scenario_list:
+            for instance in instances:
+                CO2 = land_use_time_series.loc[(sc, instance, "CO2"), year]
+                CH4 = land_use_time_series.loc[(sc, instance, "CH4"), year] * 28
+                N2O = land_use_time_series.loc[(sc, instance, "N2O"), year] * 265
+                land_use_time_series.loc[(sc, instance, "CO2e"), year] = CO2 + CH4 + N2O
+
+    return land_use_time_series
+
+
+def legacy_livestock_emissions_time_series(baseline_year, target_year, scenario_df, livestock_df):
+    """
+    The loop based implementation of TimeSeries.get_livestock_emissions_time_series, kept as a reference.
+    """
+    years = list(range(baseline_year, target_year + 1))
+    default_scenario_list = list(scenario_df["Scenarios"].unique())
+    baseline_index = -1
+    gases = ["CH4", "N2O", "CO2", "CO2e"]
+    instances = livestock_df.db_instance.unique()
+
+    livestock_multiindex = pd.MultiIndex.from_product([default_scenario_list, instances, gases], names=['scenario', 'instance','gas'])
+    livestock_time_series = pd.DataFrame(index=livestock_multiindex, columns=years)
+
+    for (instance, sc, gas, year) in itertools.product(instances, default_scenario_list, gases, years):
+        if year == baseline_year:
+            mask = ((livestock_df.Scenarios == baseline_index) & (livestock_df.db_instance == instance))
+            emission_value = livestock_df.loc[mask, gas].item()
+        elif year == target_year:
+            mask = ((livestock_df.Scenarios == sc) & (livestock_df.db_instance == instance))
+            emission_value = livestock_df.loc[mask, gas].item()
+        else:
+            emission_value = np.nan
+
+        livestock_time_series.loc[(sc, instance, gas), year] = emission_value
+
+    livestock_time_series = livestock_time_series.astype(float).interpolate(axis=1, method='linear', limit_direction='forward')
+
+    for (year, sc, instance) in itertools.product(years, default_scenario_list, instances):
+        CO2 = livestock_time_series.loc[(sc, instance, "CO2"), year]
+        CH4 = livestock_time_series.loc[(sc, instance, "CH4"), year] * 28
+        N2O = livestock_time_series.loc[(sc, instance, "N2O"), year] * 265
+        livestock_time_series.loc[(sc, instance, "CO2e"), year] = CO2 + CH4 + N2O
+
+    return livestock_time_series
+
+
+def legacy_forest_carbon_time_series(baseline_year, target_year, scenario_df, forest_carbon_df):
+    """
+    The loop based implementation of TimeSeries.get_forest_carbon_time_series, kept as a reference.
+    """
+    years = list(range(baseline_year, target_year + 1))
+    default_scenario_list = list(scenario_df["Scenarios"].unique())
+    gas = ["CO2e"]
+    instances = forest_carbon_df.db_instance.unique()
+
+    forest_multiindex = pd.MultiIndex.from_product([default_scenario_list, instances, gas], names=['scenario', 'instance','gas'])
+    forest_time_series = pd.DataFrame(index=forest_multiindex, columns=years)
+
+    for (instance, sc, year) in itertools.product(instances, default_scenario_list, years):
+        mask = ((forest_carbon_df.Scenario == sc) & (forest_carbon_df.db_instance == instance) & (forest_carbon_df["Year"] == year))
+
+        if mask.any():
+            emission_value = forest_carbon_df.loc[mask, "Total Ecosystem"].item() * 3.67 * 1e-3
+        else:
+            emission_value = np.nan
+
+        forest_time_series.loc[(sc, instance, gas), year] = emission_value
+
+    return forest_time_series
+
+
+def legacy_total_climate_change_emissions_time_series(baseline_year, target_year, scenario_df, livestock_df, landuse_df, forest_carbon_df):
+    """
+    The loop based implementation of TimeSeries.total_climate_change_emissions_time_series, kept as a reference.
+    """
+    land_use_time_series = legacy_land_use_emissions_time_series(baseline_year, target_year, scenario_df, landuse_df)
+    livestock_time_series = legacy_livestock_emissions_time_series(baseline_year, target_year, scenario_df, livestock_df)
+    forest_time_series = legacy_forest_carbon_time_series(baseline_year, target_year, scenario_df, forest_carbon_df)
+
+    land_uses = ["Agriculture", "Other Land Use", "Forestry", "Total"]
+    gases = ["CH4", "N2O", "CO2", "CO2e"]
+    default_scenario_list = list(scenario_df["Scenarios"].unique())
+    instances = landuse_df.db_instance.unique()
+    years = list(range(baseline_year, target_year + 1))
+
+    total_multiindex = pd.MultiIndex.from_product([default_scenario_list, instances, land_uses, gases], names=['scenario', 'instance', 'land_use', 'gas'])
+    total_time_series = pd.DataFrame(index=total_multiindex, columns=years)
+
+    for (landuse, instance, sc, gas, year) in itertools.product(land_uses, instances, default_scenario_list, gases, years):
+        if landuse == "Agriculture":
+            emission_value = livestock_time_series.loc[(sc, instance, gas), year]
+        elif landuse == "Other Land Use":
+            emission_value = land_use_time_series.loc[(sc, instance, gas), year]
+        elif landuse == "Forestry":
+            if gas == "CO2e" or gas == "CO2":
+                emission_value = forest_time_series.loc[(sc, instance, "CO2e"), year]
+            else:
+                emission_value = 0
+        else:
+            emission_value = np.nan
+
+        total_time_series.loc[(sc, instance, landuse, gas), year] = emission_value
+
+    for (instance, sc, gas, year) in itertools.product(instances, default_scenario_list, gases, years):
+        total = 0
+        for landuse in ['Agriculture', 'Other Land Use', 'Forestry']:
+            total += total_time_series.loc[(sc, instance, landuse, gas), year]
+        total_time_series.loc[(sc, instance, 'Total', gas), year] = total
+
+    return total_time_series
+
+
+class TestTimeSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.baseline_year = 2020
+        self.target_year = 2030
+        self.scenario_df, self.landuse_df = synthetic_inputs(5, 3, self.baseline_year, self.target_year)
+        self.livestock_df = synthetic_livestock(5, 3)
+        self.forest_df = synthetic_forest(5, 3, self.baseline_year, self.target_year)
+
+
+    def test_land_use_matches_legacy(self):
+        expected = legacy_land_use_emissions_time_series(self.baseline_year, self.target_year, self.scenario_df, self.landuse_df)
+        result = TimeSeries.get_land_use_emissions_time_series(self.baseline_year, self.target_year, self.scenario_df, self.landuse_df)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+    def test_land_use_missing_values_match_legacy(self):
+        baseline_total = (self.landuse_df.Scenarios == -1) & (self.landuse_df["land_use"] == "total")
+        self.landuse_df.loc[baseline_total & (self.landuse_df.db_instance == "instance_0"), "CH4"] = np.nan
+
+        expected = legacy_land_use_emissions_time_series(self.baseline_year, self.target_year, self.scenario_df, self.landuse_df)
+        result = TimeSeries.get_land_use_emissions_time_series(self.baseline_year, self.target_year, self.scenario_df, self.landuse_df)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+    def test_land_use_missing_baseline_total_raises(self):
+        baseline_total = (self.landuse_df.Scenarios == -1) & (self.landuse_df["land_use"] == "total")
+        landuse_df = self.landuse_df[~(baseline_total & (self.landuse_df.db_instance == "instance_1"))]
+
+        with self.assertRaisesRegex(ValueError, "instance_1"):
+            TimeSeries.get_land_use_emissions_time_series(self.baseline_year, self.target_year, self.scenario_df, landuse_df)
+
+
+    def test_livestock_matches_legacy(self):
+        expected = legacy_livestock_emissions_time_series(self.baseline_year, self.target_year, self.scenario_df, self.livestock_df)
+        result = TimeSeries.get_livestock_emissions_time_series(self.baseline_year, self.target_year, self.scenario_df, self.livestock_df)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+    def test_livestock_missing_rows_raise(self):
+        for scenario in [-1, 3]:
+            missing = (self.livestock_df.Scenarios == scenario) & (self.livestock_df.db_instance == "instance_2")
+
+            with self.assertRaisesRegex(ValueError, "instance_2"):
+                TimeSeries.get_livestock_emissions_time_series(
+                    self.baseline_year, self.target_year, self.scenario_df, self.livestock_df[~missing]
+                )
+
+
+    def test_total_missing_livestock_instance_raises(self):
+        livestock_df = self.livestock_df[self.livestock_df.db_instance != "instance_2"]
+
+        with self.assertRaisesRegex(ValueError, "instance_2"):
+            TimeSeries.total_climate_change_emissions_time_series(
+                self.baseline_year, self.target_year, self.scenario_df, livestock_df, self.landuse_df, self.forest_df
+            )
+
+
+    def test_total_missing_forest_instance_raises(self):
+        forest_df = self.forest_df[self.forest_df.db_instance != "instance_1"]
+
+        with self.assertRaisesRegex(ValueError, "instance_1"):
+            TimeSeries.total_climate_change_emissions_time_series(
+                self.baseline_year, self.target_year, self.scenario_df, self.livestock_df, self.landuse_df, forest_df
+            )
+
+
+    def test_non_integer_scenarios_are_kept(self):
+        scenario_df = self.scenario_df.assign(Scenarios=self.scenario_df.Scenarios + 0.5)
+        forest_df = self.forest_df.assign(Scenario=self.forest_df.Scenario + 0.5)
+
+        expected = legacy_forest_carbon_time_series(self.baseline_year, self.target_year, scenario_df, forest_df)
+        result = TimeSeries.get_forest_carbon_time_series(self.baseline_year, self.target_year, scenario_df, forest_df)
+
+        self.assertEqual(result.index.levels[0].dtype, "float64")
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+    def test_forest_matches_legacy(self):
+        expected = legacy_forest_carbon_time_series(self.baseline_year, self.target_year, self.scenario_df, self.forest_df)
+        result = TimeSeries.get_forest_carbon_time_series(self.baseline_year, self.target_year, self.scenario_df, self.forest_df)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+    def test_total_matches_legacy(self):
+        args = (self.baseline_year, self.target_year, self.scenario_df, self.livestock_df, self.landuse_df, self.forest_df)
+        expected = legacy_total_climate_change_emissions_time_series(*args)
+        result = TimeSeries.total_climate_change_emissions_time_series(*args)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+        self.assertEqual(result.to_csv(), expected.to_csv())
+
+
+
+if __name__ == "__main__":
+    unittest.main()
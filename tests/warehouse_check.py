@@ -0,0 +1,89 @@
+import unittest
+from goblin_fetcher.resource_manager.database_manager import DataManager
+from goblin_fetcher.resource_manager.warehouse import consolidate, is_warehouse
+import pandas as pd
+from unittest import mock
+import sqlite3
+import tempfile
+import shutil
+import os
+
+
+class TestWarehouse(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # List the second instance first to check the warehouse keeps the order of the paths
+        self.paths = [
+            shutil.copy(os.path.join("./data", "instance_1.db"), self.directory),
+            shutil.copy(os.path.join("./data", "instance_0.db"), self.directory),
+        ]
+        self.warehouse_path = os.path.join(self.directory, "warehouse.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_warehouse_matches_instance_databases(self):
+        consolidate(self.paths, self.warehouse_path)
+        self.assertTrue(is_warehouse(self.warehouse_path))
+        self.assertFalse(is_warehouse(self.paths[0]))
+
+        with DataManager(self.paths, cache_bytes=None) as instances, DataManager(self.warehouse_path, cache_bytes=None) as warehouse:
+            self.assertListEqual(warehouse.warehouse_instances(), ["instance_1", "instance_0"])
+            self.assertDictEqual(warehouse.instances, {"instance_1": os.path.abspath(self.paths[0]), "instance_0": os.path.abspath(self.paths[1])})
+
+            for table, index_col, filters in [
+                ("climate_change_landuse", "scenario", {}),
+                ("per_hectare_stocking_rate", None, {"scenarios": [0, 3]}),
+                ("forest_carbon_flux", "index", {"years": [2020], "db_instances": ["instance_0"]}),
+            ]:
+                expected = instances.get_goblin_results_output_datatable(table, index_col=index_col, **filters)
+
+                pd.testing.assert_frame_equal(
+                    warehouse.get_goblin_results_output_datatable(table, index_col=index_col, **filters), expected
+                )
+                pd.testing.assert_frame_equal(
+                    pd.concat(warehouse.iter_table(table, index_col=index_col, chunksize=7, **filters)), expected
+                )
+
+
+    def test_consolidate_is_incremental(self):
+        self.assertEqual(consolidate(self.paths, self.warehouse_path)["imported"], ["instance_1", "instance_0"])
+        self.assertEqual(consolidate(self.paths, self.warehouse_path)["skipped"], ["instance_1", "instance_0"])
+
+        os.utime(self.paths[1], ns=(0, 0))
+        summary = consolidate(self.paths[1:], self.warehouse_path)
+
+        self.assertEqual(summary["imported"], ["instance_0"])
+        self.assertEqual(summary["removed"], ["instance_1"])
+
+        with DataManager(self.paths[1:], cache_bytes=None) as instances, DataManager(self.warehouse_path, cache_bytes=None) as warehouse:
+            pd.testing.assert_frame_equal(
+                warehouse.get_goblin_results_output_datatable("climate_change_totals", index_col="index"),
+                instances.get_goblin_results_output_datatable("climate_change_totals", index_col="index"),
+            )
+
+
+    def test_instance_paths_are_not_opened(self):
+        consolidate(self.paths, self.warehouse_path)
+
+        with mock.patch("goblin_fetcher.resource_manager.warehouse.sqlite3.connect", wraps=sqlite3.connect) as connect:
+            self.assertIsNotNone(DataManager([self.warehouse_path]).warehouse)
+            self.assertEqual(connect.call_count, 1)
+            self.assertIn("mode=ro", connect.call_args.args[0])
+
+            connect.reset_mock()
+            data_manager = DataManager(self.paths)
+            data_manager.add_databases(self.paths)
+
+            self.assertIsNone(data_manager.warehouse)
+            self.assertEqual(connect.call_count, 0)
+
+        with self.assertRaises(ValueError):
+            DataManager(self.paths).add_databases(self.warehouse_path)
+
+
+
+if __name__ == "__main__":
+    unittest.main()